@@ -0,0 +1,207 @@
+from utils.env import load_dotenv
+load_dotenv()
+import argparse
+from typing import Dict
+
+import numpy as np
+from sqlalchemy import create_engine, select, text
+
+from config import ANALYTICS_PNL_BINS, DATABASE_URL
+from storage.models import Trade
+
+
+GROUPINGS = ("strategy", "symbol", "direction", "hour", "exit_reason")
+
+_CLOSED_TRADES = (
+    select(
+        Trade.strategy_id, Trade.symbol, Trade.direction, Trade.entry_time,
+        Trade.exit_time, Trade.exit_reason, Trade.pnl_pct_1x, Trade.hold_seconds,
+    )
+    .where(Trade.exit_time.isnot(None))
+    .order_by(Trade.exit_time, Trade.id)
+)
+
+
+def load_closed_trades(db_url: str = DATABASE_URL) -> Dict[str, np.ndarray]:
+    """
+    Closed trades as columns, in close order. Times are datetime64[s]
+    (UTC), pnl is float64, text columns are object arrays.
+    """
+    engine = create_engine(db_url, future=True)
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(_CLOSED_TRADES).all()
+    finally:
+        engine.dispose()
+
+    cols = list(zip(*rows)) if rows else [()] * 8
+    return {
+        "strategy": np.array(cols[0], dtype=object),
+        "symbol": np.array(cols[1], dtype=object),
+        "direction": np.array(cols[2], dtype=object),
+        "entry_time": np.array(cols[3], dtype="datetime64[s]"),
+        "exit_time": np.array(cols[4], dtype="datetime64[s]"),
+        "exit_reason": np.array(cols[5], dtype=object),
+        "pnl": np.array([p or 0.0 for p in cols[6]], dtype=np.float64),
+        "hold_seconds": np.array([h or 0 for h in cols[7]], dtype=np.int64),
+    }
+
+
+def equity_curve(pnl: np.ndarray) -> np.ndarray:
+    """
+    Cumulative pnl_pct_1x after each trade, in close order.
+    """
+    return np.cumsum(pnl)
+
+
+def max_drawdown(pnl: np.ndarray) -> float:
+    """
+    Largest drop of the equity curve from a running peak (starting at 0).
+    """
+    if not pnl.size:
+        return 0.0
+    equity = np.cumsum(pnl)
+    peaks = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+    return float(np.max(peaks - equity))
+
+
+def summarize(pnl: np.ndarray, exit_reason: np.ndarray, hold_seconds: np.ndarray) -> dict:
+    """
+    Win rate, expectancy, PnL distribution, drawdown and exit-reason
+    breakdown for one set of trades (in close order).
+    """
+    n = int(pnl.size)
+    wins, losses = pnl[pnl > 0], pnl[pnl < 0]
+    return {
+        "trades": n,
+        "wins": int(wins.size),
+        "losses": int(losses.size),
+        "win_rate": wins.size / n if n else None,
+        "expectancy": float(pnl.mean()) if n else None,
+        "avg_win": float(wins.mean()) if wins.size else None,
+        "avg_loss": float(losses.mean()) if losses.size else None,
+        "profit_factor": float(wins.sum() / -losses.sum()) if losses.size else None,
+        "pnl_sum": float(pnl.sum()),
+        "pnl_stdev": float(pnl.std()) if n > 1 else None,
+        "pnl_percentiles": (
+            dict(zip(("p5", "p25", "p50", "p75", "p95"), np.percentile(pnl, [5, 25, 50, 75, 95]).tolist()))
+            if n else {}
+        ),
+        "pnl_hist": np.bincount(
+            np.searchsorted(ANALYTICS_PNL_BINS, pnl, side="right"),
+            minlength=len(ANALYTICS_PNL_BINS) + 1,
+        ).tolist(),
+        "max_drawdown": max_drawdown(pnl),
+        "trail_exits": int(np.count_nonzero(exit_reason == "TRAIL")),
+        "time_exits": int(np.count_nonzero(exit_reason == "TIME")),
+        "avg_hold_seconds": float(hold_seconds.mean()) if n else None,
+    }
+
+
+def group_keys(trades: Dict[str, np.ndarray], by: str) -> np.ndarray:
+    if by == "hour":
+        entry = trades["entry_time"]
+        hours = (entry.astype("datetime64[h]") - entry.astype("datetime64[D]")).astype(np.int64)
+        return np.array([f"{h:02d}" for h in hours.tolist()], dtype=object)
+    return trades[by]
+
+
+def breakdown(trades: Dict[str, np.ndarray], by: str) -> Dict[str, dict]:
+    """
+    summarize() per value of `by` (one of GROUPINGS). A stable sort keeps
+    each group in close order, so per-group drawdowns are correct.
+    """
+    keys = group_keys(trades, by).astype(str)
+    if not keys.size:
+        return {}
+
+    order = np.argsort(keys, kind="stable")
+    names, starts = np.unique(keys[order], return_index=True)
+    result = {}
+    for name, idx in zip(names.tolist(), np.split(order, starts[1:])):
+        result[name] = summarize(trades["pnl"][idx], trades["exit_reason"][idx], trades["hold_seconds"][idx])
+    return result
+
+
+# ---------- CLI ----------
+
+def _fmt_pct(value) -> str:
+    return "n/a" if value is None else f"{value * 100:.2f}%"
+
+
+def _print_table(title: str, rows: Dict[str, dict]):
+    print(f"\n{title}")
+    print(f"{'key':<16} {'trades':>7} {'win':>8} {'expect':>8} {'pnl_sum':>9} {'max_dd':>8} {'trail':>6} {'time':>6} {'hold_s':>7}")
+    for key, s in rows.items():
+        hold = "n/a" if s["avg_hold_seconds"] is None else f"{s['avg_hold_seconds']:.0f}"
+        print(
+            f"{key:<16} {s['trades']:>7} {_fmt_pct(s['win_rate']):>8} {_fmt_pct(s['expectancy']):>8} "
+            f"{_fmt_pct(s['pnl_sum']):>9} {_fmt_pct(s['max_drawdown']):>8} "
+            f"{s['trail_exits']:>6} {s['time_exits']:>6} {hold:>7}"
+        )
+
+
+def _stats_dict(stats) -> dict:
+    return {
+        "trades": stats.trades,
+        "win_rate": stats.win_rate,
+        "expectancy": stats.expectancy,
+        "pnl_sum": stats.pnl_sum,
+        "max_drawdown": stats.max_drawdown,
+        "trail_exits": stats.trail_exits,
+        "time_exits": stats.time_exits,
+        "avg_hold_seconds": stats.avg_hold_seconds,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Post-trade analytics over the trades table.")
+    parser.add_argument("--db", default=DATABASE_URL, help=f"Database URL (default: {DATABASE_URL})")
+    parser.add_argument(
+        "--by", action="append", choices=GROUPINGS, default=[],
+        help="Add a breakdown table (repeatable). Default: all of them",
+    )
+    parser.add_argument(
+        "--summaries", action="store_true",
+        help="Read the precomputed trade_summaries table instead of scanning trades",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    groupings = args.by or list(GROUPINGS)
+
+    if args.summaries:
+        from analytics.summary import TradeStats
+        engine = create_engine(args.db, future=True)
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT * FROM trade_summaries ORDER BY dimension, key")).all()
+        engine.dispose()
+
+        tables: Dict[str, Dict[str, dict]] = {}
+        for row in rows:
+            tables.setdefault(row.dimension, {})[row.key] = _stats_dict(TradeStats.from_row(row))
+        for dimension in ["all"] + [g for g in groupings if g in tables]:
+            if dimension in tables:
+                _print_table(dimension, tables[dimension])
+        return
+
+    trades = load_closed_trades(args.db)
+    overall = summarize(trades["pnl"], trades["exit_reason"], trades["hold_seconds"])
+    _print_table("all", {"all": overall})
+    if overall["trades"]:
+        print("pnl percentiles: " + ", ".join(
+            f"{k}={_fmt_pct(v)}" for k, v in overall["pnl_percentiles"].items()
+        ))
+        edges = ["-inf"] + [f"{e * 100:g}%" for e in ANALYTICS_PNL_BINS] + ["+inf"]
+        print("pnl distribution: " + ", ".join(
+            f"[{lo}, {hi}): {n}" for lo, hi, n in zip(edges, edges[1:], overall["pnl_hist"])
+        ))
+
+    for by in groupings:
+        _print_table(f"by {by}", breakdown(trades, by))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import math
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+from config import ANALYTICS_PNL_BINS, DEFAULT_STRATEGY_ID
+from notifier.telegram import format_summary_message, telegram_notifier
+from storage.async_queries import (
+    get_closed_trades,
+    get_trade_summaries,
+    insert_trade_summary,
+    update_trade_summary,
+)
+from storage.models import Trade, TradeSummary
+from utils.clock import utcnow
+
+
+DIMENSIONS = ("all", "strategy", "symbol", "direction", "hour")
+
+# Columns copied between TradeStats and TradeSummary rows
+_FIELDS = (
+    "trades", "wins", "losses",
+    "pnl_sum", "pnl_sumsq", "win_sum", "loss_sum", "best", "worst",
+    "equity_peak", "max_drawdown",
+    "trail_exits", "time_exits", "other_exits",
+    "hold_seconds_sum",
+)
+
+
+class TradeStats:
+    """
+    Closed-trade statistics that update in O(1) per trade: counts, sums
+    and sums of squares of pnl_pct_1x, running equity peak / max
+    drawdown, exit-reason counts and a fixed-bin PnL histogram.
+    """
+
+    __slots__ = _FIELDS + ("pnl_hist",)
+
+    def __init__(self):
+        self.trades = self.wins = self.losses = 0
+        self.pnl_sum = self.pnl_sumsq = self.win_sum = self.loss_sum = 0.0
+        self.best: float | None = None
+        self.worst: float | None = None
+        self.equity_peak = self.max_drawdown = 0.0
+        self.trail_exits = self.time_exits = self.other_exits = 0
+        self.hold_seconds_sum = 0
+        self.pnl_hist = [0] * (len(ANALYTICS_PNL_BINS) + 1)
+
+    def add(self, pnl: float, exit_reason: str | None, hold_seconds: int | None):
+        self.trades += 1
+        self.pnl_sum += pnl
+        self.pnl_sumsq += pnl * pnl
+        if pnl > 0:
+            self.wins += 1
+            self.win_sum += pnl
+        elif pnl < 0:
+            self.losses += 1
+            self.loss_sum += pnl
+        self.best = pnl if self.best is None else max(self.best, pnl)
+        self.worst = pnl if self.worst is None else min(self.worst, pnl)
+
+        equity = self.pnl_sum
+        self.equity_peak = max(self.equity_peak, equity)
+        self.max_drawdown = max(self.max_drawdown, self.equity_peak - equity)
+
+        if exit_reason == "TRAIL":
+            self.trail_exits += 1
+        elif exit_reason == "TIME":
+            self.time_exits += 1
+        else:
+            self.other_exits += 1
+
+        self.hold_seconds_sum += int(hold_seconds or 0)
+        self.pnl_hist[bisect_right(ANALYTICS_PNL_BINS, pnl)] += 1
+
+    # ---------- DERIVED ----------
+
+    @property
+    def win_rate(self) -> float | None:
+        return self.wins / self.trades if self.trades else None
+
+    @property
+    def expectancy(self) -> float | None:
+        """
+        Average pnl_pct_1x per trade.
+        """
+        return self.pnl_sum / self.trades if self.trades else None
+
+    @property
+    def avg_win(self) -> float | None:
+        return self.win_sum / self.wins if self.wins else None
+
+    @property
+    def avg_loss(self) -> float | None:
+        return self.loss_sum / self.losses if self.losses else None
+
+    @property
+    def profit_factor(self) -> float | None:
+        return self.win_sum / -self.loss_sum if self.loss_sum else None
+
+    @property
+    def stdev(self) -> float | None:
+        if self.trades < 2:
+            return None
+        mean = self.pnl_sum / self.trades
+        return math.sqrt(max(0.0, self.pnl_sumsq / self.trades - mean * mean))
+
+    @property
+    def avg_hold_seconds(self) -> float | None:
+        return self.hold_seconds_sum / self.trades if self.trades else None
+
+    # ---------- ROWS ----------
+
+    def to_row(self) -> dict:
+        row = {name: getattr(self, name) for name in _FIELDS}
+        row["pnl_hist"] = json.dumps(self.pnl_hist)
+        return row
+
+    @classmethod
+    def from_row(cls, row: TradeSummary) -> "TradeStats":
+        stats = cls()
+        for name in _FIELDS:
+            value = getattr(row, name)
+            if value is not None or name in ("best", "worst"):
+                setattr(stats, name, value)
+        hist = json.loads(row.pnl_hist or "[]")
+        if len(hist) == len(stats.pnl_hist):  # bins unchanged since written
+            stats.pnl_hist = hist
+        return stats
+
+
+def summary_keys(trade: Trade) -> List[Tuple[str, str]]:
+    return [
+        ("all", "all"),
+        ("strategy", trade.strategy_id or DEFAULT_STRATEGY_ID),
+        ("symbol", trade.symbol),
+        ("direction", trade.direction),
+        ("hour", f"{trade.entry_time.hour:02d}" if trade.entry_time else "--"),
+    ]
+
+
+class TradeSummaryBook:
+    """
+    In-memory TradeStats per (dimension, key), mirrored to the
+    trade_summaries table.
+
+    TradeBook.close_trade() calls on_trade_closed() right after queueing
+    mark_trade_closed, so every summary a trade belongs to is updated
+    once, in O(1), and written through the write-behind writer. Readers
+    (Telegram summaries, `python -m analytics.report --summaries`) get
+    the precomputed numbers instead of rescanning trades.
+    """
+
+    def __init__(self, persist: bool = True):
+        self.persist = persist
+        self.stats: Dict[Tuple[str, str], TradeStats] = {}
+        self._ids: Dict[Tuple[str, str], int] = {}
+
+    async def load(self, rebuild: bool = False):
+        """
+        Load stored summaries. When there are none yet (new table, older
+        database) or rebuild=True, recompute them from every closed trade.
+        """
+        for row in await get_trade_summaries():
+            key = (row.dimension, row.key)
+            self._ids[key] = row.id
+            self.stats[key] = TradeStats.from_row(row)
+
+        if self.stats and not rebuild:
+            print(f"TradeSummaryBook loaded | summaries={len(self.stats)}")
+            return
+
+        self.stats = {}
+        closed = await get_closed_trades()
+        touched = set()
+        for trade in closed:
+            touched.update(self._add(trade))
+        for key in touched:
+            self._write(key)
+
+        print(f"TradeSummaryBook rebuilt | trades={len(closed)} | summaries={len(self.stats)}")
+
+    def _add(self, trade: Trade) -> List[Tuple[str, str]]:
+        keys = summary_keys(trade)
+        for key in keys:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = TradeStats()
+            stats.add(trade.pnl_pct_1x or 0.0, trade.exit_reason, trade.hold_seconds)
+        return keys
+
+    def _write(self, key: Tuple[str, str]):
+        if not self.persist:
+            return
+        row = self.stats[key].to_row()
+        row.update(dimension=key[0], key=key[1], updated_at=utcnow())
+
+        summary_id = self._ids.get(key)
+        if summary_id is None:
+            self._ids[key] = insert_trade_summary(row)
+        else:
+            update_trade_summary(dict(row, id=summary_id))
+
+    def on_trade_closed(self, trade: Trade):
+        for key in self._add(trade):
+            self._write(key)
+
+    # ---------- READ ----------
+
+    def get(self, dimension: str = "all", key: str = "all") -> TradeStats | None:
+        return self.stats.get((dimension, key))
+
+    def by(self, dimension: str) -> Dict[str, TradeStats]:
+        return {k: s for (d, k), s in self.stats.items() if d == dimension}
+
+    # ---------- TELEGRAM ----------
+
+    async def run_telegram_summaries(self, interval_minutes: float):
+        """
+        Post the overall and per-strategy summaries every interval,
+        skipping intervals without newly closed trades.
+        """
+        last_count = None
+        while True:
+            await asyncio.sleep(interval_minutes * 60)
+            overall = self.get()
+            if overall is None or overall.trades == last_count:
+                continue
+            last_count = overall.trades
+
+            parts = [format_summary_message("All strategies", overall)]
+            strategies = self.by("strategy")
+            if len(strategies) > 1:
+                for strategy_id, stats in sorted(strategies.items()):
+                    parts.append(format_summary_message(strategy_id, stats))
+            telegram_notifier.notify("\n\n".join(parts))
+
+
+trade_summaries = TradeSummaryBook()
@@ -0,0 +1,127 @@
+from typing import Dict, List
+
+import numpy as np
+
+from analytics.report import max_drawdown
+from config import PRICE_HISTORY_SECONDS
+from data_feed.market_state import market_state, update_price
+from signals.features import momentum_move
+from signals.params import StrategyParams
+from storage.models import Trade
+from trades.exit_engine import ExitEngine
+from trades.trade_book import TradeBook
+from trades.trade_simulator import next_timer, simulator_step
+from utils.clock import NS_PER_MS, NS_PER_SECOND, SimClock, set_clock, to_datetime
+
+
+_CHUNK_ROWS = 1 << 16
+
+
+def simulate(
+    event_ms: np.ndarray,
+    symbol_id: np.ndarray,
+    close: np.ndarray,
+    symbols: List[str],
+    params: StrategyParams,
+) -> List[Trade]:
+    """
+    Run one parameter set over recorded ticks, fully in memory.
+
+    Same momentum rule (features.momentum_move), trade book, entry
+    timer (trade_simulator.simulator_step) and exit engine as the live
+    pipeline, but signals are not persisted, trades are not written to
+    the DB and nothing subscribes to market_state. Returns every trade
+    created; closed ones have exit_time / pnl set.
+    """
+    if params.lookback_seconds > PRICE_HISTORY_SECONDS:
+        raise ValueError(
+            f"lookback_seconds={params.lookback_seconds} exceeds "
+            f"PRICE_HISTORY_SECONDS={PRICE_HISTORY_SECONDS}"
+        )
+
+    trades: List[Trade] = []
+    if not len(event_ms):
+        return trades
+
+    market_state.clear()
+    clock = SimClock(int(event_ms[0]) * NS_PER_MS)
+    set_clock(clock)
+
+    book = TradeBook(persist=False)
+    exits = ExitEngine(book, params)
+
+    lookback = int(params.lookback_seconds * NS_PER_SECOND)
+    threshold = params.momentum_pct
+    cooldown = int(params.cooldown_seconds * NS_PER_SECOND)
+    entry_delay = int(params.entry_delay_seconds * NS_PER_SECOND)
+    last_signal: Dict[str, int] = {}
+
+    for lo in range(0, len(event_ms), _CHUNK_ROWS):
+        hi = lo + _CHUNK_ROWS
+        for ms, sid, price in zip(
+            event_ms[lo:hi].tolist(),
+            symbol_id[lo:hi].tolist(),
+            close[lo:hi].tolist(),
+        ):
+            ts = ms * NS_PER_MS
+
+            # Entries / time stops due before this tick fire at their own time
+            due = next_timer(book, exits)
+            while due is not None and due <= ts:
+                clock.set(due)
+                simulator_step(due, book, exits)
+                due = next_timer(book, exits)
+
+            symbol = symbols[sid]
+            clock.set(ts)
+            update_price(symbol, price)
+            exits.on_tick(symbol)
+
+            move_pct = momentum_move(market_state[symbol].price_history, price, ts - lookback)
+            if move_pct is None or abs(move_pct) < threshold:
+                continue
+
+            last = last_signal.get(symbol)
+            if last is not None and ts - last < cooldown:
+                continue
+            last_signal[symbol] = ts
+
+            n = len(trades) + 1
+            trade = Trade(
+                id=n,
+                signal_id=n,
+                symbol=symbol,
+                direction="LONG" if move_pct > 0 else "SHORT",
+                entry_delay_seconds=params.entry_delay_seconds,
+                entry_time_planned=to_datetime(ts + entry_delay),
+            )
+            trades.append(trade)
+            book.add_pending(trade)
+
+    return trades
+
+
+def summarize(trades: List[Trade]) -> dict:
+    """
+    Per-run metrics for the results table. Drawdown is taken over the
+    trades in close order, like analytics/report.py.
+    """
+    closed = sorted(
+        (t for t in trades if t.exit_time is not None),
+        key=lambda t: (t.exit_time, t.id),
+    )
+    pnl = np.array([t.pnl_pct_1x for t in closed], dtype=np.float64)
+
+    return {
+        "signals": len(trades),
+        "trades_closed": len(closed),
+        "trades_open_at_end": len(trades) - len(closed),
+        "wins": int(np.sum(pnl > 0)),
+        "win_rate": float(np.mean(pnl > 0)) if pnl.size else None,
+        "pnl_1x_sum": float(pnl.sum()),
+        "pnl_1x_avg": float(pnl.mean()) if pnl.size else None,
+        "max_drawdown_1x": max_drawdown(pnl),
+        "trail_exits": sum(1 for t in closed if t.exit_reason == "TRAIL"),
+        "time_exits": sum(1 for t in closed if t.exit_reason == "TIME"),
+        "avg_hold_seconds": float(np.mean([t.hold_seconds for t in closed])) if closed else None,
+    }
@@ -0,0 +1,220 @@
+import itertools
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields
+from datetime import datetime
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    insert,
+)
+
+from signals.params import StrategyParams
+from utils.clock import utcnow
+
+
+# ---------- GRID ----------
+
+_PARAM_TYPES = {f.name: f.type for f in fields(StrategyParams)}
+
+
+def parse_grid_arg(text: str) -> Dict[str, list]:
+    """
+    "momentum_pct=0.005,0.0075,0.01" -> {"momentum_pct": [0.005, 0.0075, 0.01]}
+    """
+    name, _, values = text.partition("=")
+    name = name.strip()
+    if name not in _PARAM_TYPES:
+        raise ValueError(f"Unknown strategy parameter: {name}")
+    cast = _PARAM_TYPES[name]
+    return {name: [cast(v) for v in values.split(",") if v.strip()]}
+
+
+def expand_grid(grid: Dict[str, Iterable], base: StrategyParams | None = None) -> List[StrategyParams]:
+    """
+    Cartesian product of `grid`; parameters not in the grid keep their
+    value from `base` (config by default).
+    """
+    base = base or StrategyParams.from_config()
+    names = list(grid)
+    return [
+        base.with_overrides(**dict(zip(names, combo)))
+        for combo in itertools.product(*(list(grid[n]) for n in names))
+    ]
+
+
+# ---------- SHARED TICKS ----------
+
+# Layout of the shared block: event_ms (int64), close (float64), symbol_id (uint16)
+_LAYOUT = (("event_ms", np.int64), ("close", np.float64), ("symbol_id", np.uint16))
+
+
+def _views(buf, rows: int) -> Dict[str, np.ndarray]:
+    views, offset = {}, 0
+    for name, dtype in _LAYOUT:
+        views[name] = np.ndarray(rows, dtype=dtype, buffer=buf, offset=offset)
+        offset += rows * np.dtype(dtype).itemsize
+    return views
+
+
+def share_ticks(ticks: dict) -> shared_memory.SharedMemory:
+    """
+    Copy the tick columns once into a shared memory block that every
+    worker maps read-only, instead of pickling them per task.
+    """
+    rows = len(ticks["event_ms"])
+    size = sum(rows * np.dtype(dtype).itemsize for _, dtype in _LAYOUT)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for name, view in _views(shm.buf, rows).items():
+        view[:] = ticks[name]
+    return shm
+
+
+# Per-worker state, set by _init_worker
+_shm: shared_memory.SharedMemory | None = None
+_ticks: Dict[str, np.ndarray] = {}
+_symbols: List[str] = []
+
+
+def _init_worker(shm_name: str, rows: int, symbols: List[str]):
+    global _shm, _ticks, _symbols
+    # Per-trade prints from the simulator are noise across thousands of runs
+    sys.stdout = open(os.devnull, "w")
+
+    _shm = shared_memory.SharedMemory(name=shm_name)
+    _ticks = _views(_shm.buf, rows)
+    for view in _ticks.values():
+        view.flags.writeable = False
+    _symbols = symbols
+
+
+def _run_one(params: StrategyParams) -> dict:
+    from backtest.simulate import simulate, summarize
+
+    started = time.perf_counter()
+    trades = simulate(_ticks["event_ms"], _ticks["symbol_id"], _ticks["close"], _symbols, params)
+    result = params.as_dict()
+    result.update(summarize(trades))
+    result["elapsed_seconds"] = time.perf_counter() - started
+    return result
+
+
+# ---------- RESULTS TABLE ----------
+
+metadata = MetaData()
+
+sweep_results = Table(
+    "sweep_results",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("sweep_id", String, index=True, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("data_start", DateTime),
+    Column("data_end", DateTime),
+    Column("symbols", String),
+    Column("ticks", Integer),
+
+    # Parameters (one column per StrategyParams field)
+    *(
+        Column(name, Integer if kind is int else Float, nullable=False)
+        for name, kind in _PARAM_TYPES.items()
+    ),
+
+    # Metrics (backtest.simulate.summarize)
+    Column("signals", Integer),
+    Column("trades_closed", Integer),
+    Column("trades_open_at_end", Integer),
+    Column("wins", Integer),
+    Column("win_rate", Float),
+    Column("pnl_1x_sum", Float),
+    Column("pnl_1x_avg", Float),
+    Column("max_drawdown_1x", Float),
+    Column("trail_exits", Integer),
+    Column("time_exits", Integer),
+    Column("avg_hold_seconds", Float),
+    Column("elapsed_seconds", Float),
+)
+
+
+def results_engine(db_url: str):
+    engine = create_engine(db_url)
+    if engine.url.get_backend_name() == "sqlite" and engine.url.database:
+        Path(engine.url.database).parent.mkdir(parents=True, exist_ok=True)
+    metadata.create_all(engine)
+    return engine
+
+
+# ---------- RUN ----------
+
+def run_sweep(
+    ticks: dict,
+    grid: List[StrategyParams],
+    db_url: str,
+    workers: int | None = None,
+    data_start: datetime | None = None,
+    data_end: datetime | None = None,
+) -> str:
+    """
+    Evaluate every parameter set in `grid` over `ticks` (TickReader.read
+    output) on a process pool and append one row per run to
+    sweep_results. Returns the sweep_id (start time plus a random
+    suffix, so sweeps started in the same second stay apart).
+    """
+    rows = len(ticks["event_ms"])
+    symbols = list(ticks["symbols"])
+    sweep_id = f"{utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+    common = {
+        "sweep_id": sweep_id,
+        "data_start": data_start,
+        "data_end": data_end,
+        "symbols": ",".join(symbols),
+        "ticks": rows,
+    }
+
+    engine = results_engine(db_url)
+    shm = share_ticks(ticks)
+    workers = workers or os.cpu_count() or 1
+
+    print(f"Sweep {sweep_id} | {len(grid)} runs | {rows} ticks | {workers} workers")
+
+    started = time.perf_counter()
+    done = 0
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shm.name, rows, symbols),
+        ) as pool, engine.connect() as conn:
+            futures = [pool.submit(_run_one, params) for params in grid]
+            for future in as_completed(futures):
+                result = future.result()
+                conn.execute(
+                    insert(sweep_results),
+                    [{**common, **result, "created_at": utcnow()}],
+                )
+                conn.commit()
+
+                done += 1
+                if done % 50 == 0 or done == len(grid):
+                    elapsed = time.perf_counter() - started
+                    print(f"Sweep {sweep_id} | {done}/{len(grid)} | {elapsed:.0f}s")
+    finally:
+        shm.close()
+        shm.unlink()
+        engine.dispose()
+
+    return sweep_id
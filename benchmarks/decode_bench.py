@@ -0,0 +1,154 @@
+"""
+Microbenchmark for decoding !miniTicker@arr frames.
+
+    # capture real frames (one JSON frame per line)
+    python -m benchmarks.decode_bench capture --count 300 --out runtime/frames.jsonl
+
+    # compare decode paths on captured (or synthetic) frames
+    python -m benchmarks.decode_bench run --frames runtime/frames.jsonl
+
+Reports frames/second and CPU time per frame for the original path
+(json.loads + list filter) and MiniTickerDecoder with each JSON backend.
+update_price is not included; this measures decoding and filtering only.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+
+from config import SYMBOLS
+from data_feed.decode import MiniTickerDecoder, orjson
+
+
+# ---------- FRAMES ----------
+
+async def _capture(count: int, out: Path):
+    import websockets
+    from data_feed.binance_ws import FirehoseFeed
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    async with websockets.connect(FirehoseFeed().url) as websocket:
+        with open(out, "w", encoding="utf-8") as f:
+            for i in range(count):
+                f.write(await websocket.recv())
+                f.write("\n")
+                if (i + 1) % 50 == 0:
+                    print(f"captured {i + 1}/{count}")
+
+
+def synthetic_frames(count: int, n_symbols: int, seed: int = 0) -> list:
+    """
+    Frames shaped like !miniTicker@arr: SYMBOLS plus filler symbols,
+    shuffled per frame.
+    """
+    rng = random.Random(seed)
+    symbols = list(SYMBOLS) + [f"SYN{i}USDT" for i in range(max(0, n_symbols - len(SYMBOLS)))]
+    frames = []
+    event_ms = 1767225600000
+    for _ in range(count):
+        event_ms += 1000
+        tickers = []
+        for s in rng.sample(symbols, len(symbols)):
+            px = rng.uniform(0.001, 50000)
+            tickers.append({
+                "e": "24hrMiniTicker", "E": event_ms, "s": s,
+                "c": f"{px:.6f}", "o": f"{px * 0.99:.6f}", "h": f"{px * 1.01:.6f}",
+                "l": f"{px * 0.98:.6f}", "v": f"{rng.uniform(1, 1e7):.2f}",
+                "q": f"{rng.uniform(1, 1e9):.2f}",
+            })
+        frames.append(json.dumps(tickers, separators=(",", ":")))
+    return frames
+
+
+# ---------- PATHS ----------
+
+def _baseline(frames):
+    # Original binance_ws_listener loop, before the decode fast path
+    for message in frames:
+        for ticker in json.loads(message):
+            symbol = ticker.get("s")
+            if symbol not in SYMBOLS:
+                continue
+            float(ticker.get("c"))
+
+
+def _decoder_path(decoder: MiniTickerDecoder):
+    def run(frames):
+        for message in frames:
+            decoder.ticks(decoder.decode(message))
+    return run
+
+
+def _measure(fn, frames, repeat: int) -> dict:
+    fn(frames[: min(len(frames), 10)])  # warm-up
+
+    best_wall = best_cpu = float("inf")
+    for _ in range(repeat):
+        wall, cpu = time.perf_counter(), time.process_time()
+        fn(frames)
+        best_wall = min(best_wall, time.perf_counter() - wall)
+        best_cpu = min(best_cpu, time.process_time() - cpu)
+
+    return {
+        "frames_per_second": len(frames) / best_wall,
+        "cpu_us_per_frame": best_cpu / len(frames) * 1e6,
+    }
+
+
+def run(frames: list, repeat: int) -> dict:
+    paths = {
+        "baseline (json + list filter)": _baseline,
+        "decoder json": _decoder_path(MiniTickerDecoder(backend="json")),
+    }
+    if orjson is not None:
+        paths["decoder orjson"] = _decoder_path(MiniTickerDecoder(backend="orjson"))
+
+    return {name: _measure(fn, frames, repeat) for name, fn in paths.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="miniTicker frame decode microbenchmark")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    cap = sub.add_parser("capture", help="Save live frames, one per line")
+    cap.add_argument("--count", type=int, default=300)
+    cap.add_argument("--out", default="runtime/frames.jsonl")
+
+    bench = sub.add_parser("run", help="Benchmark decode paths")
+    bench.add_argument("--frames", default=None, help="Captured frames file (default: synthetic)")
+    bench.add_argument("--synthetic-count", type=int, default=300)
+    bench.add_argument("--synthetic-symbols", type=int, default=650)
+    bench.add_argument("--repeat", type=int, default=5)
+    bench.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    args = parser.parse_args()
+
+    if args.cmd == "capture":
+        asyncio.run(_capture(args.count, Path(args.out)))
+        return
+
+    if args.frames:
+        frames = [line for line in Path(args.frames).read_text(encoding="utf-8").splitlines() if line]
+        source = args.frames
+    else:
+        frames = synthetic_frames(args.synthetic_count, args.synthetic_symbols)
+        source = f"synthetic ({args.synthetic_symbols} symbols)"
+
+    results = run(frames, args.repeat)
+
+    if args.json:
+        print(json.dumps({"frames": len(frames), "source": source, "results": results}, indent=2))
+        return
+
+    print(f"{len(frames)} frames | {source} | tracked symbols={len(SYMBOLS)}")
+    for name, r in results.items():
+        print(
+            f"  {name:<32} {r['frames_per_second']:>10,.0f} frames/s | "
+            f"{r['cpu_us_per_frame']:>8.1f} us CPU/frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
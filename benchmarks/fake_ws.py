@@ -0,0 +1,55 @@
+import asyncio
+from typing import List
+
+import websockets
+
+
+class FakeBinanceServer:
+    """
+    Local stand-in for the Binance futures websocket, for benchmarks.
+
+    Every connection (any path, e.g. /ws/!miniTicker@arr) receives the
+    given frames in order, `rate` frames per second (0 = as fast as the
+    socket takes them), then stays open until the client leaves. Use as
+    an async context manager; base_url goes to FirehoseFeed(base_url=...).
+    """
+
+    def __init__(self, frames: List[str], rate: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.frames = frames
+        self.rate = rate
+        self.host = host
+        self.port = port
+        self.sent = 0
+        self.done = asyncio.Event()
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def _handler(self, websocket, *args):
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
+
+        for frame in self.frames:
+            await websocket.send(frame)
+            self.sent += 1
+            if interval:
+                # Paced on absolute times so send cost does not add up
+                next_at += interval
+                delay = next_at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+        self.done.set()
+        await websocket.wait_closed()
+
+    async def __aenter__(self):
+        self._server = await websockets.serve(self._handler, self.host, self.port, max_size=None)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
@@ -0,0 +1,416 @@
+"""
+Offline benchmark suite for every pipeline stage.
+
+    python -m benchmarks.suite                                  # 30, 300, 1000 symbols
+    python -m benchmarks.suite --symbols 30,300 --out runtime/benchmarks/base.json
+    python -m benchmarks.suite --compare runtime/benchmarks/base.json
+
+Stages, run for each symbol count:
+
+    decode     miniTicker frames decoded per second (MiniTickerDecoder)
+    feed       frames/s through FirehoseFeed from a local fake websocket
+               server, including update_price
+    pipeline   tick -> signal and signal -> trade latency (SignalEngine +
+               SignalConsumer), fed by the fake server in real time
+    db         rows/s through the write-behind writer into SQLite
+    simulator  trade entry cost, idle simulator_step time and exit engine
+               cost per tick with open trades on every symbol
+
+Input comes from a seeded SyntheticMarket and everything is written to a
+throwaway SQLite database, so nothing touches the network or momentum.db.
+Results go to a JSON file (with git commit, Python and platform); with
+--compare, every metric is printed next to an earlier results file and
+changes beyond --threshold in the wrong direction are flagged.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.fake_ws import FakeBinanceServer
+from benchmarks.synthetic import REGIMES, SyntheticMarket
+
+
+DEFAULT_SYMBOL_COUNTS = [30, 300, 1000]
+DEFAULT_OUT_DIR = Path("runtime/benchmarks")
+
+# Metrics with these suffixes are better when lower / higher; others
+# (sample counts etc.) are shown but never flagged
+LOWER_IS_BETTER = ("_us", "_ms")
+HIGHER_IS_BETTER = ("_per_second",)
+
+
+def _percentiles(samples_ns: List[int], prefix: str) -> dict:
+    if not samples_ns:
+        return {f"{prefix}_samples": 0}
+    ordered = sorted(samples_ns)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] / 1000
+
+    return {
+        f"{prefix}_samples": len(ordered),
+        f"{prefix}_p50_us": pick(0.50),
+        f"{prefix}_p90_us": pick(0.90),
+        f"{prefix}_p99_us": pick(0.99),
+        f"{prefix}_max_us": ordered[-1] / 1000,
+    }
+
+
+@contextlib.contextmanager
+def _quiet():
+    # The pipeline prints a line per signal / trade / exit
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+# ---------- STAGES ----------
+
+def bench_decode(n_symbols: int, seed: int, frames: int, repeat: int) -> dict:
+    from data_feed.decode import MiniTickerDecoder
+
+    data = SyntheticMarket(n_symbols, seed).frames(frames)
+    decoder = MiniTickerDecoder(track_all=True)
+
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for message in data:
+            decoder.ticks(decoder.decode(message))
+        best = min(best, time.perf_counter() - started)
+
+    return {
+        "frames_per_second": len(data) / best,
+        "frame_us": best / len(data) * 1e6,
+    }
+
+
+async def bench_feed(n_symbols: int, seed: int, frames: int) -> dict:
+    from data_feed.binance_ws import FirehoseFeed
+    from data_feed.decode import MiniTickerDecoder
+    from data_feed.market_state import market_state
+
+    market_state.clear()
+    data = SyntheticMarket(n_symbols, seed).frames(frames)
+    ticks = sum(message.count('"s":') for message in data[1:])
+
+    async with FakeBinanceServer(data) as server:
+        feed = FirehoseFeed(decoder=MiniTickerDecoder(track_all=True), base_url=server.base_url)
+        task = asyncio.create_task(feed.run_forever())
+        try:
+            # Timed from the first frame, so connecting is not counted
+            while feed.messages < 1:
+                await asyncio.sleep(0)
+            started = time.perf_counter()
+            while feed.messages < len(data):
+                await asyncio.sleep(0)
+            elapsed = time.perf_counter() - started
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    return {
+        "frames_per_second": (len(data) - 1) / elapsed,
+        "ticks_per_second": ticks / elapsed,
+    }
+
+
+async def bench_pipeline(n_symbols: int, seed: int, seconds: float, rate: float) -> dict:
+    import trades.signal_consumer as signal_consumer_module
+    from data_feed.binance_ws import FirehoseFeed
+    from data_feed.decode import MiniTickerDecoder
+    from data_feed.market_state import market_state, subscribe, unsubscribe
+    from signals.params import StrategyParams
+    from signals.signal_engine import SignalEngine
+    from trades.signal_consumer import SignalConsumer
+
+    market_state.clear()
+    market = SyntheticMarket(n_symbols, seed, regimes=("normal", "volatile"))
+    data = market.frames(max(2, int(seconds * rate)))
+
+    # Fire often: 1s lookback / cooldown on wall time, threshold around
+    # the volatile regime's per-frame move
+    params = StrategyParams.from_config(
+        lookback_seconds=1, momentum_pct=REGIMES["volatile"], cooldown_seconds=1,
+    )
+
+    tick_ns: Dict[str, int] = {}
+    submit_ns: Dict[int, int] = {}
+    tick_to_signal: List[int] = []
+    signal_to_trade: List[int] = []
+
+    def on_tick(symbol: str):
+        tick_ns[symbol] = time.perf_counter_ns()
+
+    consumer = SignalConsumer()
+
+    def sink(signal):
+        now = time.perf_counter_ns()
+        tick_to_signal.append(now - tick_ns[signal.symbol])
+        submit_ns[signal.id] = now
+        consumer.submit(signal)
+
+    create_trade = signal_consumer_module.create_trade_from_signal
+
+    def timed_create_trade(signal):
+        trade = create_trade(signal)
+        started = submit_ns.pop(signal.id, None)
+        if started is not None:
+            signal_to_trade.append(time.perf_counter_ns() - started)
+        return trade
+
+    # Registered before the engine's listener, so it stamps the tick first
+    subscribe(on_tick)
+    signal_consumer_module.create_trade_from_signal = timed_create_trade
+    try:
+        async with FakeBinanceServer(data, rate=rate) as server:
+            feed = FirehoseFeed(decoder=MiniTickerDecoder(track_all=True), base_url=server.base_url)
+            engine = SignalEngine(
+                mode="tick", signal_sink=sink, notify=False, symbols=market.symbols, params=params,
+            )
+            tasks = [
+                asyncio.create_task(coro)
+                for coro in (engine.run_forever(), consumer.run_forever(), feed.run_forever())
+            ]
+            try:
+                await server.done.wait()
+                await asyncio.sleep(0.2)  # let the last signals become trades
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        signal_consumer_module.create_trade_from_signal = create_trade
+        unsubscribe(on_tick)
+
+    return {
+        **_percentiles(tick_to_signal, "tick_to_signal"),
+        **_percentiles(signal_to_trade, "signal_to_trade"),
+    }
+
+
+async def bench_db(n_symbols: int, rows_per_symbol: int) -> dict:
+    from storage.queries import create_pending_trade, insert_signal, mark_trade_closed, mark_trade_open
+    from storage.worker import db_worker
+    from storage.writer import writer
+    from utils.clock import utcnow
+
+    # Queued on the loop like the live pipeline, flushed on the DB worker
+    await db_worker.run(writer.flush)
+    count = n_symbols * rows_per_symbol
+    now = utcnow()
+
+    started = time.perf_counter()
+    for i in range(count):
+        symbol = f"SYN{i % n_symbols}USDT"
+        signal = insert_signal({
+            "symbol": symbol, "timestamp_signal": now, "direction": "LONG",
+            "price_at_signal": 100.0, "move_pct": 0.01,
+            "volume_1m": 0.0, "volume_10m_avg": 0.0, "volume_ratio": 0.0,
+            "ema_side": "unknown", "liquidity_tier": "HIGH",
+        })
+        trade = create_pending_trade(signal.id, symbol, "LONG", 0, now)
+        mark_trade_open(trade.id, now, 100.0, None, None)
+        mark_trade_closed(trade.id, now, 101.0, "TRAIL", 0.01, 0.05, 0.0, 0.0, 1)
+    enqueued = time.perf_counter() - started
+    while writer.pending:
+        await db_worker.run(writer.flush)
+    elapsed = time.perf_counter() - started
+
+    rows = count * 4
+    return {
+        "rows_per_second": rows / elapsed,
+        "enqueue_us": enqueued / rows * 1e6,
+    }
+
+
+def bench_simulator(n_symbols: int, seed: int, frames: int, trades_per_symbol: int) -> dict:
+    from data_feed.market_state import market_state, update_price
+    from signals.params import StrategyParams
+    from storage.models import Trade
+    from trades.exit_engine import ExitEngine
+    from trades.trade_book import TradeBook
+    from trades.trade_simulator import simulator_step
+    from utils.clock import now_ns, utcnow
+
+    market_state.clear()
+    market = SyntheticMarket(n_symbols, seed)
+    for symbol, price in zip(market.symbols, market.prices):
+        update_price(symbol, price)
+
+    book = TradeBook(persist=False)
+    exits = ExitEngine(book, StrategyParams.from_config(time_stop_seconds=3600))
+
+    now = utcnow()
+    trade_id = 0
+    for symbol in market.symbols:
+        for k in range(trades_per_symbol):
+            trade_id += 1
+            book.add_pending(Trade(
+                id=trade_id, signal_id=trade_id, symbol=symbol,
+                direction="LONG" if k % 2 == 0 else "SHORT",
+                entry_delay_seconds=0, entry_time_planned=now,
+            ))
+
+    started = time.perf_counter()
+    simulator_step(now_ns(), book, exits)
+    entry = (time.perf_counter() - started) / max(trade_id, 1)
+
+    steps = 1000
+    started = time.perf_counter()
+    for _ in range(steps):
+        simulator_step(now_ns(), book, exits)
+    idle = (time.perf_counter() - started) / steps
+
+    ticks = 0
+    exit_seconds = 0.0
+    for _ in range(frames):
+        for symbol, _, price, _ in market.step():
+            update_price(symbol, price)
+            started = time.perf_counter()
+            exits.on_tick(symbol)
+            exit_seconds += time.perf_counter() - started
+            ticks += 1
+
+    return {
+        "entry_us": entry * 1e6,
+        "step_idle_us": idle * 1e6,
+        "exit_tick_us": exit_seconds / max(ticks, 1) * 1e6,
+        "trades_open_at_end": len(book.open),
+    }
+
+
+# ---------- RUN / COMPARE ----------
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_suite(args) -> dict:
+    # Imported here: storage reads DATABASE_URL at import time (set in main)
+    from storage.async_queries import init_db
+    from storage.worker import db_worker
+
+    await init_db()
+
+    results: Dict[str, Dict[str, dict]] = {}
+    try:
+        for n in args.symbols:
+            print(f"{n} symbols ...")
+            with _quiet():
+                stage_results = {
+                    "decode": bench_decode(n, args.seed, args.frames, args.repeat),
+                    "feed": await bench_feed(n, args.seed, args.frames),
+                    "pipeline": await bench_pipeline(n, args.seed, args.seconds, args.rate),
+                    "db": await bench_db(n, args.db_rows_per_symbol),
+                    "simulator": bench_simulator(n, args.seed, args.frames, args.trades_per_symbol),
+                }
+            for stage, metrics in stage_results.items():
+                results.setdefault(stage, {})[str(n)] = metrics
+    finally:
+        db_worker.stop()
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        },
+        "results": results,
+    }
+
+
+def print_results(report: dict):
+    for stage, by_size in report["results"].items():
+        print(f"\n{stage}")
+        for size, metrics in by_size.items():
+            values = " | ".join(
+                f"{name}={value:,.1f}" if isinstance(value, float) else f"{name}={value}"
+                for name, value in metrics.items()
+            )
+            print(f"  {size:>5} symbols | {values}")
+
+
+def compare(old: dict, new: dict, threshold: float) -> int:
+    """
+    Print new vs old per metric; returns the number of regressions.
+    """
+    regressions = 0
+    print(f"\nvs {old['meta'].get('git_commit')} ({old['meta'].get('created_at')})")
+    for stage, by_size in new["results"].items():
+        for size, metrics in by_size.items():
+            previous = old["results"].get(stage, {}).get(size, {})
+            for name, value in metrics.items():
+                before = previous.get(name)
+                if not isinstance(value, (int, float)) or not before:
+                    continue
+                change = (value - before) / before
+                worse = (
+                    (name.endswith(LOWER_IS_BETTER) and change > 0)
+                    or (name.endswith(HIGHER_IS_BETTER) and change < 0)
+                )
+                flag = ""
+                if worse and abs(change) > threshold:
+                    flag = "  <-- REGRESSION"
+                    regressions += 1
+                print(f"  {stage:<9} {size:>5} {name:<28} {before:>14,.1f} -> {value:>14,.1f} ({change:+.1%}){flag}")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite (synthetic market, fake websocket)")
+    parser.add_argument("--symbols", default=",".join(map(str, DEFAULT_SYMBOL_COUNTS)),
+                        help="Comma-separated symbol counts (default: 30,300,1000)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--frames", type=int, default=200, help="Frames for decode / feed / simulator")
+    parser.add_argument("--repeat", type=int, default=3, help="Decode repeats (best is kept)")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Pipeline run time")
+    parser.add_argument("--rate", type=float, default=20.0, help="Pipeline frames per second")
+    parser.add_argument("--db-rows-per-symbol", type=int, default=20)
+    parser.add_argument("--trades-per-symbol", type=int, default=2)
+    parser.add_argument("--out", default=None, help=f"Results file (default: {DEFAULT_OUT_DIR}/suite-<time>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change flagged as regression")
+    args = parser.parse_args()
+    args.symbols = [int(s) for s in args.symbols.split(",") if s.strip()]
+    return args
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        report = asyncio.run(run_suite(args))
+
+    out = Path(args.out) if args.out else DEFAULT_OUT_DIR / f"suite-{datetime.now():%Y%m%dT%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print_results(report)
+    print(f"\nResults written to {out}")
+
+    if args.compare:
+        old = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if compare(old, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import json
+import math
+import random
+from typing import Dict, List, Sequence, Tuple
+
+
+# Per-update log-return stdev of each volatility regime
+REGIMES: Dict[str, float] = {
+    "calm": 0.0002,
+    "normal": 0.001,
+    "volatile": 0.005,
+}
+
+START_MS = 1767225600000  # 2026-01-01 00:00 UTC
+
+
+class SyntheticMarket:
+    """
+    Seeded random-walk market for benchmarks.
+
+    Every symbol follows a geometric random walk whose volatility comes
+    from its current regime (REGIMES); each frame a symbol switches to a
+    random regime with probability `switch_prob`. `update_prob` is the
+    chance that a symbol is in a given frame, like the real
+    !miniTicker@arr, which only carries symbols that changed.
+
+    The same seed, symbol count and arguments always produce the same
+    frames, so benchmark runs are comparable.
+    """
+
+    def __init__(
+        self,
+        n_symbols: int,
+        seed: int = 0,
+        regimes: Sequence[str] = tuple(REGIMES),
+        switch_prob: float = 0.01,
+        update_prob: float = 0.8,
+        start_ms: int = START_MS,
+    ):
+        for name in regimes:
+            if name not in REGIMES:
+                raise ValueError(f"Unknown regime: {name} (choose from {', '.join(REGIMES)})")
+
+        self.rng = random.Random(seed)
+        self.regimes = list(regimes)
+        self.switch_prob = switch_prob
+        self.update_prob = update_prob
+        self.event_ms = start_ms
+
+        self.symbols = [f"SYN{i}USDT" for i in range(n_symbols)]
+        self.prices = [10 ** self.rng.uniform(-3, 4.5) for _ in self.symbols]
+        self.volumes = [self.rng.uniform(1e4, 1e8) for _ in self.symbols]
+        self.regime = [self.rng.choice(self.regimes) for _ in self.symbols]
+
+    def step(self, interval_ms: int = 1000) -> List[Tuple[str, int, float, float]]:
+        """
+        Advance one frame; returns (symbol, event_ms, price, 24h volume)
+        for the symbols that updated.
+        """
+        rng = self.rng
+        self.event_ms += interval_ms
+        updates = []
+        for i, symbol in enumerate(self.symbols):
+            if rng.random() < self.switch_prob:
+                self.regime[i] = rng.choice(self.regimes)
+            if rng.random() >= self.update_prob:
+                continue
+            self.prices[i] *= math.exp(rng.gauss(0.0, REGIMES[self.regime[i]]))
+            self.volumes[i] += rng.uniform(0, 1e4)
+            updates.append((symbol, self.event_ms, self.prices[i], self.volumes[i]))
+        return updates
+
+    def miniticker_frame(self, interval_ms: int = 1000) -> str:
+        """
+        Next frame as !miniTicker@arr JSON.
+        """
+        tickers = []
+        for symbol, event_ms, price, volume in self.step(interval_ms):
+            tickers.append({
+                "e": "24hrMiniTicker", "E": event_ms, "s": symbol,
+                "c": f"{price:.8g}", "o": f"{price * 0.99:.8g}", "h": f"{price * 1.01:.8g}",
+                "l": f"{price * 0.98:.8g}", "v": f"{volume:.2f}", "q": f"{volume * price:.2f}",
+            })
+        return json.dumps(tickers, separators=(",", ":"))
+
+    def frames(self, count: int, interval_ms: int = 1000) -> List[str]:
+        return [self.miniticker_frame(interval_ms) for _ in range(count)]
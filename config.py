@@ -1,6 +1,22 @@
+import os
+
 # Database
 
-DATABASE_URL = "sqlite:///./momentum.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./momentum.db")
+
+# Write-behind batching of signal / trade writes (storage/writer.py):
+# group-commit every N ms, or earlier once M rows are pending
+DB_FLUSH_INTERVAL_MS = 200
+DB_FLUSH_MAX_ROWS = 500
+
+# A row that fails on its own is retried on the next N flushes, then
+# appended to the dead-letter file (one JSON line per row) and dropped
+DB_WRITE_RETRIES = 3
+DB_DEAD_LETTER_PATH = "./runtime/db_dead_letter.jsonl"
+
+# Print DB worker thread stats (queue wait, job / flush time) every N seconds
+# (0 disables)
+DB_STATS_INTERVAL_SECONDS = 300
 
 SYMBOLS = [
     # Majors
@@ -44,6 +60,103 @@ SYMBOLS = [
 ]
 
 
+# =========================
+# Data Feed (data_feed/binance_ws.py)
+# =========================
+
+# JSON decoder for websocket frames (data_feed/decode.py):
+# "auto" = orjson when installed, else stdlib json
+WS_JSON_BACKEND = os.getenv("WS_JSON_BACKEND", "auto")
+
+# Point both at a local stand-in server for testing
+BINANCE_WS_BASE_URL = os.getenv("BINANCE_WS_BASE_URL", "wss://fstream.binance.com")
+BINANCE_REST_BASE_URL = os.getenv("BINANCE_REST_BASE_URL", "https://fapi.binance.com")
+
+# "symbols" = combined per-symbol streams for SYMBOLS only
+# "all"     = !miniTicker@arr for every contract (always used when
+#             TRACK_ALL_SYMBOLS = True)
+WS_FEED_MODE = "symbols"
+
+# Streams subscribed per symbol in "symbols" mode; the price comes from
+# whichever arrives: "miniTicker" (close, 500ms), "aggTrade" (trade price,
+# ~100ms), "bookTicker" (mid price, real time)
+WS_SYMBOL_STREAMS = ["miniTicker"]
+
+# Symbols per websocket connection in "symbols" mode (Binance allows
+# 200 streams per connection); more symbols open more connections
+WS_SYMBOLS_PER_CONNECTION = 50
+
+# Reconnect backoff: base * 2^attempt, capped, with random jitter
+WS_RECONNECT_BASE_SECONDS = 1
+WS_RECONNECT_MAX_SECONDS = 60
+
+# Replace each connection (new one up before the old one closes) after
+# this long, ahead of Binance's forced disconnect at 24h
+WS_ROTATE_SECONDS = 12 * 60 * 60
+
+# A connection whose event time jumps by more than this (a reconnect or
+# a stall) leaves a gap for all its symbols, backfilled from REST
+# aggTrades. Single quiet symbols never count as gaps.
+WS_GAP_SECONDS = 10
+BACKFILL_ENABLED = True
+
+# Pace backfill REST calls (aggTrades costs 20 weight of the 2400/min limit)
+BACKFILL_REQUESTS_PER_MINUTE = 60
+
+
+# =========================
+# Market State
+# =========================
+
+# How much tick history to keep per symbol (seconds, evicted by age).
+# Must be >= LOOKBACK_SECONDS.
+PRICE_HISTORY_SECONDS = 15 * 60  # 15 minutes
+
+
+# =========================
+# Streaming Indicators (data_feed/indicators.py)
+# =========================
+
+# Per-symbol EMA / SMA / volume / volatility / VWAP / CVD, updated in
+# constant time on every tick. They fill the volume / CVD / EMA columns
+# of each signal and feed the strategy filters (signals/filters.py).
+INDICATORS_ENABLED = True
+
+INDICATOR_EMA_SECONDS = 300         # ema_side on signals
+INDICATOR_SMA_SECONDS = 300
+VOLUME_SHORT_WINDOW_SECONDS = 60    # volume_1m, buy_vol / sell_vol
+VOLUME_LONG_WINDOW_SECONDS = 600    # volume_10m_avg (per-minute average)
+VOLATILITY_WINDOW_SECONDS = 300     # stdev of per-bucket log returns
+VWAP_WINDOW_SECONDS = 900
+
+# Rolling windows are kept as this many fixed buckets each,
+# so window length does not change memory or update cost.
+INDICATOR_WINDOW_BUCKETS = 60
+
+
+# =========================
+# Trade Bars (data_feed/bars.py)
+# =========================
+
+# Aggregate aggTrade into OHLCV + taker buy / sell bars per symbol.
+# Adds aggTrade to WS_SYMBOL_STREAMS if missing (WS_FEED_MODE="symbols").
+BARS_ENABLED = False
+
+# (bar seconds, bars kept) per level, finest first; each level is rolled
+# up from the one before it. Defaults: 15 min of 1s, 12 h of 1m, 48 h of 5m.
+BAR_LEVELS = [(1, 900), (60, 720), (300, 576)]
+
+
+# =========================
+# Tick Recorder (data_feed/tick_recorder.py)
+# =========================
+
+# Record every feed price update to memory-mapped columnar day files
+TICK_RECORDER_ENABLED = False
+TICK_RECORDER_DIR = "./runtime/ticks"
+TICK_RECORDER_FLUSH_SECONDS = 1
+
+
 # =========================
 # Signal Engine — Momentum Detection
 # (ANALYTICS MODE)
@@ -59,6 +172,52 @@ LOOKBACK_SECONDS = 60
 # Cooldown per symbol after a signal (seconds)
 COOLDOWN_SECONDS = 300  # 5 minutes
 
+# How the engine finds symbols to evaluate:
+# "tick"   = event-driven, only symbols that received a new price
+# "poll"   = rescan every symbol once per second
+# "vector" = NumPy scan of every tracked symbol once per second
+#            (signals/vector_engine.py, requires numpy)
+SIGNAL_ENGINE_MODE = "tick"
+
+# Lookbacks (seconds) scanned together by the "vector" engine.
+# A symbol signals on the lookback with the largest move.
+MOMENTUM_LOOKBACKS_SECONDS = [LOOKBACK_SECONDS]
+
+# Track every USDT-M perpetual on the feed, not only SYMBOLS.
+# Intended for SIGNAL_ENGINE_MODE = "vector".
+TRACK_ALL_SYMBOLS = False
+
+# Strategies evaluated side by side on the same feed and feature cache
+# (signals/strategies.py). "id" is stored on every signal and trade;
+# "params" override the values in this file for that strategy only.
+# Kinds: "momentum", "momentum_ema" (option: ema_period_seconds).
+# "filters" veto signals using the streaming indicators (signals/filters.py):
+#   min_volume_ratio, ema_trend, vwap_side, cvd_confirms,
+#   volatility ({"min": ..., "max": ...}), and with BARS_ENABLED
+#   bar_volume_ratio, taker_ratio.
+DEFAULT_STRATEGY_ID = "momentum"
+STRATEGIES = [
+    {"id": DEFAULT_STRATEGY_ID, "kind": "momentum"},
+    # {"id": "mom_30s_0.5pct", "kind": "momentum",
+    #  "params": {"lookback_seconds": 30, "momentum_pct": 0.005}},
+    # {"id": "mom_ema5m", "kind": "momentum_ema", "ema_period_seconds": 300},
+    # {"id": "mom_vol2x", "kind": "momentum", "filters": {"min_volume_ratio": 2.0}},
+]
+
+
+# =========================
+# Signal -> Trade pipeline
+# =========================
+
+# Max signals buffered between SignalEngine and SignalConsumer.
+# On overflow the consumer falls back to a DB catch-up.
+SIGNAL_QUEUE_MAXSIZE = 1000
+
+# On startup and after a queue overflow, create trades for persisted
+# signals this recent that never got one (e.g. crash between signal
+# and trade). Older signals are left alone.
+SIGNAL_CATCHUP_SECONDS = 60
+
 
 # =========================
 # Trade Simulation (Paper Trading) — NO TP MODE
@@ -97,8 +256,6 @@ TRAILING_ACTIVATION_PCT = 0.002   # +0.20%
 TRAILING_DISTANCE_PCT = 0.0015    # 0.15%
 
 
-import os
-
 # =========================
 # Telegram notifications
 # =========================
@@ -109,3 +266,82 @@ TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 
 TELEGRAM_NOTIFY_SIGNALS = os.getenv("TELEGRAM_NOTIFY_SIGNALS", "true").lower() in ("1", "true", "yes")
 
+# Background notifier (notifier/telegram.py): bounded queue, coalescing
+# of bursts into one message, and Telegram's per-chat rate limits
+TELEGRAM_QUEUE_MAXSIZE = 100
+TELEGRAM_MIN_INTERVAL_SECONDS = 1.0
+TELEGRAM_MAX_PER_MINUTE = 20
+
+# Post the precomputed trade summaries (analytics/summary.py) every N
+# minutes; 0 = off
+TELEGRAM_SUMMARY_INTERVAL_MINUTES = 0
+
+
+# =========================
+# Analytics (analytics/)
+# =========================
+
+# pnl_pct_1x bucket edges for the PnL distribution (len + 1 buckets)
+ANALYTICS_PNL_BINS = [-0.05, -0.02, -0.01, -0.005, 0.0, 0.005, 0.01, 0.02, 0.05]
+
+
+
+# =========================
+# Metrics (utils/metrics.py)
+# =========================
+
+# Latency histograms and counters are always recorded in-process; this
+# serves them in Prometheus text format at http://HOST:PORT/metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+
+# =========================
+# Event-Loop Monitor & Profiling (utils/profiling.py)
+# =========================
+
+# Watchdog thread measuring event-loop lag; stalls longer than the
+# threshold are printed with the loop thread's stack
+LOOP_MONITOR_ENABLED = True
+LOOP_MONITOR_INTERVAL_SECONDS = 0.25
+LOOP_STALL_THRESHOLD_SECONDS = 0.1
+
+# Print lag percentiles / stall count every N seconds (0 disables)
+LOOP_STATS_INTERVAL_SECONDS = 300
+
+# On-demand sampling profiles (SIGUSR1, or /profile?seconds=N on the
+# metrics endpoint), written as collapsed stacks for flame graphs
+PROFILE_DIR = "runtime/profiles"
+PROFILE_SECONDS = 30
+PROFILE_SAMPLE_INTERVAL_MS = 5
+
+
+# =========================
+# Multi-Process Mode (processes.py)
+# =========================
+
+# Run the websocket feed and the signal engine in their own processes,
+# sharing prices through a shared-memory table; the main process keeps
+# storage, trades, the simulator and the notifier
+MULTIPROCESS_ENABLED = os.getenv("MULTIPROCESS_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# Strategies are split round-robin across this many engine processes
+ENGINE_PROCESSES = int(os.getenv("ENGINE_PROCESSES", "1"))
+
+# Symbol slots in the shared price table (symbols beyond it are dropped)
+SHARED_TABLE_CAPACITY = 1024
+
+# How often readers copy table updates into their market_state
+SHARED_TABLE_POLL_MS = 5
+
+
+# =========================
+# Clock (utils/clock.py)
+# =========================
+
+# "live":     local wall clock, read through the monotonic clock
+# "exchange": newest exchange event time, advanced locally between events
+#             (lookbacks / cooldowns / entry delays in exchange time)
+# replay.py and the backtest always use a simulated clock.
+CLOCK = os.getenv("CLOCK", "live")
@@ -0,0 +1,85 @@
+import asyncio
+from typing import Dict, Iterable, List, Tuple
+
+from config import BACKFILL_REQUESTS_PER_MINUTE, PRICE_HISTORY_SECONDS, WS_GAP_SECONDS
+from data_feed.binance_rest import BinanceRestClient
+from data_feed.market_state import backfill_prices, market_state
+from utils.clock import NS_PER_MS
+
+
+def _last_per_second(trades: List[Tuple[int, float]]) -> List[Tuple[int, float]]:
+    """
+    (ms, price) trades -> (epoch ns, price) of the last trade in each
+    second.
+    """
+    ticks: List[Tuple[int, float]] = []
+    for ms, price in trades:
+        if ticks and ticks[-1][0] // 1000 == ms // 1000:
+            ticks[-1] = (ms, price)
+        else:
+            ticks.append((ms, price))
+    return [(ms * NS_PER_MS, price) for ms, price in ticks]
+
+
+class GapBackfiller:
+    """
+    Detects feed outages and refills them from REST.
+
+    Each connection calls observe() with the newest event time of every
+    frame it receives. When a connection's event time jumps by more than
+    WS_GAP_SECONDS (a reconnect, or a stalled connection), the missing
+    interval is queued for every symbol the connection carries. Gaps are
+    not taken from a single symbol's ticks: a quiet symbol pausing for
+    that long is normal and would only spend the request budget.
+    Queued gaps are fetched from /fapi/v1/aggTrades by run_forever(), one
+    gap at a time and at most
+    BACKFILL_REQUESTS_PER_MINUTE requests (counting every page), then
+    inserted into market_state price history.
+    Only the last PRICE_HISTORY_SECONDS of a gap are fetched; anything
+    older would be evicted immediately.
+    """
+
+    def __init__(self, client: BinanceRestClient | None = None, gap_seconds: float = WS_GAP_SECONDS):
+        self.client = client or BinanceRestClient(requests_per_minute=BACKFILL_REQUESTS_PER_MINUTE)
+        self.gap_ms = int(gap_seconds * 1000)
+
+        self._last_event: Dict[str, int] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+        self.gaps_detected = 0
+        self.ticks_backfilled = 0
+
+    def observe(self, source: str, event_ms: int, symbols: Iterable[str] | None = None):
+        """
+        source: connection name; symbols: the symbols it carries (default:
+        every symbol in market_state, for the all-market stream).
+        """
+        last = self._last_event.get(source)
+        if last is not None and event_ms <= last:
+            return
+        self._last_event[source] = event_ms
+
+        if last is not None and event_ms - last > self.gap_ms:
+            self.gaps_detected += 1
+            for symbol in list(market_state if symbols is None else symbols):
+                self._queue.put_nowait((symbol, last + 1, event_ms - 1))
+
+    async def fill(self, symbol: str, start_ms: int, end_ms: int) -> int:
+        start_ms = max(start_ms, end_ms - PRICE_HISTORY_SECONDS * 1000)
+        trades = await self.client.agg_trades(symbol, start_ms, end_ms)
+        inserted = backfill_prices(symbol, _last_per_second(trades))
+        self.ticks_backfilled += inserted
+
+        print(
+            f"BACKFILL | {symbol} | gap={(end_ms - start_ms) / 1000:.1f}s | "
+            f"trades={len(trades)} | ticks={inserted}"
+        )
+        return inserted
+
+    async def run_forever(self):
+        while True:
+            symbol, start_ms, end_ms = await self._queue.get()
+            try:
+                await self.fill(symbol, start_ms, end_ms)
+            except Exception as e:
+                print(f"BACKFILL failed | {symbol} | {e}")
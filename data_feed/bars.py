@@ -0,0 +1,259 @@
+from array import array
+from typing import Dict, List, NamedTuple, Sequence
+
+from config import BAR_LEVELS
+
+
+class Bar(NamedTuple):
+    start: int          # epoch seconds
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    buy_volume: float   # taker buys
+    sell_volume: float  # taker sells
+    trades: int
+
+
+class BarSeries:
+    """
+    Fixed-capacity ring of bars at one resolution.
+
+    Bars are dense: a period without trades still gets a bar (no volume,
+    OHLC = previous close), so the last n bars always cover the last n
+    periods. Columns are preallocated array('d') / array('q') buffers;
+    opening a bar overwrites the oldest slot, nothing is ever resized.
+
+    Volume columns also keep running totals per slot, so sums over the
+    last n bars are one subtraction instead of a scan.
+    """
+
+    def __init__(self, seconds: int, capacity: int):
+        self.seconds = int(seconds)
+        self.capacity = int(capacity)
+        self.count = 0  # bars opened so far (not capped)
+
+        size = self.capacity
+        self._start = array("q", bytes(8 * size))
+        self._open = array("d", bytes(8 * size))
+        self._high = array("d", bytes(8 * size))
+        self._low = array("d", bytes(8 * size))
+        self._close = array("d", bytes(8 * size))
+        self._volume = array("d", bytes(8 * size))
+        self._buy = array("d", bytes(8 * size))
+        self._sell = array("d", bytes(8 * size))
+        self._trades = array("q", bytes(8 * size))
+
+        # Running totals up to and including each slot
+        self._cum_volume = array("d", bytes(8 * size))
+        self._cum_buy = array("d", bytes(8 * size))
+        self._cum_sell = array("d", bytes(8 * size))
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def current_start(self) -> int | None:
+        return self._start[(self.count - 1) % self.capacity] if self.count else None
+
+    # ---------- WRITE ----------
+
+    def _open_bar(self, start: int, price: float):
+        cap = self.capacity
+        prev = (self.count - 1) % cap
+        i = self.count % cap
+        has_prev = self.count > 0
+
+        self._start[i] = start
+        self._open[i] = self._high[i] = self._low[i] = self._close[i] = price
+        self._volume[i] = self._buy[i] = self._sell[i] = 0.0
+        self._trades[i] = 0
+        self._cum_volume[i] = self._cum_volume[prev] if has_prev else 0.0
+        self._cum_buy[i] = self._cum_buy[prev] if has_prev else 0.0
+        self._cum_sell[i] = self._cum_sell[prev] if has_prev else 0.0
+        self.count += 1
+
+    def advance(self, start: int, price: float) -> bool:
+        """
+        Make `start` (aligned to self.seconds) the current bar, filling any
+        skipped periods with empty bars at the previous close. `price`
+        opens the first bar. Returns True if a new bar was opened.
+        """
+        current = self.current_start
+        if current is None:
+            self._open_bar(start, price)
+            return True
+        if start <= current:
+            return False
+
+        prev_close = self._close[(self.count - 1) % self.capacity]
+        missing = (start - current) // self.seconds - 1
+        # Only the last `capacity - 1` empty bars can still be in the ring
+        first = current + self.seconds * (1 + max(0, missing - (self.capacity - 1)))
+        for empty_start in range(first, start, self.seconds):
+            self._open_bar(empty_start, prev_close)
+        self._open_bar(start, prev_close)
+        return True
+
+    def add_trade(self, price: float, qty: float, side: int):
+        """
+        Add one trade to the current bar. side: +1 taker buy, -1 taker sell.
+        """
+        i = (self.count - 1) % self.capacity
+        if self._trades[i] == 0:
+            self._open[i] = self._high[i] = self._low[i] = price
+        elif price > self._high[i]:
+            self._high[i] = price
+        elif price < self._low[i]:
+            self._low[i] = price
+        self._close[i] = price
+        self._trades[i] += 1
+
+        self._volume[i] += qty
+        self._cum_volume[i] += qty
+        if side > 0:
+            self._buy[i] += qty
+            self._cum_buy[i] += qty
+        elif side < 0:
+            self._sell[i] += qty
+            self._cum_sell[i] += qty
+
+    def merge(self, bar: Bar):
+        """
+        Fold a finished finer bar into the current bar (1s -> 1m -> 5m).
+        """
+        if not bar.trades:
+            return
+        i = (self.count - 1) % self.capacity
+        if self._trades[i] == 0:
+            self._open[i] = bar.open
+            self._high[i] = bar.high
+            self._low[i] = bar.low
+        else:
+            if bar.high > self._high[i]:
+                self._high[i] = bar.high
+            if bar.low < self._low[i]:
+                self._low[i] = bar.low
+        self._close[i] = bar.close
+        self._trades[i] += bar.trades
+
+        self._volume[i] += bar.volume
+        self._buy[i] += bar.buy_volume
+        self._sell[i] += bar.sell_volume
+        self._cum_volume[i] += bar.volume
+        self._cum_buy[i] += bar.buy_volume
+        self._cum_sell[i] += bar.sell_volume
+
+    # ---------- READ (all O(1)) ----------
+
+    def bar(self, back: int = 0) -> Bar | None:
+        """
+        back=0 is the bar still forming, 1 the last finished one, ...
+        """
+        if back < 0 or back >= len(self):
+            return None
+        i = (self.count - 1 - back) % self.capacity
+        return Bar(
+            self._start[i], self._open[i], self._high[i], self._low[i], self._close[i],
+            self._volume[i], self._buy[i], self._sell[i], self._trades[i],
+        )
+
+    def _window_sum(self, cum: array, n: int, skip: int) -> float:
+        """
+        Sum over n bars, ending `skip` bars before the forming one.
+        """
+        n = min(n, len(self) - skip)
+        if n <= 0:
+            return 0.0
+        cap = self.capacity
+        end = self.count - 1 - skip
+        total = cum[end % cap]
+        oldest = max(0, self.count - cap)
+        if end - n < oldest:
+            if oldest == 0:
+                return total
+            # The total before the oldest stored bar is gone; drop that bar
+            n = end - oldest
+        return total - cum[(end - n) % cap]
+
+    def volume(self, n: int, skip: int = 0) -> float:
+        return self._window_sum(self._cum_volume, n, skip)
+
+    def buy_volume(self, n: int, skip: int = 0) -> float:
+        return self._window_sum(self._cum_buy, n, skip)
+
+    def sell_volume(self, n: int, skip: int = 0) -> float:
+        return self._window_sum(self._cum_sell, n, skip)
+
+
+class SymbolBars:
+    """
+    Bars for one symbol at every level of BAR_LEVELS, e.g. 1s / 1m / 5m.
+
+    Trades only touch the finest level. When a finer bar finishes it is
+    folded into the next level up, so coarser bars cost one merge per
+    finished finer bar. A coarser level's forming bar therefore lags by at
+    most the finer bar still in progress.
+    """
+
+    def __init__(self, levels: Sequence[Sequence[int]] = BAR_LEVELS):
+        self.levels: List[BarSeries] = [BarSeries(seconds, capacity) for seconds, capacity in levels]
+        for finer, coarser in zip(self.levels, self.levels[1:]):
+            if coarser.seconds % finer.seconds:
+                raise ValueError("BAR_LEVELS resolutions must divide each other")
+        self.by_seconds: Dict[int, BarSeries] = {s.seconds: s for s in self.levels}
+
+    def on_trade(self, ts: float, price: float, qty: float, side: int):
+        finest = self.levels[0]
+        start = int(ts) - int(ts) % finest.seconds
+        current = finest.current_start
+
+        # Late trades count towards the current bar
+        if current is not None and start > current:
+            self._roll(0, finest.bar(0), start)
+        elif current is None:
+            for series in self.levels:
+                series.advance(start - start % series.seconds, price)
+
+        finest.add_trade(price, qty, side)
+
+    def _roll(self, level: int, finished: Bar, start: int):
+        """
+        Close the current bar of `level`, fold it upwards and open the bar
+        for `start`.
+        """
+        series = self.levels[level]
+        if level + 1 < len(self.levels):
+            parent = self.levels[level + 1]
+            parent.merge(finished)
+            parent_start = start - start % parent.seconds
+            if parent_start > parent.current_start:
+                self._roll(level + 1, parent.bar(0), parent_start)
+        series.advance(start, finished.close)
+
+    def series(self, seconds: int) -> BarSeries:
+        return self.by_seconds[seconds]
+
+
+class BarStore:
+    """
+    Per-symbol bars built from aggTrade (data_feed.binance_ws feeds it
+    when BARS_ENABLED). Bars use exchange event time, not the local clock.
+    """
+
+    def __init__(self, levels: Sequence[Sequence[int]] = BAR_LEVELS):
+        self.levels = levels
+        self.symbols: Dict[str, SymbolBars] = {}
+
+    def on_trade(self, symbol: str, ts: float, price: float, qty: float, side: int):
+        bars = self.symbols.get(symbol)
+        if bars is None:
+            bars = self.symbols[symbol] = SymbolBars(self.levels)
+        bars.on_trade(ts, price, qty, side)
+
+    def get(self, symbol: str) -> SymbolBars | None:
+        return self.symbols.get(symbol)
+
+
+bar_store = BarStore()
@@ -1,39 +1,92 @@
 import asyncio
 import json
-import websockets
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import List, Tuple
 
-from config import SYMBOLS
-from data_feed.market_state import update_price
+from config import BINANCE_REST_BASE_URL
 
 
-BINANCE_WS_URL = "wss://fstream.binance.com/ws/!miniTicker@arr"
+# /fapi/v1/aggTrades: at most 1000 rows per call, and a startTime /
+# endTime window of at most one hour
+AGG_TRADES_LIMIT = 1000
+AGG_TRADES_MAX_WINDOW_MS = 60 * 60 * 1000
 
 
-async def binance_ws_listener():
-    print("Connecting to Binance WebSocket...")
+class BinanceRestError(RuntimeError):
+    pass
 
-    async with websockets.connect(BINANCE_WS_URL) as websocket:
-        print("Connected to Binance WebSocket")
 
-        while True:
-            message = await websocket.recv()
-            data = json.loads(message)
+class BinanceRestClient:
+    """
+    Minimal Binance USDT-M futures REST client (public endpoints only).
 
-            for ticker in data:
-                symbol = ticker.get("s")
-                if symbol not in SYMBOLS:
-                    continue
+    Requests run in a worker thread (urllib) so the event loop is never
+    blocked, the same way notifier/telegram.py sends messages. With
+    requests_per_minute set, every request (including each page of a
+    paged call) waits for its slot.
+    """
 
-                price = float(ticker.get("c"))
-                update_price(symbol, price)
+    def __init__(self, base_url: str = BINANCE_REST_BASE_URL, timeout: float = 10,
+                 requests_per_minute: float = 0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.interval = 60 / requests_per_minute if requests_per_minute else 0.0
+        self._next_request = 0.0
 
-
-async def start_ws():
-    while True:
+    def _get_sync(self, path: str, params: dict):
+        url = f"{self.base_url}{path}?{urllib.parse.urlencode(params)}"
+        req = urllib.request.Request(url, method="GET")
         try:
-            await binance_ws_listener()
-        except Exception as e:
-            print(f"WebSocket error: {e}")
-            print("Reconnecting in 5 seconds...")
-            await asyncio.sleep(5)
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            body = e.read().decode("utf-8", errors="replace")
+            raise BinanceRestError(f"GET {path} -> HTTP {e.code}: {body}") from e
+
+    async def _pace(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_request)
+        self._next_request = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def get(self, path: str, params: dict):
+        await self._pace()
+        return await asyncio.to_thread(self._get_sync, path, params)
+
+    async def agg_trades(self, symbol: str, start_ms: int, end_ms: int) -> List[Tuple[int, float]]:
+        """
+        (trade_time_ms, price) for every aggregate trade with
+        start_ms <= T <= end_ms, oldest first. Pages through the range
+        within the endpoint's window / row limits: by time window until a
+        page comes back full, then by aggregate trade id (fromId), so
+        trades sharing the last page's timestamp are neither lost nor
+        repeated.
+        """
+        trades: List[Tuple[int, float]] = []
+        cursor = start_ms
+        from_id = None
+        while from_id is not None or cursor <= end_ms:
+            params = {"symbol": symbol, "limit": AGG_TRADES_LIMIT}
+            if from_id is None:
+                window_end = min(end_ms, cursor + AGG_TRADES_MAX_WINDOW_MS - 1)
+                params.update(startTime=cursor, endTime=window_end)
+            else:
+                params.update(fromId=from_id)
+            rows = await self.get("/fapi/v1/aggTrades", params)
+            trades.extend((row["T"], float(row["p"])) for row in rows if row["T"] <= end_ms)
 
+            if len(rows) < AGG_TRADES_LIMIT:
+                if from_id is not None:
+                    break  # caught up with the newest trade
+                cursor = window_end + 1
+            elif rows[-1]["T"] > end_ms:
+                break
+            else:
+                from_id = rows[-1]["a"] + 1
+        return trades
@@ -1,39 +1,473 @@
+import abc
 import asyncio
 import json
+import random
+import time
+from typing import Iterable, List
 import websockets
 
-from config import SYMBOLS
-from data_feed.market_state import update_price
+from config import (
+    BACKFILL_ENABLED,
+    BARS_ENABLED,
+    BINANCE_WS_BASE_URL,
+    SYMBOLS,
+    TRACK_ALL_SYMBOLS,
+    WS_FEED_MODE,
+    WS_RECONNECT_BASE_SECONDS,
+    WS_RECONNECT_MAX_SECONDS,
+    WS_ROTATE_SECONDS,
+    WS_SYMBOL_STREAMS,
+    WS_SYMBOLS_PER_CONNECTION,
+)
+from data_feed.backfill import GapBackfiller
+from data_feed.bars import BarStore, bar_store
+from data_feed.decode import MiniTickerDecoder, StreamDecoder
+from data_feed.market_state import update_price, update_ticker
+from utils.metrics import LatencyTrace, metrics
 
 
-BINANCE_WS_URL = "wss://fstream.binance.com/ws/!miniTicker@arr"
+# Binance limit on streams per connection
+MAX_STREAMS_PER_CONNECTION = 200
 
+FRAMES = metrics.counter("feed_frames_total", "Websocket frames received")
+TICKS = metrics.counter("feed_ticks_total", "Ticks applied to market state")
+TICKS_FILTERED = metrics.counter("feed_ticks_filtered_total", "Ticks dropped by the symbol filter")
 
-async def binance_ws_listener():
-    print("Connecting to Binance WebSocket...")
 
-    async with websockets.connect(BINANCE_WS_URL) as websocket:
-        print("Connected to Binance WebSocket")
+def backoff_delay(attempt: int) -> float:
+    """
+    Exponential backoff with jitter: uniform in [cap / 2, cap] where
+    cap = min(WS_RECONNECT_MAX_SECONDS, WS_RECONNECT_BASE_SECONDS * 2^attempt).
+    """
+    cap = min(WS_RECONNECT_MAX_SECONDS, WS_RECONNECT_BASE_SECONDS * 2 ** attempt)
+    return random.uniform(cap / 2, cap)
+
+
+class _FeedConnection(abc.ABC):
+    """
+    One self-healing websocket connection.
+
+    run_forever() reconnects with jittered exponential backoff after any
+    error, and replaces the connection every WS_ROTATE_SECONDS: the new
+    connection is opened before the old one is closed, so routine
+    rotation does not drop updates. Gaps that do happen (outages) are
+    picked up from the connection's event times by the GapBackfiller, if
+    one is set.
+
+    Ticks go to market_state, or to `sink` if given: any object with
+    market_state's update_price / update_ticker signatures (e.g. the
+    SharedPriceWriter of the multi-process feed).
+    """
+
+    def __init__(self, name: str, recorder=None, backfiller: GapBackfiller | None = None, sink=None):
+        self.name = name
+        self.recorder = recorder
+        self.backfiller = backfiller
+        self.sink = sink
+
+        self._websocket = None
+        self.connects = 0
+        self.messages = 0
+
+    @property
+    @abc.abstractmethod
+    def url(self) -> str:
+        ...
+
+    @abc.abstractmethod
+    async def _receive(self, websocket):
+        ...
+
+    async def _connect(self):
+        websocket = await websockets.connect(self.url)
+        self.connects += 1
+        return websocket
+
+    async def _wait_for_rotation(self, task: asyncio.Task):
+        """
+        Wait until WS_ROTATE_SECONDS have passed (returns, with the receive
+        task still running) or the receive task fails (raises).
+        """
+        done, _ = await asyncio.wait({task}, timeout=WS_ROTATE_SECONDS * random.uniform(0.9, 1.0))
+        if task in done:
+            task.result()  # re-raise the receive error
+            raise ConnectionError("receive loop ended")
+
+    @staticmethod
+    async def _stop(task: asyncio.Task | None):
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            pass  # the connection is being dropped anyway
+
+    async def run_forever(self):
+        attempt = 0
+        seen = self.messages
+        websocket = None
+        task = None
+        try:
+            while True:
+                try:
+                    if websocket is None:
+                        print(f"Connecting to Binance WebSocket [{self.name}]...")
+                        websocket = await self._connect()
+                        print(f"Connected to Binance WebSocket [{self.name}]")
+                    self._websocket = websocket
+                    seen = self.messages
+
+                    task = asyncio.create_task(self._receive(websocket))
+                    await self._wait_for_rotation(task)
+
+                    # Rotate: the old connection keeps receiving until the new
+                    # one is connected and subscribed, then it is dropped
+                    new_websocket = await self._connect()
+                    self._websocket = new_websocket
+                    await self._stop(task)
+                    task = None
+                    await websocket.close()
+                    websocket = new_websocket
+                    print(f"WebSocket rotated [{self.name}]")
+
+                except Exception as e:
+                    self._websocket = None
+                    await self._stop(task)
+                    task = None
+                    if websocket is not None:
+                        await websocket.close()
+                        websocket = None
+
+                    # Only a connection that delivered data resets the backoff
+                    if self.messages > seen:
+                        attempt = 0
+                    delay = backoff_delay(attempt)
+                    attempt += 1
+                    print(f"WebSocket error [{self.name}]: {e}")
+                    print(f"Reconnecting in {delay:.1f} seconds (attempt {attempt})...")
+                    await asyncio.sleep(delay)
+        finally:
+            self._websocket = None
+            await self._stop(task)
+            if websocket is not None:
+                await websocket.close()
+
+
+class FirehoseFeed(_FeedConnection):
+    """
+    All-market !miniTicker@arr connection, filtered locally.
+    """
+
+    def __init__(self, recorder=None, backfiller: GapBackfiller | None = None,
+                 decoder: MiniTickerDecoder | None = None, base_url: str = BINANCE_WS_BASE_URL, sink=None):
+        super().__init__("!miniTicker@arr", recorder, backfiller, sink)
+        self.decoder = decoder or MiniTickerDecoder()
+        self.base_url = base_url
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/ws/!miniTicker@arr"
+
+    async def _receive(self, websocket):
+        decoder = self.decoder
+        recorder = self.recorder
+        backfiller = self.backfiller
+        apply_ticker = self.sink.update_ticker if self.sink is not None else update_ticker
 
         while True:
             message = await websocket.recv()
-            data = json.loads(message)
+            recv_ns = time.time_ns()
+            trace = LatencyTrace(recv_ns)
+            data = decoder.decode(message)
+            trace.mark("decoded")
+            self.messages += 1
+            FRAMES.inc()
 
             # data is a list of tickers
-            for ticker in data:
-                symbol = ticker.get("s")
-                if symbol not in SYMBOLS:
-                    continue
+            if recorder is not None:
+                for ticker in data:
+                    recorder.append(
+                        ticker["E"], ticker["s"], float(ticker["c"]), float(ticker["v"]), recv_ns
+                    )
+
+            applied = 0
+            newest = 0
+            for symbol, event_ms, price, volume in decoder.ticks(data):
+                apply_ticker(symbol, price, volume, event_ms, trace)
+                applied += 1
+                if event_ms > newest:
+                    newest = event_ms
+            if backfiller is not None and applied:
+                backfiller.observe(self.name, newest)
+
+            trace.mark("updated")
+            trace.received(newest)
+            TICKS.inc(applied)
+            TICKS_FILTERED.inc(len(data) - applied)
+
+
+class SymbolStreamFeed(_FeedConnection):
+    """
+    Combined-stream connection carrying only the configured symbols
+    (<symbol>@miniTicker / @aggTrade / @bookTicker).
+
+    The subscription set can change at runtime: subscribe() /
+    unsubscribe() send SUBSCRIBE / UNSUBSCRIBE on the open connection, and
+    the current set is used for the URL on every reconnect.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = SYMBOLS,
+        streams: Iterable[str] = WS_SYMBOL_STREAMS,
+        recorder=None,
+        backfiller: GapBackfiller | None = None,
+        decoder: StreamDecoder | None = None,
+        base_url: str = BINANCE_WS_BASE_URL,
+        name: str = "streams",
+        bars: BarStore | None = None,
+        sink=None,
+    ):
+        super().__init__(name, recorder, backfiller, sink)
+        self.stream_types = list(streams)
+        self.decoder = decoder or StreamDecoder()
+        self.base_url = base_url
+        self.bars = bars
+        # With trades subscribed, miniTicker volume would be counted twice
+        self._ticker_volume = "aggTrade" not in self.stream_types
+
+        self.symbols: set[str] = set()
+        self._next_id = 1
+        self.add_symbols(symbols)
+
+    def stream_names(self, symbols: Iterable[str]) -> List[str]:
+        return [f"{s.lower()}@{t}" for s in symbols for t in self.stream_types]
 
-                price = float(ticker.get("c"))
-                update_price(symbol, price)
+    @property
+    def url(self) -> str:
+        streams = "/".join(self.stream_names(sorted(self.symbols)))
+        return f"{self.base_url}/stream?streams={streams}"
 
+    def add_symbols(self, symbols: Iterable[str]) -> List[str]:
+        added = [s.upper() for s in symbols if s.upper() not in self.symbols]
+        if len(self.stream_names(self.symbols)) + len(self.stream_names(added)) > MAX_STREAMS_PER_CONNECTION:
+            raise ValueError(
+                f"More than {MAX_STREAMS_PER_CONNECTION} streams on one connection "
+                f"({len(self.symbols) + len(added)} symbols x {len(self.stream_types)} streams)"
+            )
+        self.symbols.update(added)
+        return added
 
-async def start_ws():
-    while True:
+    # ---------- RUNTIME SUBSCRIPTIONS ----------
+
+    async def _connect(self):
+        symbols = set(self.symbols)
+        websocket = await super()._connect()
+        # subscribe() / unsubscribe() calls made during the handshake went
+        # to the previous connection (or nowhere): replay them on this one
+        await self._send("SUBSCRIBE", sorted(self.symbols - symbols), websocket)
+        await self._send("UNSUBSCRIBE", sorted(symbols - self.symbols), websocket)
+        return websocket
+
+    async def _send(self, method: str, symbols: List[str], websocket=None):
+        websocket = websocket or self._websocket
+        if not symbols or websocket is None:
+            return  # picked up from self.symbols on the next connect
+        request_id = self._next_id
+        self._next_id += 1
+        await websocket.send(json.dumps({
+            "method": method,
+            "params": self.stream_names(symbols),
+            "id": request_id,
+        }))
+        print(f"WS {method} #{request_id} [{self.name}] | {', '.join(symbols)}")
+
+    async def subscribe(self, symbols: Iterable[str]):
+        await self._send("SUBSCRIBE", self.add_symbols(symbols))
+
+    async def unsubscribe(self, symbols: Iterable[str]):
+        removed = [s.upper() for s in symbols if s.upper() in self.symbols]
+        self.symbols.difference_update(removed)
+        await self._send("UNSUBSCRIBE", removed)
+
+    # ---------- RECEIVE ----------
+
+    async def _receive(self, websocket):
+        decoder = self.decoder
+        recorder = self.recorder
+        backfiller = self.backfiller
+        bars = self.bars
+        apply_price = self.sink.update_price if self.sink is not None else update_price
+        apply_ticker = self.sink.update_ticker if self.sink is not None else update_ticker
+
+        while True:
+            message = await websocket.recv()
+            recv_ns = time.time_ns()
+            trace = LatencyTrace(recv_ns)
+            msg = decoder.decode(message)
+            trace.mark("decoded")
+            self.messages += 1
+            FRAMES.inc()
+
+            tick = decoder.tick(msg)
+            if tick is None:
+                if msg.get("error"):
+                    print(f"WS request #{msg.get('id')} failed [{self.name}]: {msg['error']}")
+                continue
+
+            symbol, event_ms, price, volume, qty = tick
+            if recorder is not None:
+                recorder.append(event_ms, symbol, price, volume, recv_ns)
+            if symbol not in self.symbols:
+                TICKS_FILTERED.inc()
+                continue
+
+            if backfiller is not None:
+                backfiller.observe(self.name, event_ms, self.symbols)
+            if qty:  # aggTrade
+                side = 1 if qty > 0 else -1
+                qty = abs(qty)
+                if bars is not None:
+                    bars.on_trade(symbol, event_ms / 1000, price, qty, side)
+                apply_price(symbol, price, qty, side, event_ms, trace)
+            elif volume == volume and self._ticker_volume:  # miniTicker (not NaN)
+                apply_ticker(symbol, price, volume, event_ms, trace)
+            else:
+                apply_price(symbol, price, 0.0, 0, event_ms, trace)
+
+            trace.mark("updated")
+            trace.received(event_ms)
+            TICKS.inc()
+
+
+class ShardedFeed:
+    """
+    Per-symbol streams spread over several SymbolStreamFeed connections of
+    at most WS_SYMBOLS_PER_CONNECTION symbols each. Symbols added at
+    runtime go to a shard with room, or to a new connection.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = SYMBOLS,
+        streams: Iterable[str] = WS_SYMBOL_STREAMS,
+        recorder=None,
+        backfiller: GapBackfiller | None = None,
+        per_connection: int = WS_SYMBOLS_PER_CONNECTION,
+        base_url: str = BINANCE_WS_BASE_URL,
+        bars: BarStore | None = None,
+        sink=None,
+    ):
+        self.streams = list(streams)
+        self.recorder = recorder
+        self.backfiller = backfiller
+        self.base_url = base_url
+        self.bars = bars
+        self.sink = sink
+        self.per_connection = min(per_connection, MAX_STREAMS_PER_CONNECTION // max(len(self.streams), 1))
+
+        self.shards: List[SymbolStreamFeed] = []
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        for i in range(0, len(symbols), self.per_connection):
+            self._new_shard(symbols[i:i + self.per_connection])
+
+    def _new_shard(self, symbols: List[str]) -> SymbolStreamFeed:
+        shard = SymbolStreamFeed(
+            symbols,
+            self.streams,
+            recorder=self.recorder,
+            backfiller=self.backfiller,
+            base_url=self.base_url,
+            name=f"shard {len(self.shards)}",
+            bars=self.bars,
+            sink=self.sink,
+        )
+        self.shards.append(shard)
+        if self._running:
+            self._tasks.append(asyncio.create_task(shard.run_forever()))
+        return shard
+
+    @property
+    def symbols(self) -> set:
+        return set().union(*(shard.symbols for shard in self.shards))
+
+    async def subscribe(self, symbols: Iterable[str]):
+        current = self.symbols
+        pending = [s.upper() for s in symbols if s.upper() not in current]
+        for shard in self.shards:
+            room = self.per_connection - len(shard.symbols)
+            if room > 0 and pending:
+                await shard.subscribe(pending[:room])
+                pending = pending[room:]
+        while pending:
+            self._new_shard(pending[:self.per_connection])
+            pending = pending[self.per_connection:]
+
+    async def unsubscribe(self, symbols: Iterable[str]):
+        symbols = [s.upper() for s in symbols]
+        for shard in self.shards:
+            await shard.unsubscribe([s for s in symbols if s in shard.symbols])
+
+    async def run_forever(self):
+        self._running = True
+        self._tasks = [asyncio.create_task(shard.run_forever()) for shard in self.shards]
         try:
-            await binance_ws_listener()
-        except Exception as e:
-            print(f"WebSocket error: {e}")
-            print("Reconnecting in 5 seconds...")
-            await asyncio.sleep(5)
+            # Shards may be added while running, so re-check the list every second
+            while True:
+                if not self._tasks:
+                    await asyncio.sleep(1)
+                    continue
+                done, _ = await asyncio.wait(self._tasks, timeout=1, return_when=asyncio.FIRST_EXCEPTION)
+                for task in done:
+                    task.result()
+                self._tasks = [t for t in self._tasks if not t.done()]
+        finally:
+            self._running = False
+            for task in self._tasks:
+                task.cancel()
+
+
+def create_feed(recorder=None, sink=None):
+    """
+    Feed for WS_FEED_MODE: sharded per-symbol streams ("symbols") or the
+    all-market miniTicker firehose ("all", or TRACK_ALL_SYMBOLS).
+    With BARS_ENABLED the symbol feed also builds trade bars; the
+    firehose carries no trades, so it has none.
+
+    With a sink (multi-process feed) there is no backfill and no bars:
+    both write this process's market_state / bar_store, which nobody
+    reads there.
+    """
+    local = sink is None
+    backfiller = GapBackfiller() if BACKFILL_ENABLED and local else None
+
+    if TRACK_ALL_SYMBOLS or WS_FEED_MODE == "all":
+        return FirehoseFeed(recorder=recorder, backfiller=backfiller, sink=sink)
+    if WS_FEED_MODE != "symbols":
+        raise ValueError(f"Unknown WS_FEED_MODE: {WS_FEED_MODE}")
+
+    streams = list(WS_SYMBOL_STREAMS)
+    if BARS_ENABLED and "aggTrade" not in streams:
+        streams.append("aggTrade")  # bars are built from trades
+    return ShardedFeed(
+        streams=streams,
+        recorder=recorder,
+        backfiller=backfiller,
+        bars=bar_store if BARS_ENABLED and local else None,
+        sink=sink,
+    )
+
+
+async def start_ws(recorder=None, feed=None):
+    feed = feed or create_feed(recorder)
+
+    tasks = [feed.run_forever()]
+    if feed.backfiller is not None:
+        tasks.append(feed.backfiller.run_forever())
+    await asyncio.gather(*tasks)
@@ -0,0 +1,97 @@
+import json
+from typing import Iterable, List, Tuple
+
+from config import SYMBOLS, TRACK_ALL_SYMBOLS, WS_JSON_BACKEND
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+
+def get_loads(backend: str = WS_JSON_BACKEND):
+    """
+    JSON decoder for websocket frames: "orjson", "json" or "auto".
+    """
+    if backend == "auto":
+        backend = "orjson" if orjson is not None else "json"
+    if backend == "orjson":
+        if orjson is None:
+            raise RuntimeError('WS_JSON_BACKEND="orjson" but orjson is not installed')
+        return orjson.loads
+    if backend == "json":
+        return json.loads
+    raise ValueError(f"Unknown WS_JSON_BACKEND: {backend}")
+
+
+class MiniTickerDecoder:
+    """
+    Decodes !miniTicker@arr frames and keeps only what the pipeline uses.
+
+    The frame carries every futures symbol; the symbol filter is a
+    frozenset lookup and float() runs only on the close price of symbols
+    that pass it. The recorder, when enabled, still gets every ticker.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = SYMBOLS,
+        track_all: bool = TRACK_ALL_SYMBOLS,
+        backend: str = WS_JSON_BACKEND,
+    ):
+        self.loads = get_loads(backend)
+        self.track_all = track_all
+        self.symbols = frozenset(symbols)
+
+    def decode(self, message) -> list:
+        return self.loads(message)
+
+    def ticks(self, tickers: list) -> List[Tuple[str, int, float, float]]:
+        """
+        (symbol, event_ms, close, 24h base volume) for the tracked symbols
+        in a decoded frame.
+        """
+        if self.track_all:
+            return [(t["s"], t["E"], float(t["c"]), float(t["v"])) for t in tickers]
+        wanted = self.symbols
+        return [(t["s"], t["E"], float(t["c"]), float(t["v"])) for t in tickers if t["s"] in wanted]
+
+
+_NAN = float("nan")
+
+
+class StreamDecoder:
+    """
+    Decodes combined-stream frames ({"stream": ..., "data": {...}}) from
+    per-symbol subscriptions. The server only sends subscribed symbols,
+    so there is nothing to filter.
+    """
+
+    def __init__(self, backend: str = WS_JSON_BACKEND):
+        self.loads = get_loads(backend)
+
+    def decode(self, message) -> dict:
+        return self.loads(message)
+
+    @staticmethod
+    def tick(msg: dict) -> Tuple[str, int, float, float, float] | None:
+        """
+        (symbol, event_ms, price, volume, qty) for a stream event, or None
+        for SUBSCRIBE / UNSUBSCRIBE replies and unknown events. volume is
+        the 24h base volume for miniTicker, NaN otherwise. qty is the
+        aggTrade quantity signed by taker side (+ buy, - sell; "m" means
+        the buyer was the maker, i.e. a taker sell), 0.0 otherwise.
+        """
+        data = msg.get("data")
+        if data is None:
+            return None
+
+        event = data.get("e")
+        if event == "aggTrade":
+            qty = float(data["q"])
+            return data["s"], data["E"], float(data["p"]), _NAN, -qty if data["m"] else qty
+        if event == "24hrMiniTicker":
+            return data["s"], data["E"], float(data["c"]), float(data["v"]), 0.0
+        if event == "bookTicker":
+            return data["s"], data["E"], (float(data["b"]) + float(data["a"])) / 2, _NAN, 0.0
+        return None
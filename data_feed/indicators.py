@@ -0,0 +1,253 @@
+import math
+from array import array
+
+from config import (
+    INDICATOR_EMA_SECONDS,
+    INDICATOR_SMA_SECONDS,
+    INDICATOR_WINDOW_BUCKETS,
+    VOLATILITY_WINDOW_SECONDS,
+    VOLUME_LONG_WINDOW_SECONDS,
+    VOLUME_SHORT_WINDOW_SECONDS,
+    VWAP_WINDOW_SECONDS,
+)
+
+
+def ema_step(prev: float | None, value: float, dt: float, period: float) -> float:
+    """
+    One time-weighted EMA update: alpha = 1 - exp(-dt / period), so the
+    result does not depend on how many ticks arrived in between.
+    """
+    if prev is None:
+        return value
+    if dt <= 0:
+        return prev
+    return prev + (1 - math.exp(-dt / period)) * (value - prev)
+
+
+class Ema:
+    __slots__ = ("period", "value", "_ts")
+
+    def __init__(self, period_seconds: float):
+        self.period = float(period_seconds)
+        self.value: float | None = None
+        self._ts: float | None = None
+
+    def update(self, ts: float, value: float):
+        dt = ts - self._ts if self._ts is not None else 0.0
+        self.value = ema_step(self.value, value, dt, self.period)
+        self._ts = ts
+
+
+class RollingWindow:
+    """
+    Time window of `seconds`, kept as a ring of fixed-width buckets with a
+    running sum and sum of squares.
+
+    add() accumulates into the current bucket (volumes), set() replaces it
+    (last price or return of the bucket). Moving into a new bucket clears
+    only the buckets that left the window, so updates are O(1) amortized
+    and nothing is ever re-summed. With carry=True skipped buckets repeat
+    the last value instead of zero (prices).
+    """
+
+    __slots__ = ("size", "bucket_seconds", "carry", "sum", "sumsq", "filled", "_buckets", "_index")
+
+    def __init__(self, seconds: float, buckets: int = INDICATOR_WINDOW_BUCKETS, carry: bool = False):
+        self.size = max(1, int(buckets))
+        self.bucket_seconds = float(seconds) / self.size
+        self.carry = carry
+
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.filled = 0  # buckets covered so far, up to size
+
+        self._buckets = array("d", bytes(8 * self.size))
+        self._index: int | None = None
+
+    def _advance(self, ts: float) -> int:
+        index = int(ts // self.bucket_seconds)
+        size = self.size
+
+        if self._index is None:
+            self._index = index
+            self.filled = 1
+            return index % size
+
+        steps = index - self._index
+        if steps > 0:
+            buckets = self._buckets
+            fill = buckets[self._index % size] if self.carry else 0.0
+
+            if steps >= size:
+                # Whole window expired: reset instead of subtracting
+                for i in range(size):
+                    buckets[i] = fill
+                self.sum = fill * size
+                self.sumsq = fill * fill * size
+            else:
+                for i in range(self._index + 1, index + 1):
+                    j = i % size
+                    old = buckets[j]
+                    buckets[j] = fill
+                    self.sum += fill - old
+                    self.sumsq += fill * fill - old * old
+
+            self._index = index
+            self.filled = min(size, self.filled + steps)
+
+        # Late ticks (steps < 0) count towards the current bucket
+        return self._index % size
+
+    def add(self, ts: float, value: float):
+        j = self._advance(ts)
+        old = self._buckets[j]
+        new = old + value
+        self._buckets[j] = new
+        self.sum += value
+        self.sumsq += new * new - old * old
+
+    def set(self, ts: float, value: float):
+        j = self._advance(ts)
+        old = self._buckets[j]
+        self._buckets[j] = value
+        self.sum += value - old
+        self.sumsq += value * value - old * old
+
+    @property
+    def seconds_covered(self) -> float:
+        return self.filled * self.bucket_seconds
+
+    def mean(self) -> float | None:
+        return self.sum / self.filled if self.filled else None
+
+    def stdev(self) -> float | None:
+        if self.filled < 2:
+            return None
+        mean = self.sum / self.filled
+        return math.sqrt(max(0.0, self.sumsq / self.filled - mean * mean))
+
+
+class SymbolIndicators:
+    """
+    Streaming indicators for one symbol, updated by market_state on every
+    tick in constant time.
+
+    qty is the traded quantity behind the tick and side the taker side
+    (+1 buy, -1 sell, 0 unknown). aggTrade ticks carry both; miniTicker
+    ticks carry volume without a side; bookTicker ticks carry neither, so
+    volume-based values stay at zero / None for them.
+    """
+
+    __slots__ = (
+        "price", "ema", "sma", "volume_short", "volume_long", "volatility",
+        "vwap_pv", "vwap_volume", "buy_volume", "sell_volume", "cvd",
+        "has_side", "_vol_index", "_vol_base",
+    )
+
+    def __init__(self):
+        self.price: float | None = None
+
+        self.ema = Ema(INDICATOR_EMA_SECONDS)
+        self.sma = RollingWindow(INDICATOR_SMA_SECONDS, carry=True)
+
+        self.volume_short = RollingWindow(VOLUME_SHORT_WINDOW_SECONDS)
+        self.volume_long = RollingWindow(VOLUME_LONG_WINDOW_SECONDS)
+
+        # Log return of each bucket vs the previous bucket's last price
+        self.volatility = RollingWindow(VOLATILITY_WINDOW_SECONDS)
+        self._vol_index: int | None = None
+        self._vol_base: float | None = None
+
+        self.vwap_pv = RollingWindow(VWAP_WINDOW_SECONDS)
+        self.vwap_volume = RollingWindow(VWAP_WINDOW_SECONDS)
+
+        self.buy_volume = RollingWindow(VOLUME_SHORT_WINDOW_SECONDS)
+        self.sell_volume = RollingWindow(VOLUME_SHORT_WINDOW_SECONDS)
+        self.cvd = 0.0  # cumulative taker buy - sell quantity since start
+        self.has_side = False
+
+    def update(self, ts: float, price: float, qty: float = 0.0, side: int = 0):
+        prev_price = self.price
+        self.price = price
+
+        self.ema.update(ts, price)
+        self.sma.set(ts, price)
+
+        vol = self.volatility
+        index = int(ts // vol.bucket_seconds)
+        if index != self._vol_index:
+            self._vol_index = index
+            self._vol_base = prev_price
+        if self._vol_base:
+            vol.set(ts, math.log(price / self._vol_base))
+
+        self.add_volume(ts, price, qty, side)
+
+    def add_volume(self, ts: float, price: float, qty: float, side: int = 0):
+        """
+        Volume-only part of update(): more quantity traded at `price`
+        without a new price observation.
+        """
+        self.volume_short.add(ts, qty)
+        self.volume_long.add(ts, qty)
+        self.vwap_pv.add(ts, price * qty)
+        self.vwap_volume.add(ts, qty)
+
+        if side:
+            self.has_side = True
+            if side > 0:
+                self.buy_volume.add(ts, qty)
+                self.cvd += qty
+            else:
+                self.sell_volume.add(ts, qty)
+                self.cvd -= qty
+
+    # ---------- DERIVED VALUES ----------
+
+    @property
+    def volume_1m(self) -> float:
+        """
+        Volume over the short window (60s by default).
+        """
+        return self.volume_short.sum
+
+    @property
+    def volume_10m_avg(self) -> float:
+        """
+        Long-window volume as an average per short window, so it compares
+        directly with volume_1m.
+        """
+        covered = self.volume_long.seconds_covered
+        if not covered:
+            return 0.0
+        return self.volume_long.sum * VOLUME_SHORT_WINDOW_SECONDS / covered
+
+    @property
+    def volume_ratio(self) -> float:
+        avg = self.volume_10m_avg
+        return self.volume_1m / avg if avg > 0 else 0.0
+
+    @property
+    def vwap(self) -> float | None:
+        volume = self.vwap_volume.sum
+        return self.vwap_pv.sum / volume if volume > 0 else None
+
+    @property
+    def ema_side(self) -> str:
+        if self.price is None or self.ema.value is None:
+            return "unknown"
+        return "above" if self.price >= self.ema.value else "below"
+
+    def snapshot(self) -> dict:
+        """
+        Values stored on a Signal row.
+        """
+        return {
+            "volume_1m": float(self.volume_1m),
+            "volume_10m_avg": float(self.volume_10m_avg),
+            "volume_ratio": float(self.volume_ratio),
+            "buy_vol": self.buy_volume.sum if self.has_side else None,
+            "sell_vol": self.sell_volume.sum if self.has_side else None,
+            "cvd_snapshot": self.cvd if self.has_side else None,
+            "ema_side": self.ema_side,
+        }
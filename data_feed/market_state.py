@@ -1,36 +1,170 @@
-from collections import deque
-from typing import Dict
+from typing import Callable, Dict, List, Tuple
 from datetime import datetime
 
-
-PRICE_HISTORY_SECONDS = 120
+from config import INDICATORS_ENABLED, PRICE_HISTORY_SECONDS
+from data_feed.indicators import SymbolIndicators
+from data_feed.price_history import PriceHistory
+from utils.clock import NS_PER_SECOND, get_clock, to_datetime
 
 
 class MarketSymbolState:
     def __init__(self):
         self.price: float | None = None
-        self.last_update: datetime | None = None
+        self.last_update_ns: int | None = None  # clock time, epoch ns
+
+        # (epoch ns, price) ticks, evicted by age
+        self.price_history = PriceHistory(PRICE_HISTORY_SECONDS)
+
+        # Streaming EMA / volume / volatility / VWAP / CVD
+        self.indicators = SymbolIndicators() if INDICATORS_ENABLED else None
 
-        self.price_history = deque(maxlen=PRICE_HISTORY_SECONDS)
+        # Last rolling 24h volume from miniTicker (see update_ticker)
+        self.volume_24h: float | None = None
+
+        # Exchange event time and LatencyTrace of the last live tick
+        self.event_ms: int | None = None
+        self.trace = None
+
+    @property
+    def last_update(self) -> datetime | None:
+        if self.last_update_ns is None:
+            return None
+        return to_datetime(self.last_update_ns)
 
 
 market_state: Dict[str, MarketSymbolState] = {}
 
+# Called synchronously with the symbol after every price update.
+# Listeners must be cheap (mark dirty / set an event), never block.
+_tick_listeners: List[Callable[[str], None]] = []
+
+
+def subscribe(listener: Callable[[str], None]):
+    if listener not in _tick_listeners:
+        _tick_listeners.append(listener)
+
+
+def unsubscribe(listener: Callable[[str], None]):
+    if listener in _tick_listeners:
+        _tick_listeners.remove(listener)
+
 
 def init_symbol(symbol: str):
     if symbol not in market_state:
         market_state[symbol] = MarketSymbolState()
 
 
-def update_price(symbol: str, price: float):
+def update_price(
+    symbol: str,
+    price: float,
+    qty: float = 0.0,
+    side: int = 0,
+    event_ms: int | None = None,
+    trace=None,
+):
+    """
+    qty: traded quantity behind the tick, side: taker side
+    (+1 buy, -1 sell, 0 unknown). Both only feed the indicators.
+    event_ms / trace: exchange event time and the frame's LatencyTrace
+    (utils/metrics.py), kept for the signals this tick may fire.
+
+    The tick is stamped with the active clock (utils/clock.py) in epoch
+    ns; event_ms also drives the exchange clock.
+    """
     init_symbol(symbol)
 
-    now = datetime.utcnow()
+    clock = get_clock()
+    if event_ms:
+        clock.observe(event_ms)
+    ns = clock.now_ns()
     state = market_state[symbol]
 
     state.price = price
-    state.last_update = now
-    state.price_history.append((now, price))
+    state.last_update_ns = ns
+    state.event_ms = event_ms
+    state.trace = trace
+    state.price_history.append(ns, price)
+    if state.indicators is not None:
+        state.indicators.update(ns / NS_PER_SECOND, price, qty, side)
+
+    for listener in _tick_listeners:
+        listener(symbol)
+
+
+def update_price_sides(
+    symbol: str,
+    price: float,
+    buy: float,
+    sell: float,
+    other: float,
+    event_ms: int | None = None,
+    trace=None,
+):
+    """
+    One price observation carrying taker buy / sell / unknown-side volume
+    at once (a conflated slot of the shared price table). Price, history
+    and listeners are updated once; each side's volume goes to the
+    indicators.
+    """
+    init_symbol(symbol)
+
+    clock = get_clock()
+    if event_ms:
+        clock.observe(event_ms)
+    ns = clock.now_ns()
+    state = market_state[symbol]
+
+    state.price = price
+    state.last_update_ns = ns
+    state.event_ms = event_ms
+    state.trace = trace
+    state.price_history.append(ns, price)
+    indicators = state.indicators
+    if indicators is not None:
+        ts = ns / NS_PER_SECOND
+        indicators.update(ts, price, other, 0)
+        if buy:
+            indicators.add_volume(ts, price, buy, 1)
+        if sell:
+            indicators.add_volume(ts, price, sell, -1)
+
+    for listener in _tick_listeners:
+        listener(symbol)
+
+
+def update_ticker(
+    symbol: str,
+    price: float,
+    volume_24h: float,
+    event_ms: int | None = None,
+    trace=None,
+):
+    """
+    Price update from a miniTicker, whose volume is a rolling 24h total.
+    The increase since the previous ticker is used as this tick's volume
+    (side unknown); it undercounts slightly as old trades leave the 24h
+    window, which is fine for relative measures like volume_ratio.
+    """
+    init_symbol(symbol)
+    state = market_state[symbol]
+
+    prev = state.volume_24h
+    state.volume_24h = volume_24h
+    qty = volume_24h - prev if prev is not None and volume_24h > prev else 0.0
+
+    update_price(symbol, price, qty, 0, event_ms, trace)
+
+
+def backfill_prices(symbol: str, ticks: List[Tuple[int, float]]) -> int:
+    """
+    Insert historical (epoch ns, price) ticks into the symbol's price
+    history. The live price is left alone and listeners are not called,
+    so backfilled data feeds lookbacks but never fires signals or exits.
+    """
+    init_symbol(symbol)
+    return market_state[symbol].price_history.backfill(
+        [ts for ts, _ in ticks], [px for _, px in ticks]
+    )
 
 
 def get_latest_price(symbol: str) -> float | None:
@@ -38,4 +172,3 @@ def get_latest_price(symbol: str) -> float | None:
     if not state:
         return None
     return state.price
-
@@ -0,0 +1,185 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Sequence
+
+from utils.clock import NS_PER_SECOND
+
+
+# Compact the backing arrays once this many evicted slots pile up at the front
+_COMPACT_MIN = 4096
+
+# Entries per min/max bucket (see PriceHistory.min_max)
+_BUCKET = 64
+
+
+class PriceHistory:
+    """
+    Time-indexed price history for a single symbol.
+
+    Timestamps (int epoch nanoseconds, array('q')) and prices
+    (array('d')) are stored in two parallel buffers instead of a deque of
+    (datetime, price) tuples.
+    Entries are evicted by age (window_seconds), not by count, so a faster
+    tick rate never shortens the real lookback window.
+
+    Lookups are binary searches over the timestamp buffer, so their cost
+    is O(log n) regardless of how much history is kept.
+
+    min_max() reads a sparse table over the min / max of every full
+    bucket of _BUCKET entries (buckets are aligned to buffer indexes, so
+    eviction leaves them valid): two table reads plus at most two
+    partial buckets, however long the range. A bucket is added each time
+    one fills up; compaction drops whole buckets, and a backfill (which
+    shifts indexes) rebuilds the table.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = float(window_seconds)
+        self.window_ns = int(window_seconds * NS_PER_SECOND)
+
+        self._ts = array("q")
+        self._px = array("d")
+        self._head = 0  # index of the oldest live entry
+
+        # Level j, entry b: min / max over buckets [b, b + 2^j)
+        self._mins: list[array] = []
+        self._maxs: list[array] = []
+
+    def __len__(self) -> int:
+        return len(self._ts) - self._head
+
+    def append(self, ts: int, price: float):
+        """
+        Append a tick. Timestamps are expected to be non-decreasing; a tick
+        that arrives slightly out of order is clamped to the last timestamp
+        so the buffer stays sorted.
+        """
+        if len(self._ts) > self._head and ts < self._ts[-1]:
+            ts = self._ts[-1]
+
+        self._ts.append(ts)
+        self._px.append(price)
+        if not len(self._ts) % _BUCKET:
+            self._add_bucket(len(self._ts) // _BUCKET - 1)
+        self._evict(ts - self.window_ns)
+
+    def backfill(self, ts: Sequence[int], px: Sequence[float]) -> int:
+        """
+        Insert a sorted batch of older ticks (e.g. a REST backfill of a
+        feed gap) between the live ticks around it. Batch entries that
+        are not strictly between those two ticks are dropped so the
+        buffer stays sorted. Returns the rows inserted.
+        """
+        if not ts:
+            return 0
+
+        i = bisect_right(self._ts, ts[-1], self._head)
+        lo, hi = 0, len(ts)
+        if i > self._head:
+            lo = bisect_right(ts, self._ts[i - 1])
+        if i < len(self._ts):
+            hi = bisect_left(ts, self._ts[i])
+        if lo >= hi:
+            return 0
+
+        self._ts[i:i] = array("q", ts[lo:hi])
+        self._px[i:i] = array("d", px[lo:hi])
+        self._rebuild_buckets()
+        if i + hi - lo == len(self._ts):
+            self._evict(self._ts[-1] - self.window_ns)
+        return hi - lo
+
+    def _evict(self, cutoff: int):
+        # Keep the newest entry at-or-before cutoff as an anchor, so a
+        # lookback of exactly window_seconds still finds a price.
+        ts = self._ts
+        head = self._head
+        last = len(ts) - 1
+        while head < last and ts[head + 1] <= cutoff:
+            head += 1
+        self._head = head
+
+        if head >= _COMPACT_MIN and head * 2 >= len(ts):
+            # Drop whole buckets only, so the min / max table just loses
+            # its front entries
+            buckets = head // _BUCKET
+            dropped = buckets * _BUCKET
+            del self._ts[:dropped]
+            del self._px[:dropped]
+            self._head = head - dropped
+            for level in self._mins + self._maxs:
+                del level[:buckets]
+
+    # ---------- MIN / MAX BUCKETS ----------
+
+    def _add_bucket(self, b: int):
+        mins, maxs = self._mins, self._maxs
+        if not mins:
+            mins.append(array("d"))
+            maxs.append(array("d"))
+        start = b * _BUCKET
+        window = self._px[start:start + _BUCKET]
+        mins[0].append(min(window))
+        maxs[0].append(max(window))
+
+        # Bucket b completes entry b - 2^j + 1 of every level j with 2^j <= b + 1
+        j = 1
+        while 1 << j <= b + 1:
+            if len(mins) == j:
+                mins.append(array("d"))
+                maxs.append(array("d"))
+            i = b - (1 << j) + 1
+            k = i + (1 << (j - 1))
+            mins[j].append(min(mins[j - 1][i], mins[j - 1][k]))
+            maxs[j].append(max(maxs[j - 1][i], maxs[j - 1][k]))
+            j += 1
+
+    def _rebuild_buckets(self):
+        self._mins = []
+        self._maxs = []
+        for b in range(len(self._ts) // _BUCKET):
+            self._add_bucket(b)
+
+    def last(self) -> tuple[int, float] | None:
+        if len(self._ts) == self._head:
+            return None
+        return self._ts[-1], self._px[-1]
+
+    def price_at_or_before(self, target_ts: int) -> float | None:
+        """
+        Last price with timestamp <= target_ts, or None if history does not
+        reach back that far.
+        """
+        i = bisect_right(self._ts, target_ts, self._head) - 1
+        if i < self._head:
+            return None
+        return self._px[i]
+
+    def min_max(self, start_ts: int, end_ts: int) -> tuple[float, float] | None:
+        """
+        (min, max) price over ticks with start_ts <= ts <= end_ts.
+        Returns None if there are no ticks in the range.
+        """
+        lo = bisect_left(self._ts, start_ts, self._head)
+        hi = bisect_right(self._ts, end_ts, lo)
+        if lo >= hi:
+            return None
+
+        # Full buckets b0 .. b1 - 1 lie inside [lo, hi)
+        b0 = -(-lo // _BUCKET)
+        b1 = hi // _BUCKET
+        if b0 >= b1:
+            window = self._px[lo:hi]  # at most two buckets
+            return min(window), max(window)
+
+        j = (b1 - b0).bit_length() - 1
+        k = b1 - (1 << j)
+        low = min(self._mins[j][b0], self._mins[j][k])
+        high = max(self._maxs[j][b0], self._maxs[j][k])
+        if lo < b0 * _BUCKET:
+            window = self._px[lo:b0 * _BUCKET]
+            low, high = min(low, min(window)), max(high, max(window))
+        if b1 * _BUCKET < hi:
+            window = self._px[b1 * _BUCKET:hi]
+            low, high = min(low, min(window)), max(high, max(window))
+        return low, high
@@ -0,0 +1,280 @@
+import asyncio
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List
+
+import numpy as np
+
+from data_feed.market_state import update_price_sides
+from utils.metrics import LatencyTrace, metrics
+
+
+# ---------- LAYOUT ----------
+#
+# header:  8 int64 words (magic, capacity, symbols in use, version)
+# names:   capacity x NAME_BYTES, ASCII, NUL padded
+# slots:   capacity x SLOT_WORDS 8-byte words (one 64-byte cache line):
+#          seq, price, event_ms, recv_ns, volume, buy_volume, sell_volume, -
+#
+# volume / buy_volume / sell_volume are running totals of traded
+# quantity (all ticks / taker buys / taker sells), so a reader that
+# skips updates still sees every unit of volume.
+
+MAGIC = 0x5052494345544231  # "PRICETB1"
+HEADER_WORDS = 8
+H_MAGIC, H_CAPACITY, H_SIZE, H_VERSION = 0, 1, 2, 3
+
+NAME_BYTES = 32
+SLOT_WORDS = 8
+SEQ, PRICE, EVENT_MS, RECV_NS, VOLUME, BUY_VOLUME, SELL_VOLUME = range(7)
+
+CONFLATED = metrics.counter(
+    "shared_table_conflated_total", "Symbol updates overwritten before this process read them",
+)
+
+
+class SharedPriceTable:
+    """
+    Latest price, exchange event time, receive time, running volumes and
+    sequence number per symbol in a multiprocessing.shared_memory block.
+
+    One process writes (SharedPriceWriter, in the feed process); any
+    number read (SharedPriceReader) without locks. Each slot is a
+    seqlock: the writer makes its seq odd, writes the fields, then makes
+    it even again, so a reader that sees the same even seq before and
+    after copying a slot has a consistent snapshot; seq // 2 is the
+    symbol's update count. Symbols get slots in order of first update
+    and their names are stored in the block, so readers only need its
+    name to attach.
+
+    Plain stores / loads from Python rely on the CPU not reordering
+    them (true on x86-64; ARM could in theory show a torn slot as
+    consistent).
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+
+        words = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        if words[H_MAGIC] != MAGIC:
+            raise ValueError(f"{shm.name} is not a shared price table")
+        self.capacity = int(words[H_CAPACITY])
+
+        names_offset = HEADER_WORDS * 8
+        slots_offset = names_offset + self.capacity * NAME_BYTES
+        self.header = words
+        self.names = np.ndarray((self.capacity, NAME_BYTES), dtype=np.uint8, buffer=shm.buf, offset=names_offset)
+        self.ints = np.ndarray((self.capacity, SLOT_WORDS), dtype=np.int64, buffer=shm.buf, offset=slots_offset)
+        self.floats = np.ndarray((self.capacity, SLOT_WORDS), dtype=np.float64, buffer=shm.buf, offset=slots_offset)
+        self.slots_word_offset = slots_offset // 8
+
+    @classmethod
+    def create(cls, capacity: int) -> "SharedPriceTable":
+        size = HEADER_WORDS * 8 + capacity * (NAME_BYTES + SLOT_WORDS * 8)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shm.buf[:size] = bytes(size)
+        header = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        header[H_CAPACITY] = capacity
+        header[H_MAGIC] = MAGIC
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedPriceTable":
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def size(self) -> int:
+        return int(self.header[H_SIZE])
+
+    def symbol_names(self, start: int = 0) -> List[str]:
+        return [
+            bytes(self.names[i]).rstrip(b"\0").decode("ascii")
+            for i in range(start, self.size)
+        ]
+
+    def close(self):
+        # numpy views pin the buffer; drop them before closing
+        self.header = self.names = self.ints = self.floats = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedPriceWriter:
+    """
+    Feed-side sink with the same update_price / update_ticker signatures
+    as data_feed.market_state, so the feeds can write the table instead
+    (create_feed(sink=...)). Single writer only.
+    """
+
+    def __init__(self, table: SharedPriceTable):
+        self.table = table
+        self._slots: Dict[str, int] = {}
+        self._volume_24h: Dict[str, float] = {}
+        self._full_warned = False
+
+        # memoryview casts: much cheaper per item than numpy scalars
+        self._q = table.shm.buf.cast("q")
+        self._d = table.shm.buf.cast("d")
+
+    def _slot(self, symbol: str) -> int | None:
+        table = self.table
+        index = table.size
+        if index >= table.capacity:
+            if not self._full_warned:
+                print(f"Shared price table full ({table.capacity} symbols); {symbol} and later symbols dropped")
+                self._full_warned = True
+            return None
+
+        name = symbol.encode("ascii")[:NAME_BYTES]
+        table.names[index, :len(name)] = np.frombuffer(name, dtype=np.uint8)
+        table.header[H_SIZE] = index + 1  # after the name, so readers never see it half-written
+        base = self._slots[symbol] = table.slots_word_offset + index * SLOT_WORDS
+        return base
+
+    def update_price(
+        self,
+        symbol: str,
+        price: float,
+        qty: float = 0.0,
+        side: int = 0,
+        event_ms: int | None = None,
+        trace=None,
+    ):
+        base = self._slots.get(symbol)
+        if base is None:
+            base = self._slot(symbol)
+            if base is None:
+                return
+
+        q, d = self._q, self._d
+        q[base] += 1  # odd: write in progress
+        d[base + PRICE] = price
+        q[base + EVENT_MS] = event_ms or 0
+        q[base + RECV_NS] = trace.recv_ns if trace is not None else time.time_ns()
+        if qty:
+            d[base + VOLUME] += qty
+            if side > 0:
+                d[base + BUY_VOLUME] += qty
+            elif side < 0:
+                d[base + SELL_VOLUME] += qty
+        q[base] += 1  # even: consistent
+        q[H_VERSION] += 1
+
+    def update_ticker(
+        self,
+        symbol: str,
+        price: float,
+        volume_24h: float,
+        event_ms: int | None = None,
+        trace=None,
+    ):
+        # Same 24h-volume delta rule as market_state.update_ticker
+        prev = self._volume_24h.get(symbol)
+        self._volume_24h[symbol] = volume_24h
+        qty = volume_24h - prev if prev is not None and volume_24h > prev else 0.0
+        self.update_price(symbol, price, qty, 0, event_ms, trace)
+
+    def close(self):
+        self._q.release()
+        self._d.release()
+
+
+class SharedPriceReader:
+    """
+    Copies table updates into this process's market_state, so the
+    signal engine, trade creator and simulator run unchanged.
+
+    poll() snapshots all slots with a few numpy copies and applies the
+    slots whose seq moved (and was stable across the copy) through
+    market_state.update_price_sides, which also wakes the tick listeners.
+    A symbol that updated several times between polls is applied once,
+    with its latest price and the volume traded in between split by
+    taker side (so CVD stays right), and wakes the listeners once; torn
+    slots are retried on the next poll.
+
+    Ticks carry a LatencyTrace from the feed's receive time, so
+    pipeline_latency_seconds{stage="updated"} here includes the hop
+    through the table.
+    """
+
+    def __init__(self, table: SharedPriceTable, symbols=None):
+        self.table = table
+        self.symbols = set(symbols) if symbols is not None else None
+
+        self._names: List[str] = []
+        self._seen = np.zeros(table.capacity, dtype=np.int64)
+        self._volumes = np.zeros((table.capacity, 3), dtype=np.float64)
+        self._version = -1
+        self.applied = 0
+
+    def poll(self) -> int:
+        table = self.table
+        version = int(table.header[H_VERSION])
+        if version == self._version:
+            return 0
+
+        n = table.size
+        if n > len(self._names):
+            self._names.extend(table.symbol_names(len(self._names)))
+
+        ints, floats = table.ints, table.floats
+        seq_before = ints[:n, SEQ].copy()
+        int_rows = ints[:n].copy()
+        float_rows = floats[:n].copy()
+        seq_after = ints[:n, SEQ]
+
+        stable = (seq_before == seq_after) & (seq_before & 1 == 0)
+        changed = np.flatnonzero(stable & (seq_before != self._seen[:n]))
+        if stable.all():
+            self._version = version
+
+        volumes = float_rows[:, VOLUME:SELL_VOLUME + 1]
+        deltas = volumes - self._volumes[:n]
+        names = self._names
+        wanted = self.symbols
+        conflated = 0
+
+        for i in changed.tolist():
+            first = not self._seen[i]
+            if not first:
+                conflated += int(seq_before[i] - self._seen[i]) // 2 - 1
+            self._seen[i] = seq_before[i]
+            self._volumes[i] = volumes[i]
+
+            symbol = names[i]
+            if wanted is not None and symbol not in wanted:
+                continue
+            price = float(float_rows[i, PRICE])
+            event_ms = int(int_rows[i, EVENT_MS]) or None
+            trace = LatencyTrace(int(int_rows[i, RECV_NS]))
+            trace.mark("updated")
+            # Volume traded before this process attached is not a tick's volume
+            if first:
+                update_price_sides(symbol, price, 0.0, 0.0, 0.0, event_ms, trace)
+                continue
+            qty, buy, sell = deltas[i].tolist()
+            other = qty - buy - sell
+            update_price_sides(
+                symbol, price,
+                buy if buy > 1e-12 else 0.0,
+                sell if sell > 1e-12 else 0.0,
+                other if other > 1e-12 else 0.0,
+                event_ms, trace,
+            )
+
+        if conflated:
+            CONFLATED.inc(conflated)
+        self.applied += len(changed)
+        return len(changed)
+
+    async def run_forever(self, interval: float):
+        while True:
+            self.poll()
+            await asyncio.sleep(interval)
@@ -0,0 +1,288 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from config import TICK_RECORDER_DIR, TICK_RECORDER_FLUSH_SECONDS
+
+
+# Fixed-width columns, one file per column per UTC day:
+#   {TICK_RECORDER_DIR}/{YYYYMMDD}/{column}.bin + meta.json
+COLUMNS = {
+    "event_ms": ("q", np.int64),    # exchange event time (E), ms
+    "recv_ns": ("q", np.int64),     # local receive time, ns
+    "symbol_id": ("H", np.uint16),  # index into meta["symbols"]
+    "close": ("d", np.float64),
+    "volume": ("d", np.float64),    # miniTicker 24h base volume (NaN for aggTrade / bookTicker)
+}
+
+_INITIAL_ROWS = 1 << 20
+_BUFFER_ROWS = 8192
+
+
+def _day_key(event_ms: int) -> str:
+    return datetime.fromtimestamp(event_ms / 1000, tz=timezone.utc).strftime("%Y%m%d")
+
+
+class _DayFile:
+    """
+    Append-only, memory-mapped column files for one UTC day.
+    Capacity grows by doubling; the live row count is kept in meta.json.
+
+    write() runs on the event loop and sync() in a worker thread. The
+    lock keeps a sync (msync + meta.json) from overlapping a remap or
+    another sync; plain writes do not take it, since a sync only flushes
+    the maps it grabbed and publishes the row count it saw first.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        meta = self._read_meta()
+        self.rows: int = meta.get("rows", 0)
+        self.symbols: List[str] = meta.get("symbols", [])
+        self.symbol_ids: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+
+        self.capacity = max(_INITIAL_ROWS, self.rows)
+        self._lock = threading.Lock()
+        self._maps: Dict[str, np.memmap] = {}
+        self._map_all()
+
+    def _read_meta(self) -> dict:
+        meta_path = self.path / "meta.json"
+        if not meta_path.exists():
+            return {}
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+
+    def _map_all(self):
+        for name, (_, dtype) in COLUMNS.items():
+            file = self.path / f"{name}.bin"
+            size = self.capacity * np.dtype(dtype).itemsize
+            with open(file, "ab") as f:
+                if f.tell() < size:
+                    f.truncate(size)
+            self._maps[name] = np.memmap(file, dtype=dtype, mode="r+", shape=(self.capacity,))
+
+    def symbol_id(self, symbol: str) -> int:
+        sid = self.symbol_ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self.symbols.append(symbol)
+            self.symbol_ids[symbol] = sid
+        return sid
+
+    def write(self, buffers: Dict[str, array]):
+        n = len(buffers["event_ms"])
+        if not n:
+            return
+
+        if self.rows + n > self.capacity:
+            with self._lock:
+                self._flush_maps()
+                self._maps.clear()
+                while self.rows + n > self.capacity:
+                    self.capacity *= 2
+                self._map_all()
+
+        start, end = self.rows, self.rows + n
+        for name, (_, dtype) in COLUMNS.items():
+            self._maps[name][start:end] = np.frombuffer(buffers[name], dtype=dtype)
+        self.rows = end
+
+    def _flush_maps(self):
+        for m in list(self._maps.values()):
+            m.flush()
+
+    def sync(self):
+        """
+        Flush mapped pages and publish the row count. Safe to run in a
+        worker thread while the loop keeps writing: rows written after
+        the count was taken are published by the next sync.
+        """
+        with self._lock:
+            rows = self.rows
+            symbols = list(self.symbols)
+            self._flush_maps()
+            meta_path = self.path / "meta.json"
+            tmp = meta_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"rows": rows, "symbols": symbols}), encoding="utf-8")
+            os.replace(tmp, meta_path)
+
+    def close(self):
+        self.sync()
+        with self._lock:
+            self._maps.clear()
+
+
+class TickRecorder:
+    """
+    Records every miniTicker update to compact columnar day files.
+
+    append() only pushes onto in-memory array buffers; rows are copied into
+    the memory-mapped files in blocks (every _BUFFER_ROWS rows or
+    TICK_RECORDER_FLUSH_SECONDS), so recording the full !miniTicker@arr
+    firehose costs a few array appends per ticker.
+    """
+
+    def __init__(self, root: str = TICK_RECORDER_DIR):
+        self.root = Path(root)
+        self._day_name: str | None = None
+        self._day: _DayFile | None = None
+        self._next_day_ms = 0
+        self._buffers = self._new_buffers()
+
+    @staticmethod
+    def _new_buffers() -> Dict[str, array]:
+        return {name: array(code) for name, (code, _) in COLUMNS.items()}
+
+    def append(self, event_ms: int, symbol: str, close: float, volume: float, recv_ns: int | None = None):
+        if event_ms >= self._next_day_ms or self._day is None:
+            day_key = _day_key(event_ms)
+            if day_key != self._day_name:
+                self._rotate(day_key)
+
+        b = self._buffers
+        b["event_ms"].append(event_ms)
+        b["recv_ns"].append(recv_ns if recv_ns is not None else time.time_ns())
+        b["symbol_id"].append(self._day.symbol_id(symbol))
+        b["close"].append(close)
+        b["volume"].append(volume)
+
+        if len(b["event_ms"]) >= _BUFFER_ROWS:
+            self.flush()
+
+    def _rotate(self, day_key: str):
+        if self._day is not None:
+            self.flush()
+            self._day.close()
+
+        self._day_name = day_key
+        self._day = _DayFile(self.root / day_key)
+
+        day_start = datetime.strptime(day_key, "%Y%m%d").replace(tzinfo=timezone.utc)
+        self._next_day_ms = int(day_start.timestamp() * 1000) + 86_400_000
+
+    def flush(self):
+        if self._day is None:
+            return
+        self._day.write(self._buffers)
+        self._buffers = self._new_buffers()
+
+    def close(self):
+        if self._day is not None:
+            self.flush()
+            self._day.close()
+            self._day = None
+            self._day_name = None
+
+    async def run_forever(self):
+        print(f"Tick recorder started ({self.root}).")
+        try:
+            while True:
+                await asyncio.sleep(TICK_RECORDER_FLUSH_SECONDS)
+                self.flush()
+                if self._day is not None:
+                    # msync + meta.json would stall the loop; the day file
+                    # keeps taking writes meanwhile
+                    await asyncio.to_thread(self._day.sync)
+        finally:
+            self.close()
+
+
+class TickReader:
+    """
+    Read API over recorded day files.
+
+    Column arrays are read-only memmaps; a time range on a single day is a
+    zero-copy slice. Selecting symbols (or spanning several days) has to
+    gather rows and returns copies.
+    """
+
+    def __init__(self, root: str = TICK_RECORDER_DIR):
+        self.root = Path(root)
+
+    def days(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / "meta.json").exists())
+
+    def load_day(self, day_key: str) -> dict:
+        """
+        Returns {"symbols": [...], column: read-only array[:rows], ...}.
+        """
+        path = self.root / day_key
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        rows = meta["rows"]
+
+        day = {"symbols": meta["symbols"]}
+        for name, (_, dtype) in COLUMNS.items():
+            if rows:
+                day[name] = np.memmap(path / f"{name}.bin", dtype=dtype, mode="r", shape=(rows,))
+            else:
+                day[name] = np.empty(0, dtype=dtype)
+        return day
+
+    def read(self, start_ms: int, end_ms: int, symbols: Iterable[str] | None = None) -> dict:
+        """
+        Ticks with start_ms <= event_ms < end_ms, optionally limited to
+        `symbols`. Returns columns plus "symbols" (names for symbol_id).
+        Symbol ids are remapped onto one shared list when several days
+        are read.
+        """
+        wanted = set(symbols) if symbols is not None else None
+        first, last = _day_key(start_ms), _day_key(max(start_ms, end_ms - 1))
+
+        parts = []
+        names: List[str] = []
+        name_ids: Dict[str, int] = {}
+
+        for day_key in self.days():
+            if day_key < first or day_key > last:
+                continue
+            day = self.load_day(day_key)
+            ts = day["event_ms"]
+
+            # Event times are non-decreasing in practice; fall back to a
+            # mask if the exchange ever reorders them.
+            if ts.size < 2 or bool(np.all(ts[1:] >= ts[:-1])):
+                lo, hi = np.searchsorted(ts, [start_ms, end_ms], side="left")
+                sel = slice(lo, hi)
+            else:
+                sel = np.flatnonzero((ts >= start_ms) & (ts < end_ms))
+
+            cols = {name: day[name][sel] for name in COLUMNS}
+
+            if wanted is not None:
+                ids = [i for i, s in enumerate(day["symbols"]) if s in wanted]
+                keep = np.isin(cols["symbol_id"], ids)
+                cols = {name: col[keep] for name, col in cols.items()}
+
+            # Remap day-local symbol ids onto the combined list
+            remap = np.empty(max(len(day["symbols"]), 1), dtype=np.uint16)
+            for i, s in enumerate(day["symbols"]):
+                if s not in name_ids:
+                    name_ids[s] = len(names)
+                    names.append(s)
+                remap[i] = name_ids[s]
+            if not np.array_equal(remap[: len(day["symbols"])], np.arange(len(day["symbols"]))):
+                cols["symbol_id"] = remap[cols["symbol_id"]]
+
+            parts.append(cols)
+
+        if len(parts) == 1:
+            result = parts[0]
+        elif parts:
+            result = {name: np.concatenate([p[name] for p in parts]) for name in COLUMNS}
+        else:
+            result = {name: np.empty(0, dtype=dtype) for name, (_, dtype) in COLUMNS.items()}
+
+        result["symbols"] = names
+        return result
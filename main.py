@@ -1,27 +1,122 @@
 from utils.env import load_dotenv
 load_dotenv()
 import asyncio
-from storage.db import init_db
-from data_feed.binance_ws import start_ws
+from config import (
+    CLOCK,
+    LOOP_MONITOR_ENABLED,
+    LOOP_MONITOR_INTERVAL_SECONDS,
+    LOOP_STALL_THRESHOLD_SECONDS,
+    LOOP_STATS_INTERVAL_SECONDS,
+    METRICS_ENABLED,
+    METRICS_HOST,
+    METRICS_PORT,
+    MULTIPROCESS_ENABLED,
+    PROFILE_DIR,
+    PROFILE_SAMPLE_INTERVAL_MS,
+    PROFILE_SECONDS,
+    SIGNAL_ENGINE_MODE,
+    TELEGRAM_SUMMARY_INTERVAL_MINUTES,
+    TICK_RECORDER_ENABLED,
+)
+from analytics.summary import trade_summaries
+from storage.async_queries import init_db
+from storage.worker import db_worker
+from data_feed.binance_ws import create_feed, start_ws
+from notifier.telegram import telegram_notifier
 from signals.signal_engine import SignalEngine
+from signals.strategies import registry
 from trades.trade_simulator import trade_simulator_loop
 from trades.signal_consumer import SignalConsumer
+from trades.trade_book import trade_book
+from utils.clock import create_clock, set_clock
+from utils.profiling import LoopMonitor, SamplingProfiler, install_profile_signal
+
+
+def _profile_route(profiler: SamplingProfiler):
+    def start(query: dict) -> str:
+        seconds = float(query.get("seconds", PROFILE_SECONDS))
+        if not 0 < seconds <= 600:
+            raise ValueError("seconds must be in (0, 600]")
+        return f"{profiler.start(seconds)}\n"
+    return start
 
 
 async def main():
+    set_clock(create_clock(CLOCK))
+
+    loop_monitor = None
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor = LoopMonitor(
+            LOOP_MONITOR_INTERVAL_SECONDS, LOOP_STALL_THRESHOLD_SECONDS, LOOP_STATS_INTERVAL_SECONDS,
+        )
+        loop_monitor.start()
+
+    profiler = SamplingProfiler(PROFILE_DIR, PROFILE_SAMPLE_INTERVAL_MS / 1000)
+    if install_profile_signal(profiler, PROFILE_SECONDS):
+        print(f"Send SIGUSR1 to profile for {PROFILE_SECONDS}s (output in {PROFILE_DIR}/)")
+
     print("Initializing database...")
-    init_db()
+    await init_db()
     print("Database initialized.")
 
-    engine = SignalEngine()
+    registry.load()
+    await trade_book.load()
+    await trade_summaries.load()
+
     consumer = SignalConsumer()
 
-    await asyncio.gather(
-        start_ws(),
-        engine.run_forever(),
+    processes = None
+    if MULTIPROCESS_ENABLED:
+        from processes import ProcessGroup
+        # Feed and signal engine run in child processes (processes.py)
+        processes = ProcessGroup(signal_sink=consumer.submit)
+        engine = None
+    elif SIGNAL_ENGINE_MODE == "vector":
+        from signals.vector_engine import VectorSignalEngine
+        # Single-rule array engine: runs the default strategy's params only
+        engine = VectorSignalEngine(
+            signal_sink=consumer.submit, params=registry.params(None)
+        )
+    else:
+        engine = SignalEngine(signal_sink=consumer.submit, strategies=registry.all())
+
+    tasks = [
         consumer.run_forever(),
         trade_simulator_loop(),
-    )
+        telegram_notifier.run_forever(),
+    ]
+    if engine is not None:
+        tasks.append(engine.run_forever())
+    if TELEGRAM_SUMMARY_INTERVAL_MINUTES > 0:
+        tasks.append(trade_summaries.run_telegram_summaries(TELEGRAM_SUMMARY_INTERVAL_MINUTES))
+    if METRICS_ENABLED:
+        from utils.metrics import MetricsServer
+        tasks.append(MetricsServer(
+            METRICS_HOST, METRICS_PORT, routes={"/profile": _profile_route(profiler)},
+        ).run_forever())
+
+    if processes is not None:
+        processes.start()
+        tasks.extend(processes.tasks())
+    else:
+        recorder = None
+        if TICK_RECORDER_ENABLED:
+            from data_feed.tick_recorder import TickRecorder
+            recorder = TickRecorder()
+            tasks.append(recorder.run_forever())
+
+        feed = create_feed(recorder)
+        tasks.append(start_ws(recorder, feed))
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        if processes is not None:
+            processes.stop()
+        # Flush the write-behind buffer before exiting
+        db_worker.stop()
+        if loop_monitor is not None:
+            loop_monitor.stop()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,27 @@
 import os
 import json
+import time
 import asyncio
+import http.client
 import urllib.parse
-import urllib.request
+from collections import deque
+from typing import List
+
+from config import (
+    TELEGRAM_MAX_PER_MINUTE,
+    TELEGRAM_MIN_INTERVAL_SECONDS,
+    TELEGRAM_QUEUE_MAXSIZE,
+)
+from utils.metrics import metrics
+
+
+TELEGRAM_API_HOST = "api.telegram.org"
+
+# Telegram rejects messages longer than this
+MAX_MESSAGE_CHARS = 4096
+
+SEND_SECONDS = metrics.histogram("telegram_send_seconds", "Telegram sendMessage request duration")
+DROPPED = metrics.counter("telegram_dropped_total", "Notifications dropped because the queue was full")
 
 
 def _env_bool(name: str, default: bool = False) -> bool:
@@ -12,52 +31,203 @@ def _env_bool(name: str, default: bool = False) -> bool:
     return v.strip().lower() in ("1", "true", "yes", "on")
 
 
-def _send_telegram_sync(text: str) -> None:
+def _telegram_enabled() -> bool:
     """
-    Synchronous send via Telegram Bot API.
     Reads env vars at runtime so it works after load_dotenv() in main.py.
+    TELEGRAM_NOTIFY_SIGNALS is applied where signals are published, so
+    it does not silence other notifications (e.g. summaries).
     """
-    enabled = _env_bool("TELEGRAM_ENABLED", False)
-    notify_signals = _env_bool("TELEGRAM_NOTIFY_SIGNALS", True)
+    return _env_bool("TELEGRAM_ENABLED", False)
 
-    if not enabled or not notify_signals:
-        return
 
-    token = os.getenv("TELEGRAM_BOT_TOKEN")
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
+class TelegramNotifier:
+    """
+    Background Telegram sender.
 
-    if not token or not chat_id:
-        raise RuntimeError(
-            "Telegram env not set. Need TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID in .env"
-        )
+    notify() only puts the text on a bounded queue and returns, so the
+    signal path never waits on Telegram. run_forever() drains the queue:
 
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
-    payload = {"chat_id": chat_id, "text": text}
+    - one keep-alive HTTPS connection, reused for every message and
+      only re-opened after an error (requests run in a worker thread);
+    - per-chat rate limits: at least TELEGRAM_MIN_INTERVAL_SECONDS between
+      messages and at most TELEGRAM_MAX_PER_MINUTE per minute, plus the
+      retry_after Telegram sends with HTTP 429;
+    - everything queued while waiting for a send slot is merged into one
+      message;
+    - when the queue is full new notifications are dropped and counted,
+      and the next message carries a one-line summary of what was dropped.
+    """
 
-    data = urllib.parse.urlencode(payload).encode("utf-8")
+    def __init__(
+        self,
+        maxsize: int = TELEGRAM_QUEUE_MAXSIZE,
+        min_interval: float = TELEGRAM_MIN_INTERVAL_SECONDS,
+        max_per_minute: int = TELEGRAM_MAX_PER_MINUTE,
+        host: str = TELEGRAM_API_HOST,
+    ):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.min_interval = min_interval
+        self.max_per_minute = max_per_minute
+        self.host = host
 
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-        method="POST",
-    )
+        self._conn: http.client.HTTPSConnection | None = None
+        self._sent_at: deque = deque()  # monotonic times of recent sends
+
+        self.dropped = 0  # since the last summary
+        self.sent = 0
+        self.merged = 0
+        self.failed = 0
+
+    # ---------- PRODUCER SIDE ----------
+
+    def notify(self, text: str, trace=None):
+        """
+        Queue a notification. Never blocks; drops when the queue is full.
+        trace: LatencyTrace to mark "notified" once the text is delivered.
+        """
+        if not _telegram_enabled():
+            return
+        try:
+            self.queue.put_nowait((text, trace))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            DROPPED.inc()
+
+    # ---------- HTTP ----------
+
+    def _post_sync(self, text: str) -> float | None:
+        """
+        sendMessage over the persistent connection.
+        Returns retry_after seconds on HTTP 429, else None.
+        """
+        token = os.getenv("TELEGRAM_BOT_TOKEN")
+        chat_id = os.getenv("TELEGRAM_CHAT_ID")
+
+        if not token or not chat_id:
+            raise RuntimeError(
+                "Telegram env not set. Need TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID in .env"
+            )
+
+        data = urllib.parse.urlencode({"chat_id": chat_id, "text": text}).encode("utf-8")
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+        # One retry on a fresh connection if the kept-alive one went stale
+        for attempt in (1, 2):
+            if self._conn is None:
+                self._conn = http.client.HTTPSConnection(self.host, timeout=10)
+            try:
+                self._conn.request("POST", f"/bot{token}/sendMessage", body=data, headers=headers)
+                resp = self._conn.getresponse()
+                body = resp.read().decode("utf-8")
+                break
+            except (http.client.HTTPException, OSError):
+                self._close()
+                if attempt == 2:
+                    raise
 
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        body = resp.read().decode("utf-8")
         parsed = json.loads(body)
-        if not parsed.get("ok"):
-            raise RuntimeError(f"Telegram API error: {body}")
+        if parsed.get("ok"):
+            return None
+        if resp.status == 429:
+            return float(parsed.get("parameters", {}).get("retry_after", 1))
+        raise RuntimeError(f"Telegram API error: {body}")
 
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
-async def send_telegram(text: str) -> None:
-    """
-    Async wrapper so we don't block the event loop.
-    """
-    try:
-        await asyncio.to_thread(_send_telegram_sync, text)
-    except Exception as e:
-        print(f"Telegram send failed: {e}")
+    # ---------- RATE LIMIT / COALESCE ----------
+
+    async def _wait_for_slot(self):
+        while True:
+            now = time.monotonic()
+            while self._sent_at and now - self._sent_at[0] >= 60:
+                self._sent_at.popleft()
+
+            wait = 0.0
+            if self._sent_at:
+                wait = self._sent_at[-1] + self.min_interval - now
+            if len(self._sent_at) >= self.max_per_minute:
+                wait = max(wait, self._sent_at[0] + 60 - now)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def _compose(self, texts: List[str]) -> List[str]:
+        """
+        Merge queued texts into as few messages as fit MAX_MESSAGE_CHARS.
+        """
+        parts = list(texts)
+        if self.dropped:
+            parts.append(f"⚠️ {self.dropped} notification(s) dropped (queue full)")
+            self.dropped = 0
+
+        if len(texts) > 1:
+            self.merged += len(texts) - 1
+            parts.insert(0, f"📬 {len(texts)} notifications")
+
+        messages, current = [], ""
+        for part in parts:
+            part = part[:MAX_MESSAGE_CHARS]
+            candidate = f"{current}\n\n{part}" if current else part
+            if len(candidate) > MAX_MESSAGE_CHARS:
+                messages.append(current)
+                candidate = part
+            current = candidate
+        if current:
+            messages.append(current)
+        return messages
+
+    async def _deliver(self, text: str):
+        for _ in range(3):
+            await self._wait_for_slot()
+            self._sent_at.append(time.monotonic())
+            started = time.perf_counter_ns()
+            retry_after = await asyncio.to_thread(self._post_sync, text)
+            SEND_SECONDS.record(time.perf_counter_ns() - started)
+            if retry_after is None:
+                self.sent += 1
+                return
+            print(f"Telegram rate limited, retrying in {retry_after:.1f}s")
+            await asyncio.sleep(retry_after)
+        raise RuntimeError("Telegram still rate limited after retries")
+
+    # ---------- LOOP ----------
+
+    async def run_forever(self):
+        print("Telegram notifier started.")
+        try:
+            while True:
+                items = [await self.queue.get()]
+                await self._wait_for_slot()
+
+                # Everything that piled up while we waited goes in one message
+                while not self.queue.empty():
+                    items.append(self.queue.get_nowait())
+
+                delivered = True
+                for message in self._compose([text for text, _ in items]):
+                    try:
+                        await self._deliver(message)
+                    except Exception as e:
+                        delivered = False
+                        self.failed += 1
+                        print(f"Telegram send failed: {e}")
+
+                if delivered:
+                    for _, trace in items:
+                        if trace is not None:
+                            trace.mark("notified")
+        finally:
+            self._close()
+
+
+telegram_notifier = TelegramNotifier()
+
+metrics.observe("telegram_sent_total", "Telegram messages sent", lambda: telegram_notifier.sent, kind="counter")
+metrics.observe("telegram_failed_total", "Telegram messages that failed", lambda: telegram_notifier.failed, kind="counter")
+metrics.observe("telegram_queue_size", "Notifications waiting to be sent", lambda: telegram_notifier.queue.qsize())
 
 
 def format_signal_message(signal) -> str:
@@ -71,3 +241,18 @@ def format_signal_message(signal) -> str:
         f"move={move_pct:.2f}% | price={signal.price_at_signal}\n"
         f"time={signal.timestamp_signal}"
     )
+
+
+def format_summary_message(title: str, stats) -> str:
+    """
+    analytics.summary.TradeStats -> short text block.
+    """
+    def pct(value):
+        return "n/a" if value is None else f"{value * 100:.2f}%"
+
+    return (
+        f"📊 {title} | {stats.trades} closed trades\n"
+        f"win rate={pct(stats.win_rate)} | expectancy={pct(stats.expectancy)}\n"
+        f"pnl_1x={pct(stats.pnl_sum)} | max DD={pct(stats.max_drawdown)}\n"
+        f"exits: TRAIL={stats.trail_exits} TIME={stats.time_exits}"
+    )
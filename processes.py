@@ -0,0 +1,182 @@
+import asyncio
+import multiprocessing
+import queue
+
+from config import (
+    CLOCK,
+    ENGINE_PROCESSES,
+    SHARED_TABLE_CAPACITY,
+    SHARED_TABLE_POLL_MS,
+    SIGNAL_ENGINE_MODE,
+    TELEGRAM_NOTIFY_SIGNALS,
+    TICK_RECORDER_ENABLED,
+)
+from data_feed.shared_prices import SharedPriceReader, SharedPriceTable, SharedPriceWriter
+from signals.signal_engine import SignalEngine, publish_signal
+from signals.strategies import registry
+from utils.clock import create_clock, set_clock
+
+
+POLL_SECONDS = SHARED_TABLE_POLL_MS / 1000
+
+
+class RemoteSignalEngine(SignalEngine):
+    """
+    SignalEngine of an engine process: signal rows (with their
+    LatencyTrace) go to the main process over `out` instead of being
+    persisted and notified here.
+    """
+
+    def __init__(self, out, **kwargs):
+        super().__init__(notify=False, **kwargs)
+        self.out = out
+
+    def _publish(self, signal_data: dict, lookback_seconds: int, trace=None):
+        self.out.put((signal_data, lookback_seconds, trace))
+
+
+# ---------- CHILD PROCESSES ----------
+
+async def _feed_main(table_name: str):
+    from data_feed.binance_ws import create_feed, start_ws
+
+    table = SharedPriceTable.attach(table_name)
+    writer = SharedPriceWriter(table)
+
+    tasks = []
+    recorder = None
+    if TICK_RECORDER_ENABLED:
+        from data_feed.tick_recorder import TickRecorder
+        recorder = TickRecorder()
+        tasks.append(recorder.run_forever())
+    tasks.append(start_ws(recorder, create_feed(recorder, sink=writer)))
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        writer.close()
+        table.close()
+
+
+async def _engine_main(table_name: str, index: int, count: int, out):
+    set_clock(create_clock(CLOCK))
+    registry.load()
+    strategies = registry.all()[index::count]
+
+    table = SharedPriceTable.attach(table_name)
+    reader = SharedPriceReader(table)
+    engine = RemoteSignalEngine(out, strategies=strategies)
+
+    try:
+        await asyncio.gather(reader.run_forever(POLL_SECONDS), engine.run_forever())
+    finally:
+        table.close()
+
+
+def run_feed_process(table_name: str):
+    try:
+        asyncio.run(_feed_main(table_name))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_engine_process(table_name: str, index: int, count: int, out):
+    try:
+        asyncio.run(_engine_main(table_name, index, count, out))
+    except KeyboardInterrupt:
+        pass
+
+
+# ---------- MAIN PROCESS ----------
+
+class ProcessGroup:
+    """
+    Multi-process mode (MULTIPROCESS_ENABLED).
+
+    One feed process decodes the websocket and writes the latest tick per
+    symbol into a SharedPriceTable (data_feed/shared_prices.py) instead
+    of its market_state; `engines` engine processes each run a
+    round-robin share of the registry's strategies on their own copy of
+    market_state, filled from the table. Signal rows come back over a
+    queue and are persisted, handed to signal_sink and notified here, so
+    the main process (storage, trades, simulator, notifier) stays the
+    only DB writer. The main process also reads the table into its own
+    market_state for the simulator and exits.
+
+    Children are started with "spawn" (a forked asyncio loop is not
+    safe to reuse). Metrics are per process: the endpoint shows the
+    main process's, whose pipeline traces still start at the feed's
+    websocket receive.
+    """
+
+    def __init__(
+        self,
+        signal_sink=None,
+        engines: int = ENGINE_PROCESSES,
+        capacity: int = SHARED_TABLE_CAPACITY,
+        notify: bool = TELEGRAM_NOTIFY_SIGNALS,
+    ):
+        if SIGNAL_ENGINE_MODE not in ("tick", "poll"):
+            raise ValueError(f"SIGNAL_ENGINE_MODE={SIGNAL_ENGINE_MODE} is not supported in multi-process mode")
+
+        self.signal_sink = signal_sink
+        self.engines = max(1, min(engines, len(registry.all()) or 1))
+        self.capacity = capacity
+        self.notify = notify
+
+        self.table: SharedPriceTable | None = None
+        self.reader: SharedPriceReader | None = None
+        self.signals = None
+        self.processes = []
+
+    def start(self):
+        ctx = multiprocessing.get_context("spawn")
+        self.table = SharedPriceTable.create(self.capacity)
+        self.reader = SharedPriceReader(self.table)
+        self.signals = ctx.Queue()
+
+        name = self.table.name
+        self.processes = [ctx.Process(target=run_feed_process, args=(name,), name="feed", daemon=True)]
+        for index in range(self.engines):
+            self.processes.append(ctx.Process(
+                target=run_engine_process, args=(name, index, self.engines, self.signals),
+                name=f"engine-{index}", daemon=True,
+            ))
+
+        for process in self.processes:
+            process.start()
+        print(
+            f"Multi-process mode: feed pid={self.processes[0].pid}, engine pids="
+            f"{', '.join(str(p.pid) for p in self.processes[1:])} (table {name}, {self.capacity} slots)"
+        )
+
+    def tasks(self) -> list:
+        return [self.reader.run_forever(POLL_SECONDS), self._relay(), self._watch()]
+
+    async def _relay(self):
+        while True:
+            try:
+                signal_data, lookback_seconds, trace = self.signals.get_nowait()
+            except queue.Empty:
+                await asyncio.sleep(POLL_SECONDS)
+                continue
+            publish_signal(signal_data, lookback_seconds, self.signal_sink, self.notify, trace)
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(1)
+            for process in self.processes:
+                if not process.is_alive():
+                    raise RuntimeError(f"{process.name} process exited (code {process.exitcode})")
+
+    def stop(self):
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            process.join(timeout=5)
+
+        if self.table is not None:
+            self.reader = None
+            self.table.close()
+            self.table = None
@@ -0,0 +1,163 @@
+from utils.env import load_dotenv
+load_dotenv()
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+REPLAY_DIR = Path("runtime/replays")
+
+
+def _parse_time(value: str) -> int:
+    """
+    ISO date / datetime (UTC) -> epoch ms.
+    """
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Replay recorded ticks through SignalEngine, trade creation "
+                    "and the trade simulator on a simulated clock."
+    )
+    parser.add_argument("--start", required=True, help="UTC start, e.g. 2026-01-15 or 2026-01-15T08:00")
+    parser.add_argument("--end", required=True, help="UTC end (exclusive)")
+    parser.add_argument("--symbols", default="", help="Comma-separated symbols (default: config.SYMBOLS)")
+    parser.add_argument("--ticks-dir", default=None, help="Tick recorder directory (default: TICK_RECORDER_DIR)")
+    parser.add_argument("--db", default=None,
+                        help=f"Database URL for replay output (default: a new file in {REPLAY_DIR}/)")
+    parser.add_argument("--append", action="store_true",
+                        help="Allow --db to already hold signals / trades (they are loaded and extended)")
+    return parser.parse_args()
+
+
+def _new_replay_db() -> str:
+    """
+    Fresh SQLite file per run, so a replay never starts from an earlier
+    run's open trades and summaries.
+    """
+    REPLAY_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    return f"sqlite:///{REPLAY_DIR / f'replay_{stamp}_{os.getpid()}.db'}"
+
+
+def _has_rows() -> bool:
+    from storage.db import SessionLocal
+    from storage.models import Signal, Trade
+
+    session = SessionLocal()
+    try:
+        return any(session.query(model.id).first() is not None for model in (Signal, Trade))
+    finally:
+        session.close()
+
+
+async def replay(args):
+    # Imported here: storage reads DATABASE_URL at import time
+    from analytics.summary import trade_summaries
+    from config import SYMBOLS, TICK_RECORDER_DIR
+    from data_feed.market_state import subscribe, update_price, update_ticker
+    from data_feed.tick_recorder import TickReader
+    from signals.signal_engine import SignalEngine
+    from signals.strategies import registry
+    from storage.async_queries import init_db
+    from storage.worker import db_worker
+    from trades.trade_book import trade_book
+    from trades.trade_creator import create_trade_from_signal
+    from trades.trade_simulator import next_timer, simulator_step, start_exits, stop_exits
+    from utils.clock import NS_PER_MS, SimClock, set_clock
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()] or SYMBOLS
+    start_ms, end_ms = _parse_time(args.start), _parse_time(args.end)
+
+    ticks = TickReader(args.ticks_dir or TICK_RECORDER_DIR).read(start_ms, end_ms, symbols)
+    n = len(ticks["event_ms"])
+    print(f"Replay | {n} ticks | {len(symbols)} symbols | {args.start} -> {args.end}")
+    if not n:
+        return
+
+    clock = SimClock(ticks["event_ms"][0] * NS_PER_MS)
+    set_clock(clock)
+
+    registry.load()
+    await init_db()
+    if not args.append and await db_worker.run(_has_rows):
+        db_worker.stop()
+        raise SystemExit(
+            f"{args.db} already holds signals / trades; pass --append to extend it, "
+            f"or leave out --db for a fresh database"
+        )
+    await trade_book.load()
+    await trade_summaries.load()
+
+    trades = []
+
+    def to_trade(signal):
+        trade = create_trade_from_signal(signal)
+        if trade is not None:
+            trades.append(trade)
+
+    engine = SignalEngine(
+        mode="tick", signal_sink=to_trade, notify=False, symbols=symbols,
+        strategies=registry.all(),
+    )
+    subscribe(engine.on_tick)
+    start_exits()
+
+    names = ticks["symbols"]
+    started = time.perf_counter()
+    try:
+        for event_ms, symbol_id, price, volume in zip(
+            ticks["event_ms"].tolist(),
+            ticks["symbol_id"].tolist(),
+            ticks["close"].tolist(),
+            ticks["volume"].tolist(),
+        ):
+            ns = event_ms * NS_PER_MS
+
+            # Fire entries / time stops that fall before this tick at
+            # their own time, as the live timer would.
+            due = next_timer()
+            while due is not None and due <= ns:
+                clock.set(due)
+                simulator_step(due)
+                due = next_timer()
+
+            clock.set(ns)
+            if volume == volume:  # miniTicker 24h volume (NaN for other streams)
+                update_ticker(names[symbol_id], price, volume)
+            else:
+                update_price(names[symbol_id], price)
+            await engine.process_dirty()
+    finally:
+        stop_exits()
+        db_worker.stop()
+
+    elapsed = time.perf_counter() - started
+    closed = [t for t in trades if t.exit_time is not None]
+    pnl = sum(t.pnl_pct_1x for t in closed)
+
+    print(
+        f"Replay done | {elapsed:.1f}s wall | {n / max(elapsed, 1e-9):,.0f} ticks/s | "
+        f"trades={len(trades)} | closed={len(closed)} | "
+        f"pnl_1x_sum={pnl*100:.2f}%"
+    )
+
+
+def main():
+    args = parse_args()
+    if args.db is None:
+        args.db = _new_replay_db()
+    print(f"Replay output: {args.db}")
+    os.environ["DATABASE_URL"] = args.db
+    asyncio.run(replay(args))
+
+
+if __name__ == "__main__":
+    main()
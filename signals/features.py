@@ -0,0 +1,90 @@
+from typing import Dict, Iterable
+
+from data_feed.bars import SymbolBars, bar_store
+from data_feed.indicators import SymbolIndicators, ema_step
+from data_feed.market_state import market_state
+from data_feed.price_history import PriceHistory
+from utils.clock import NS_PER_SECOND
+
+
+def momentum_move(history: PriceHistory, current_price: float, lookback_ts: int) -> float | None:
+    """
+    Fractional move from the last price at or before lookback_ts (epoch
+    ns) to current_price, or None without a usable reference price.
+    Shared by the signal engine, strategies and the backtest simulator.
+    """
+    old_price = history.price_at_or_before(lookback_ts)
+    if old_price is None or old_price <= 0:
+        return None
+    return (current_price - old_price) / old_price
+
+
+class SymbolFeatures:
+    """
+    Derived series for one symbol as of its latest evaluation.
+    """
+
+    __slots__ = ("symbol", "ts", "price", "returns", "emas", "indicators", "bars")
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.ts: int | None = None  # epoch ns
+        self.price: float | None = None
+        self.returns: Dict[int, float | None] = {}  # lookback seconds -> move
+        self.emas: Dict[int, float] = {}            # period seconds -> EMA
+        self.indicators: SymbolIndicators | None = None  # market_state's streaming set
+        self.bars: SymbolBars | None = None              # aggTrade bars (BARS_ENABLED)
+
+
+class FeatureCache:
+    """
+    Features shared by every strategy in the process.
+
+    Strategies declare what they read (require()); update() then computes
+    each return lookback and EMA once per symbol per evaluation, however
+    many strategies consume it. Twenty momentum variants on three
+    lookbacks cost three history lookups per tick, not twenty.
+
+    EMAs are time-weighted (indicators.ema_step), so they stay correct
+    when several ticks are collapsed into one evaluation.
+    """
+
+    def __init__(self):
+        self.lookbacks: set[int] = set()
+        self.ema_periods: set[int] = set()
+        self._features: Dict[str, SymbolFeatures] = {}
+
+    def require(self, lookbacks: Iterable[int] = (), ema_periods: Iterable[int] = ()):
+        self.lookbacks.update(int(lb) for lb in lookbacks)
+        self.ema_periods.update(int(p) for p in ema_periods)
+
+    def get(self, symbol: str) -> SymbolFeatures | None:
+        return self._features.get(symbol)
+
+    def update(self, symbol: str, ts: int) -> SymbolFeatures | None:
+        state = market_state.get(symbol)
+        if not state or state.price is None:
+            return None
+
+        features = self._features.get(symbol)
+        if features is None:
+            features = self._features[symbol] = SymbolFeatures(symbol)
+
+        price = state.price
+        history = state.price_history
+        features.returns = {
+            lookback: momentum_move(history, price, ts - lookback * NS_PER_SECOND)
+            for lookback in self.lookbacks
+        }
+
+        emas = features.emas
+        dt = (ts - features.ts) / NS_PER_SECOND if features.ts is not None else None
+        for period in self.ema_periods:
+            prev = emas.get(period) if dt is not None else None
+            emas[period] = ema_step(prev, price, dt or 0.0, period)
+
+        features.ts = ts
+        features.price = price
+        features.indicators = state.indicators
+        features.bars = bar_store.get(symbol)
+        return features
@@ -0,0 +1,202 @@
+import abc
+from typing import Dict, List, Type
+
+from signals.features import SymbolFeatures
+
+
+class SignalFilter(abc.ABC):
+    """
+    Veto on a candidate signal, checked after the strategy rule fires.
+    Filters only read values the streaming indicators (features.indicators)
+    or trade bars (features.bars) already hold, so they cost a few
+    attribute lookups per candidate.
+
+    Missing data (no volume on the stream, indicators / bars disabled)
+    fails the filter: a filter that cannot be checked does not let
+    signals through.
+    """
+
+    name = ""
+
+    @abc.abstractmethod
+    def passes(self, direction: str, features: SymbolFeatures) -> bool:
+        ...
+
+
+class MinVolumeRatio(SignalFilter):
+    """
+    Short-window volume at least `value` x its long-window average.
+    """
+
+    name = "min_volume_ratio"
+
+    def __init__(self, value: float):
+        self.value = float(value)
+
+    def passes(self, direction: str, features: SymbolFeatures) -> bool:
+        ind = features.indicators
+        return ind is not None and ind.volume_ratio >= self.value
+
+
+class EmaTrend(SignalFilter):
+    """
+    Longs above the indicator EMA, shorts below it.
+    """
+
+    name = "ema_trend"
+
+    def __init__(self, value: bool = True):
+        self.enabled = bool(value)
+
+    def passes(self, direction: str, features: SymbolFeatures) -> bool:
+        if not self.enabled:
+            return True
+        ind = features.indicators
+        if ind is None:
+            return False
+        return ind.ema_side == ("above" if direction == "LONG" else "below")
+
+
+class VwapSide(SignalFilter):
+    """
+    Longs above the rolling VWAP, shorts below it.
+    """
+
+    name = "vwap_side"
+
+    def __init__(self, value: bool = True):
+        self.enabled = bool(value)
+
+    def passes(self, direction: str, features: SymbolFeatures) -> bool:
+        if not self.enabled:
+            return True
+        ind = features.indicators
+        vwap = ind.vwap if ind is not None else None
+        if vwap is None:
+            return False
+        return (ind.price > vwap) == (direction == "LONG")
+
+
+class CvdConfirms(SignalFilter):
+    """
+    Taker flow over the short window agrees with the direction
+    (buy volume > sell volume for longs). Needs aggTrade streams.
+    """
+
+    name = "cvd_confirms"
+
+    def __init__(self, value: bool = True):
+        self.enabled = bool(value)
+
+    def passes(self, direction: str, features: SymbolFeatures) -> bool:
+        if not self.enabled:
+            return True
+        ind = features.indicators
+        if ind is None or not ind.has_side:
+            return False
+        delta = ind.buy_volume.sum - ind.sell_volume.sum
+        return delta > 0 if direction == "LONG" else delta < 0
+
+
+class VolatilityBand(SignalFilter):
+    """
+    Rolling volatility (stdev of bucket log returns) within [low, high].
+    Either bound may be None.
+    """
+
+    name = "volatility"
+
+    def __init__(self, value: dict):
+        self.low = value.get("min")
+        self.high = value.get("max")
+
+    def passes(self, direction: str, features: SymbolFeatures) -> bool:
+        ind = features.indicators
+        stdev = ind.volatility.stdev() if ind is not None else None
+        if stdev is None:
+            return False
+        if self.low is not None and stdev < self.low:
+            return False
+        if self.high is not None and stdev > self.high:
+            return False
+        return True
+
+
+class BarVolumeRatio(SignalFilter):
+    """
+    Trade-bar volume over the last `window_seconds` at least `min` x its
+    average over the last `baseline_seconds` of finished bars on the
+    next bar level (1m by default). Needs BARS_ENABLED.
+    A plain number is taken as `min`.
+    """
+
+    name = "bar_volume_ratio"
+
+    def __init__(self, value):
+        if not isinstance(value, dict):
+            value = {"min": value}
+        self.min = float(value["min"])
+        self.window_seconds = int(value.get("window_seconds", 60))
+        self.baseline_seconds = int(value.get("baseline_seconds", 600))
+
+    def passes(self, direction: str, features: SymbolFeatures) -> bool:
+        bars = features.bars
+        if bars is None or len(bars.levels) < 2:
+            return False
+        fine, coarse = bars.levels[0], bars.levels[1]
+
+        n = max(1, self.baseline_seconds // coarse.seconds)
+        baseline = coarse.volume(n, skip=1)
+        covered = min(n, len(coarse) - 1) * coarse.seconds
+        if baseline <= 0 or covered <= 0:
+            return False
+
+        recent = fine.volume(max(1, self.window_seconds // fine.seconds))
+        return recent >= self.min * baseline * self.window_seconds / covered
+
+
+class TakerRatio(SignalFilter):
+    """
+    Share of taker volume on the signal's side over the last 60s of trade
+    bars (buys for longs, sells for shorts) at least `value`.
+    Needs BARS_ENABLED.
+    """
+
+    name = "taker_ratio"
+
+    def __init__(self, value: float, window_seconds: int = 60):
+        self.value = float(value)
+        self.window_seconds = int(window_seconds)
+
+    def passes(self, direction: str, features: SymbolFeatures) -> bool:
+        bars = features.bars
+        if bars is None:
+            return False
+        fine = bars.levels[0]
+        n = max(1, self.window_seconds // fine.seconds)
+        buys, sells = fine.buy_volume(n), fine.sell_volume(n)
+        total = buys + sells
+        if total <= 0:
+            return False
+        return (buys if direction == "LONG" else sells) / total >= self.value
+
+
+FILTER_KINDS: Dict[str, Type[SignalFilter]] = {
+    cls.name: cls for cls in (
+        MinVolumeRatio, EmaTrend, VwapSide, CvdConfirms, VolatilityBand,
+        BarVolumeRatio, TakerRatio,
+    )
+}
+
+
+def build_filters(spec: dict | None) -> List[SignalFilter]:
+    """
+    {"min_volume_ratio": 2.0, "ema_trend": True, "volatility": {"max": 0.002}}
+    -> filter instances, in the order given.
+    """
+    filters = []
+    for name, value in (spec or {}).items():
+        if name not in FILTER_KINDS:
+            raise ValueError(f"Unknown signal filter: {name}")
+        filters.append(FILTER_KINDS[name](value))
+    return filters
@@ -0,0 +1,49 @@
+from dataclasses import asdict, dataclass, fields, replace
+
+import config
+
+
+@dataclass(frozen=True)
+class StrategyParams:
+    """
+    Per-run strategy parameters.
+
+    The live pipeline builds one from config (StrategyParams.from_config())
+    and hands it to SignalEngine, create_trade_from_signal and ExitEngine,
+    so a backtest / parameter sweep can run the same code with different
+    values side by side instead of patching module constants.
+    """
+
+    momentum_pct: float
+    lookback_seconds: int
+    cooldown_seconds: int
+    entry_delay_seconds: int
+    trailing_activation_pct: float
+    trailing_distance_pct: float
+    time_stop_seconds: int
+
+    @classmethod
+    def from_config(cls, **overrides) -> "StrategyParams":
+        params = cls(
+            momentum_pct=config.MOMENTUM_PCT,
+            lookback_seconds=config.LOOKBACK_SECONDS,
+            cooldown_seconds=config.COOLDOWN_SECONDS,
+            entry_delay_seconds=config.ENTRY_DELAY_SECONDS,
+            trailing_activation_pct=config.TRAILING_ACTIVATION_PCT,
+            trailing_distance_pct=config.TRAILING_DISTANCE_PCT,
+            time_stop_seconds=config.TIME_STOP_SECONDS,
+        )
+        return params.with_overrides(**overrides) if overrides else params
+
+    @classmethod
+    def names(cls):
+        return [f.name for f in fields(cls)]
+
+    def with_overrides(self, **overrides) -> "StrategyParams":
+        unknown = set(overrides) - set(self.names())
+        if unknown:
+            raise ValueError(f"Unknown strategy parameter(s): {', '.join(sorted(unknown))}")
+        return replace(self, **overrides)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
@@ -1,100 +1,215 @@
 import asyncio
-from datetime import datetime, timedelta
 
-from config import SYMBOLS, MOMENTUM_PCT, LOOKBACK_SECONDS, COOLDOWN_SECONDS, TELEGRAM_NOTIFY_SIGNALS
-from data_feed.market_state import market_state
-from storage.queries import insert_signal
-from notifier.telegram import send_telegram, format_signal_message
-
-
-def _find_price_at_or_before(symbol: str, target_time: datetime):
-    """
-    Find the last price in the symbol's history with timestamp <= target_time.
-    Returns None if not found.
-    """
-    state = market_state.get(symbol)
-    if not state or not state.price_history:
-        return None
-
-    chosen_price = None
-    for ts, price in state.price_history:
-        if ts <= target_time:
-            chosen_price = price
-        else:
-            break
-    return chosen_price
+from config import (
+    DEFAULT_STRATEGY_ID,
+    SYMBOLS,
+    SIGNAL_ENGINE_MODE,
+    TELEGRAM_NOTIFY_SIGNALS,
+)
+from data_feed.market_state import market_state, subscribe, unsubscribe
+from signals.features import FeatureCache
+from signals.params import StrategyParams
+from signals.strategies import MomentumStrategy, Strategy
+from storage.async_queries import insert_signal
+from notifier.telegram import telegram_notifier, format_signal_message
+from utils.clock import now_ns, to_datetime
+from utils.metrics import metrics
 
 
 class SignalEngine:
-    def __init__(self):
-        self._last_signal_time = {} 
-
-    def _cooldown_passed(self, symbol: str, now: datetime) -> bool:
-        last = self._last_signal_time.get(symbol)
-        if last is None:
-            return True
-        return (now - last).total_seconds() >= COOLDOWN_SECONDS
-
-    def _mark_signaled(self, symbol: str, now: datetime):
-        self._last_signal_time[symbol] = now
-
-    async def run_forever(self):
-        print("SignalEngine started (Option 1: pure momentum).")
-
-        while True:
-            now = datetime.utcnow()
-            lookback_time = now - timedelta(seconds=LOOKBACK_SECONDS)
-
-            for symbol in SYMBOLS:
-                state = market_state.get(symbol)
-                if not state or state.price is None:
-                    continue
-
-                old_price = _find_price_at_or_before(symbol, lookback_time)
-                if old_price is None or old_price <= 0:
-                    continue
-
-                current_price = state.price
-                move_pct = (current_price - old_price) / old_price
-
-                if abs(move_pct) < MOMENTUM_PCT:
-                    continue
-
-                if not self._cooldown_passed(symbol, now):
-                    continue
-
-                direction = "LONG" if move_pct > 0 else "SHORT"
+    """
+    Signal engine for one or more strategies (signals/strategies.py).
 
+    mode="tick": evaluates only symbols that ticked since the last pass,
+                 woken by market_state.update_price (default).
+    mode="poll": rescans every symbol in SYMBOLS once per second.
 
-                signal_data = {
-                    "symbol": symbol,
-                    "timestamp_signal": now,
-                    "direction": direction,
-                    "price_at_signal": float(current_price),
-                    "move_pct": float(move_pct),
+    Each evaluated symbol gets its shared features (returns, EMAs) computed
+    once in a FeatureCache; every strategy then applies its own rule,
+    filters and cooldown to the same entry. Without `strategies` the
+    engine runs the single pure-momentum strategy with `params`.
 
-                    "volume_1m": 0.0,
-                    "volume_10m_avg": 0.0,
-                    "volume_ratio": 0.0,
-                    "oi": None,
-                    "buy_vol": None,
-                    "sell_vol": None,
-                    "cvd_snapshot": None,
-                    "ema_side": "unknown",
-                    "liquidity_tier": "HIGH",
-                    "cooldown_passed": True,
-                }
+    Signal rows get their volume / CVD / EMA columns from the symbol's
+    streaming indicators (data_feed/indicators.py).
 
-                saved = insert_signal(signal_data)
-                self._mark_signaled(symbol, now)
+    Each pass reads the active clock (utils/clock.py) once, as epoch ns;
+    a datetime is only built for the rows of signals that fire.
 
-                print(
-                    f"SIGNAL #{saved.id} | {symbol} | {direction} | "
-                    f"move={move_pct*100:.2f}% | price={current_price} | "
-                    f"lookback={LOOKBACK_SECONDS}s"
-                )
+    Persisted signals are handed to signal_sink (SignalConsumer.submit)
+    in-process, so trades do not wait on a DB poll.
+    """
 
-                if TELEGRAM_NOTIFY_SIGNALS:
-                    await send_telegram(format_signal_message(saved))
+    def __init__(
+        self,
+        mode: str = SIGNAL_ENGINE_MODE,
+        signal_sink=None,
+        notify: bool = TELEGRAM_NOTIFY_SIGNALS,
+        symbols=SYMBOLS,
+        params: StrategyParams | None = None,
+        strategies: list[Strategy] | None = None,
+    ):
+        if mode not in ("tick", "poll"):
+            raise ValueError(f"Unknown SignalEngine mode: {mode}")
+
+        self.mode = mode
+        self.signal_sink = signal_sink
+        self.notify = notify
+        self.params = params or StrategyParams.from_config()
+
+        self.strategies = list(strategies or [MomentumStrategy(DEFAULT_STRATEGY_ID, self.params)])
+        self.features = FeatureCache()
+        for strategy in self.strategies:
+            self.features.require(**strategy.requires())
+
+        self.symbols = list(symbols)
+        self._symbols = set(self.symbols)
+        self._dirty: set[str] = set()
+        self._wakeup = asyncio.Event()
+
+    def on_tick(self, symbol: str):
+        """
+        market_state listener: remember the symbol and wake the engine.
+        """
+        if symbol not in self._symbols:
+            return
+        self._dirty.add(symbol)
+        self._wakeup.set()
+
+    async def _check_symbol(self, symbol: str, ts: int):
+        features = self.features.update(symbol, ts)
+        if features is None:
+            return
+
+        for strategy in self.strategies:
+            if strategy.symbols is not None and symbol not in strategy.symbols:
+                continue
+
+            move_pct = strategy.evaluate(features)
+            if move_pct is None:
+                continue
+
+            if strategy.filters and not strategy.passes_filters(
+                "LONG" if move_pct > 0 else "SHORT", features
+            ):
+                metrics.counter(
+                    "signals_filtered_total", "Signals rejected by strategy filters",
+                    strategy=strategy.strategy_id,
+                ).inc()
+                continue
+
+            if not strategy.cooldown_passed(symbol, ts):
+                continue
+            strategy.mark_signaled(symbol, ts)
+
+            await self._emit_signal(
+                symbol, ts, features.price, move_pct,
+                strategy.params.lookback_seconds, strategy.strategy_id,
+            )
+
+    async def _emit_signal(
+        self,
+        symbol: str,
+        ts: int,
+        current_price: float,
+        move_pct: float,
+        lookback_seconds: int,
+        strategy_id: str = DEFAULT_STRATEGY_ID,
+    ):
+        direction = "LONG" if move_pct > 0 else "SHORT"
+
+        state = market_state.get(symbol)
+        indicators = state.indicators if state is not None else None
+
+        signal_data = {
+            "strategy_id": strategy_id,
+            "symbol": symbol,
+            "timestamp_signal": to_datetime(ts),
+            "direction": direction,
+            "price_at_signal": float(current_price),
+            "move_pct": float(move_pct),
+
+            "volume_1m": 0.0,
+            "volume_10m_avg": 0.0,
+            "volume_ratio": 0.0,
+            "oi": None,
+            "buy_vol": None,
+            "sell_vol": None,
+            "cvd_snapshot": None,
+            "ema_side": "unknown",
+            "liquidity_tier": "HIGH",
+            "cooldown_passed": True,
+        }
+        if indicators is not None:
+            signal_data.update(indicators.snapshot())
+
+        # Live ticks carry the frame's LatencyTrace; replay ticks do not
+        trace = None
+        if state is not None and state.trace is not None:
+            trace = state.trace.for_signal(state.event_ms)
+            trace.mark("emitted")
+
+        self._publish(signal_data, lookback_seconds, trace)
+
+    def _publish(self, signal_data: dict, lookback_seconds: int, trace=None):
+        publish_signal(signal_data, lookback_seconds, self.signal_sink, self.notify, trace)
+
+    async def _check_symbols(self, symbols):
+        ts = now_ns()
+
+        for symbol in symbols:
+            await self._check_symbol(symbol, ts)
+
+    async def process_dirty(self):
+        """
+        Evaluate the symbols that ticked since the last call.
+        """
+        # Swap the set so ticks arriving while we evaluate
+        # land in the next pass.
+        dirty, self._dirty = self._dirty, set()
+        if dirty:
+            await self._check_symbols(dirty)
 
-            await asyncio.sleep(1)
+    async def run_forever(self):
+        print(
+            f"SignalEngine started (mode={self.mode}, strategies="
+            f"{', '.join(s.strategy_id for s in self.strategies)})."
+        )
+
+        if self.mode == "poll":
+            while True:
+                await self._check_symbols(self.symbols)
+                await asyncio.sleep(1)
+
+        subscribe(self.on_tick)
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                await self.process_dirty()
+        finally:
+            unsubscribe(self.on_tick)
+
+
+def publish_signal(signal_data: dict, lookback_seconds: int, signal_sink=None, notify: bool = False, trace=None):
+    """
+    Persist a signal row, hand it to signal_sink and, if notify
+    (TELEGRAM_NOTIFY_SIGNALS unless the caller overrides it), queue its
+    Telegram message. Shared by SignalEngine and the multi-process relay
+    (processes.py), which publishes rows computed in engine processes.
+    """
+    saved = insert_signal(signal_data, trace=trace)
+    metrics.counter("signals_total", "Signals emitted", strategy=saved.strategy_id).inc()
+
+    if signal_sink is not None:
+        signal_sink(saved)
+
+    print(
+        f"SIGNAL #{saved.id} | {saved.strategy_id} | {saved.symbol} | {saved.direction} | "
+        f"move={saved.move_pct*100:.2f}% | price={saved.price_at_signal} | "
+        f"lookback={lookback_seconds}s"
+    )
+
+    if notify:
+        # Queued for the background notifier; never waits on Telegram
+        telegram_notifier.notify(format_signal_message(saved), trace=trace)
+    return saved
@@ -0,0 +1,157 @@
+import abc
+from typing import Dict, Iterable, List, Type
+
+from config import DEFAULT_STRATEGY_ID, STRATEGIES
+from signals.features import SymbolFeatures
+from signals.filters import SignalFilter, build_filters
+from signals.params import StrategyParams
+from utils.clock import NS_PER_SECOND
+
+
+class Strategy(abc.ABC):
+    """
+    One strategy instance: an id (stored on its signals and trades), its
+    own StrategyParams, an optional symbol subset, optional filters on
+    the streaming indicators and trade bars (signals/filters.py) and a
+    per-symbol cooldown. SignalEngine evaluates every registered instance against the
+    same FeatureCache entry, so instances only pay for their own rule.
+
+    Subclasses set `kind`, declare the shared features they read in
+    requires(), and implement evaluate().
+    """
+
+    kind = ""
+
+    def __init__(
+        self,
+        strategy_id: str,
+        params: StrategyParams | None = None,
+        symbols: Iterable[str] | None = None,
+        filters: List[SignalFilter] | None = None,
+    ):
+        self.strategy_id = strategy_id
+        self.params = params or StrategyParams.from_config()
+        self.symbols = set(symbols) if symbols else None
+        self.filters = list(filters or [])
+        self._last_signal_ts: Dict[str, int] = {}  # epoch ns
+
+    def requires(self) -> dict:
+        """
+        FeatureCache.require() kwargs.
+        """
+        return {}
+
+    @abc.abstractmethod
+    def evaluate(self, features: SymbolFeatures) -> float | None:
+        """
+        move_pct (sign = direction) if the symbol should signal, else None.
+        Cooldown is checked by the engine afterwards.
+        """
+
+    def passes_filters(self, direction: str, features: SymbolFeatures) -> bool:
+        return all(f.passes(direction, features) for f in self.filters)
+
+    def cooldown_passed(self, symbol: str, ts: int) -> bool:
+        last = self._last_signal_ts.get(symbol)
+        return last is None or ts - last >= self.params.cooldown_seconds * NS_PER_SECOND
+
+    def mark_signaled(self, symbol: str, ts: int):
+        self._last_signal_ts[symbol] = ts
+
+
+class MomentumStrategy(Strategy):
+    """
+    Pure momentum: |move over lookback_seconds| >= momentum_pct.
+    """
+
+    kind = "momentum"
+
+    def requires(self) -> dict:
+        return {"lookbacks": [self.params.lookback_seconds]}
+
+    def evaluate(self, features: SymbolFeatures) -> float | None:
+        move_pct = features.returns.get(self.params.lookback_seconds)
+        if move_pct is None or abs(move_pct) < self.params.momentum_pct:
+            return None
+        return move_pct
+
+
+class EmaTrendMomentumStrategy(MomentumStrategy):
+    """
+    Momentum in the direction of the trend: longs only above the EMA,
+    shorts only below it.
+    """
+
+    kind = "momentum_ema"
+
+    def __init__(self, strategy_id: str, params: StrategyParams | None = None,
+                 symbols: Iterable[str] | None = None, filters: List[SignalFilter] | None = None,
+                 ema_period_seconds: int = 300):
+        super().__init__(strategy_id, params, symbols, filters)
+        self.ema_period = int(ema_period_seconds)
+
+    def requires(self) -> dict:
+        return {**super().requires(), "ema_periods": [self.ema_period]}
+
+    def evaluate(self, features: SymbolFeatures) -> float | None:
+        move_pct = super().evaluate(features)
+        if move_pct is None:
+            return None
+        ema = features.emas.get(self.ema_period)
+        if ema is None:
+            return None
+        if (move_pct > 0) != (features.price > ema):
+            return None
+        return move_pct
+
+
+STRATEGY_KINDS: Dict[str, Type[Strategy]] = {
+    cls.kind: cls for cls in (MomentumStrategy, EmaTrendMomentumStrategy)
+}
+
+
+def build_strategy(spec: dict) -> Strategy:
+    """
+    {"id": ..., "kind": ..., "params": {...}, "symbols": [...],
+     "filters": {...}, **options} -> Strategy. params override config
+    values, filters go through filters.build_filters; other keys are
+    passed to the strategy class.
+    """
+    spec = dict(spec)
+    strategy_id = spec.pop("id")
+    kind = spec.pop("kind", "momentum")
+    if kind not in STRATEGY_KINDS:
+        raise ValueError(f"Unknown strategy kind for {strategy_id}: {kind}")
+
+    params = StrategyParams.from_config(**spec.pop("params", {}))
+    filters = build_filters(spec.pop("filters", None))
+    return STRATEGY_KINDS[kind](strategy_id, params, spec.pop("symbols", None), filters, **spec)
+
+
+class StrategyRegistry:
+    """
+    Active strategy instances by id. The signal engine evaluates them; the
+    trade creator and exit engine look up per-strategy parameters here.
+    """
+
+    def __init__(self):
+        self.strategies: Dict[str, Strategy] = {}
+
+    def add(self, strategy: Strategy):
+        if strategy.strategy_id in self.strategies:
+            raise ValueError(f"Duplicate strategy id: {strategy.strategy_id}")
+        self.strategies[strategy.strategy_id] = strategy
+
+    def load(self, specs: List[dict] = STRATEGIES):
+        for spec in specs:
+            self.add(build_strategy(spec))
+
+    def all(self) -> List[Strategy]:
+        return list(self.strategies.values())
+
+    def params(self, strategy_id: str | None) -> StrategyParams:
+        strategy = self.strategies.get(strategy_id or DEFAULT_STRATEGY_ID)
+        return strategy.params if strategy is not None else StrategyParams.from_config()
+
+
+registry = StrategyRegistry()
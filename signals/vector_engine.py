@@ -0,0 +1,142 @@
+import asyncio
+
+import numpy as np
+
+from config import MOMENTUM_LOOKBACKS_SECONDS
+from data_feed.market_state import market_state, subscribe, unsubscribe
+from signals.signal_engine import SignalEngine
+from utils.clock import NS_PER_SECOND, now_ns
+
+
+_INITIAL_ROWS = 64
+
+
+class VectorSignalEngine(SignalEngine):
+    """
+    Momentum engine that scans every tracked symbol in one NumPy pass.
+
+    Keeps a dense (symbols x seconds) matrix holding the last price seen in
+    each of the last max(MOMENTUM_LOOKBACKS_SECONDS) seconds, used as a ring
+    over the time axis. Once per second the current column is filled from
+    the latest prices, then move_pct is computed for every symbol and every
+    lookback at once and filtered with the momentum_pct and cooldown masks.
+
+    Signals are persisted / notified through SignalEngine._emit_signal, so
+    the rest of the pipeline does not care which engine produced them.
+    """
+
+    def __init__(self, lookbacks=MOMENTUM_LOOKBACKS_SECONDS, signal_sink=None, params=None):
+        super().__init__(mode="poll", signal_sink=signal_sink, params=params)
+        self.mode = "vector"
+
+        self.lookbacks = np.array(sorted(set(int(lb) for lb in lookbacks)), dtype=np.int64)
+        if self.lookbacks.size == 0 or self.lookbacks[0] <= 0:
+            raise ValueError("MOMENTUM_LOOKBACKS_SECONDS must be positive")
+        self._width = int(self.lookbacks[-1]) + 1
+
+        self._row: dict[str, int] = {}
+        self._row_symbols: list[str] = []
+
+        self._matrix = np.full((_INITIAL_ROWS, self._width), np.nan)
+        self._last = np.full(_INITIAL_ROWS, np.nan)
+        self._last_signal_ts = np.full(_INITIAL_ROWS, -np.inf)
+
+        self._last_second: int | None = None
+
+    def _add_symbol(self, symbol: str) -> int:
+        row = len(self._row_symbols)
+        if row == self._last.shape[0]:
+            grow = row
+            self._matrix = np.vstack([self._matrix, np.full((grow, self._width), np.nan)])
+            self._last = np.concatenate([self._last, np.full(grow, np.nan)])
+            self._last_signal_ts = np.concatenate([self._last_signal_ts, np.full(grow, -np.inf)])
+
+        self._row[symbol] = row
+        self._row_symbols.append(symbol)
+        return row
+
+    def on_tick(self, symbol: str):
+        row = self._row.get(symbol)
+        if row is None:
+            row = self._add_symbol(symbol)
+        self._last[row] = market_state[symbol].price
+
+    def _advance(self, second: int):
+        """
+        Write the latest prices into the column(s) for `second`,
+        carrying them forward over any seconds the loop skipped. After a
+        pause longer than the ring, every column is refilled, so no
+        lookback compares against a price from before the pause.
+        """
+        n = len(self._row_symbols)
+        prev = self._last_second
+        if prev is None or second - prev >= self._width:
+            self._matrix[:n, :] = self._last[:n, None]
+        else:
+            for s in range(prev + 1, second + 1):
+                self._matrix[:n, s % self._width] = self._last[:n]
+
+        self._last_second = second
+
+    def _scan(self, now_ts: float):
+        """
+        Returns (rows, move_pct, lookback_seconds) for symbols that crossed
+        params.momentum_pct and are out of cooldown.
+        """
+        n = len(self._row_symbols)
+        if n == 0:
+            return None
+
+        second = self._last_second
+        cols = (second - self.lookbacks) % self._width
+
+        current = self._last[:n]
+        old = self._matrix[:n, cols].T  # (lookbacks, symbols)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            moves = (current - old) / old
+        moves[~(old > 0) | ~np.isfinite(moves)] = 0.0
+
+        best = np.abs(moves).argmax(axis=0)
+        best_move = moves[best, np.arange(n)]
+
+        mask = np.abs(best_move) >= self.params.momentum_pct
+        mask &= (now_ts - self._last_signal_ts[:n]) >= self.params.cooldown_seconds
+
+        rows = np.flatnonzero(mask)
+        return rows, best_move[rows], self.lookbacks[best[rows]]
+
+    async def run_forever(self):
+        print(
+            f"SignalEngine started (Option 1: pure momentum, mode=vector, "
+            f"lookbacks={self.lookbacks.tolist()}s)."
+        )
+
+        for symbol, state in market_state.items():
+            if state.price is not None:
+                self.on_tick(symbol)
+
+        subscribe(self.on_tick)
+        try:
+            while True:
+                ns = now_ns()
+                now_ts = ns / NS_PER_SECOND
+
+                self._advance(int(now_ts))
+                hits = self._scan(now_ts)
+
+                if hits is not None:
+                    for row, move_pct, lookback in zip(*hits):
+                        symbol = self._row_symbols[row]
+                        self._last_signal_ts[row] = now_ts
+                        await self._emit_signal(
+                            symbol,
+                            ns,
+                            float(self._last[row]),
+                            float(move_pct),
+                            int(lookback),
+                        )
+
+                await asyncio.sleep(1)
+        finally:
+            unsubscribe(self.on_tick)
@@ -0,0 +1,62 @@
+# Async storage API for coroutines.
+#
+# Reads run on the DB worker thread (storage/worker.py) and are awaited, so
+# the event loop never waits on SQLite. Writes only append to the
+# write-behind buffer (storage/writer.py) and never touch SQLite on the
+# calling thread, so they are re-exported unchanged and can also be used
+# from synchronous tick handlers.
+
+from datetime import datetime
+from typing import List, Optional
+
+from storage import queries
+from storage.db import init_db as _init_db
+from storage.models import Signal, Trade, TradeSummary
+from storage.queries import (  # noqa: F401  (non-blocking writes)
+    insert_signal,
+    create_pending_trade,
+    mark_trade_open,
+    update_trade_sl,
+    mark_trade_closed,
+    insert_trade_summary,
+    update_trade_summary,
+)
+from storage.worker import db_worker
+from storage.writer import writer
+
+
+async def init_db():
+    """
+    Start the DB worker, create tables and seed the in-process id counters.
+    """
+    db_worker.start()
+    await db_worker.run(_init_db)
+    await db_worker.run(writer.seed_ids, Signal, Trade, TradeSummary)
+
+
+async def get_signal_by_id(signal_id: int) -> Optional[Signal]:
+    return await db_worker.run(queries.get_signal_by_id, signal_id)
+
+
+async def get_signals_without_trade(
+    since_time: datetime,
+    limit: int = 100,
+    after_id: int = 0,
+) -> List[Signal]:
+    return await db_worker.run(queries.get_signals_without_trade, since_time, limit, after_id)
+
+
+async def get_pending_trades() -> List[Trade]:
+    return await db_worker.run(queries.get_pending_trades)
+
+
+async def get_open_trades() -> List[Trade]:
+    return await db_worker.run(queries.get_open_trades)
+
+
+async def get_closed_trades() -> List[Trade]:
+    return await db_worker.run(queries.get_closed_trades)
+
+
+async def get_trade_summaries() -> List[TradeSummary]:
+    return await db_worker.run(queries.get_trade_summaries)
@@ -1,8 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from config import DATABASE_URL
 from storage.models import Base
+from storage.migrations import run_migrations
 
 
 engine = create_engine(
@@ -11,6 +12,21 @@ engine = create_engine(
 )
 
 
+@event.listens_for(engine, "connect")
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    WAL lets readers run alongside the writer, and synchronous=NORMAL
+    drops the per-commit fsync of the WAL (still crash-safe, may lose
+    the last commits on power loss).
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 SessionLocal = sessionmaker(
     bind=engine,
     autocommit=False,
@@ -20,7 +36,9 @@ SessionLocal = sessionmaker(
 
 def init_db():
     """
-    Create all tables in the database.
+    Create all tables in the database, then upgrade existing databases
+    in place (storage/migrations.py).
     This uses the models defined in storage/models.py
     """
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
@@ -0,0 +1,92 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from config import DEFAULT_STRATEGY_ID
+
+
+# Versioned schema migrations, tracked in SQLite's PRAGMA user_version.
+#
+# create_all() only creates missing tables, so anything that changes an
+# existing table (indexes, constraints, new columns) goes here as a new
+# numbered step. Steps must be idempotent: on a fresh database the tables
+# were just created from storage/models.py and already match.
+
+
+def _m001_unique_trade_per_signal(conn: Connection):
+    # Older databases could hold duplicates from the read-then-write check;
+    # keep the first trade of each signal so the unique index can be built.
+    removed = conn.execute(text(
+        "DELETE FROM trades WHERE id NOT IN "
+        "(SELECT MIN(id) FROM trades GROUP BY signal_id)"
+    )).rowcount
+    if removed:
+        print(f"Migration 1: removed {removed} duplicate trade(s)")
+
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_trades_signal_id ON trades (signal_id)"
+    ))
+
+
+def _m002_hot_path_indexes(conn: Connection):
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_signals_timestamp_signal "
+        "ON signals (timestamp_signal)"
+    ))
+    # Partial indexes: stay as small as the set of active trades
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_trades_pending "
+        "ON trades (entry_time_planned) WHERE entry_time IS NULL"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_trades_open "
+        "ON trades (symbol) WHERE entry_time IS NOT NULL AND exit_time IS NULL"
+    ))
+
+
+def _has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(row[1] == column for row in conn.execute(text(f"PRAGMA table_info({table})")))
+
+
+def _m003_strategy_id(conn: Connection):
+    # Rows from before multi-strategy support belong to the one
+    # momentum strategy that produced them
+    for table in ("signals", "trades"):
+        if not _has_column(conn, table, "strategy_id"):
+            conn.execute(text(
+                f"ALTER TABLE {table} ADD COLUMN strategy_id VARCHAR "
+                f"NOT NULL DEFAULT '{DEFAULT_STRATEGY_ID}'"
+            ))
+
+
+MIGRATIONS = [
+    (1, "unique trades.signal_id", _m001_unique_trade_per_signal),
+    (2, "hot-path indexes", _m002_hot_path_indexes),
+    (3, "strategy_id on signals / trades", _m003_strategy_id),
+]
+
+
+def schema_version(conn: Connection) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar() or 0
+
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Apply every migration newer than the database's user_version, each in
+    its own transaction. Returns the resulting schema version.
+    """
+    with engine.connect() as conn:
+        current = schema_version(conn)
+
+    for version, name, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+
+        with engine.begin() as conn:
+            migrate(conn)
+            # PRAGMA does not take bound parameters
+            conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+        print(f"Migration {version} applied: {name}")
+        current = version
+
+    return current
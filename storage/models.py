@@ -6,9 +6,13 @@ from sqlalchemy import (
     DateTime,
     Boolean,
     ForeignKey,
+    Index,
+    text,
 )
 from sqlalchemy.orm import declarative_base
 
+from config import DEFAULT_STRATEGY_ID
+
 Base = declarative_base()
 
 
@@ -17,8 +21,12 @@ class Signal(Base):
 
     id = Column(Integer, primary_key=True, index=True)
 
+    # signals/strategies.py id of the strategy that produced the signal
+    strategy_id = Column(String, nullable=False, default=DEFAULT_STRATEGY_ID,
+                         server_default=DEFAULT_STRATEGY_ID)
+
     symbol = Column(String, nullable=False)
-    timestamp_signal = Column(DateTime, nullable=False)
+    timestamp_signal = Column(DateTime, nullable=False, index=True)
 
     direction = Column(String, nullable=False)  # LONG / SHORT
     price_at_signal = Column(Float, nullable=False)
@@ -38,6 +46,9 @@ class Signal(Base):
     liquidity_tier = Column(String, nullable=False)  # LOW / HIGH
     cooldown_passed = Column(Boolean, default=True)
 
+    # In-memory only: LatencyTrace of live signals (utils/metrics.py)
+    trace = None
+
 
 class Trade(Base):
     __tablename__ = "trades"
@@ -45,6 +56,8 @@ class Trade(Base):
     id = Column(Integer, primary_key=True, index=True)
 
     signal_id = Column(Integer, ForeignKey("signals.id"), nullable=False)
+    strategy_id = Column(String, nullable=False, default=DEFAULT_STRATEGY_ID,
+                         server_default=DEFAULT_STRATEGY_ID)
 
     symbol = Column(String, nullable=False)
     direction = Column(String, nullable=False)
@@ -69,3 +82,71 @@ class Trade(Base):
     fees_used = Column(Float, nullable=True)
 
     hold_seconds = Column(Integer, nullable=True)
+
+    # In-memory only: the signal's LatencyTrace, for trades created live
+    trace = None
+
+    __table_args__ = (
+        # Exactly one trade per signal, enforced by the database
+        Index("uq_trades_signal_id", "signal_id", unique=True),
+
+        # Partial indexes for the pending / open trade scans.
+        # Existing databases get these from storage/migrations.py.
+        Index(
+            "ix_trades_pending",
+            "entry_time_planned",
+            sqlite_where=text("entry_time IS NULL"),
+        ),
+        Index(
+            "ix_trades_open",
+            "symbol",
+            sqlite_where=text("entry_time IS NOT NULL AND exit_time IS NULL"),
+        ),
+    )
+
+
+class TradeSummary(Base):
+    """
+    Running closed-trade statistics per (dimension, key), kept up to date
+    by analytics/summary.py as trades close:
+    ("all", "all"), ("strategy", id), ("symbol", symbol),
+    ("direction", LONG / SHORT), ("hour", "00".."23" UTC entry hour).
+    """
+
+    __tablename__ = "trade_summaries"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    dimension = Column(String, nullable=False)
+    key = Column(String, nullable=False)
+
+    trades = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    losses = Column(Integer, nullable=False, default=0)
+
+    # pnl_pct_1x aggregates
+    pnl_sum = Column(Float, nullable=False, default=0.0)
+    pnl_sumsq = Column(Float, nullable=False, default=0.0)
+    win_sum = Column(Float, nullable=False, default=0.0)
+    loss_sum = Column(Float, nullable=False, default=0.0)
+    best = Column(Float, nullable=True)
+    worst = Column(Float, nullable=True)
+
+    # Equity = pnl_sum in close order
+    equity_peak = Column(Float, nullable=False, default=0.0)
+    max_drawdown = Column(Float, nullable=False, default=0.0)
+
+    trail_exits = Column(Integer, nullable=False, default=0)
+    time_exits = Column(Integer, nullable=False, default=0)
+    other_exits = Column(Integer, nullable=False, default=0)
+
+    hold_seconds_sum = Column(Integer, nullable=False, default=0)
+
+    # JSON list of counts per ANALYTICS_PNL_BINS bucket
+    pnl_hist = Column(String, nullable=False, default="[]")
+
+    updated_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("uq_trade_summaries_dimension_key", "dimension", "key", unique=True),
+    )
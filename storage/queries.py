@@ -2,27 +2,37 @@ from datetime import datetime
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import exists
 
+from config import DEFAULT_STRATEGY_ID
 from storage.db import SessionLocal
-from storage.models import Signal, Trade
+from storage.models import Signal, Trade, TradeSummary
+from storage.writer import writer
+
+
+# Inserts and updates go through the write-behind writer (storage/writer.py)
+# and are committed in batches. Reads flush pending writes first, so callers
+# always see their own writes.
 
 
 # ---------- SIGNAL QUERIES ----------
 
-def insert_signal(signal_data: dict) -> Signal:
-    session: Session = SessionLocal()
-    try:
-        signal = Signal(**signal_data)
-        session.add(signal)
-        session.commit()
-        session.refresh(signal)
-        return signal
-    finally:
-        session.close()
+def insert_signal(signal_data: dict, trace=None) -> Signal:
+    """
+    Queue a signal insert. The returned Signal already has its id but is
+    not attached to a session. A LatencyTrace is kept on signal.trace and
+    marked "persisted" when the row is committed.
+    """
+    row = dict(signal_data, id=writer.next_id(Signal))
+    row.setdefault("strategy_id", DEFAULT_STRATEGY_ID)
+    writer.insert(Signal, row, trace=trace)
+    signal = Signal(**row)
+    signal.trace = trace
+    return signal
 
 
 def get_signal_by_id(signal_id: int) -> Optional[Signal]:
+    writer.flush()
     session: Session = SessionLocal()
     try:
         return session.query(Signal).filter(Signal.id == signal_id).first()
@@ -33,19 +43,23 @@ def get_signal_by_id(signal_id: int) -> Optional[Signal]:
 def get_signals_without_trade(
     since_time: datetime,
     limit: int = 100,
+    after_id: int = 0,
 ) -> List[Signal]:
     """
     Return signals newer than since_time that do NOT yet have a trade row.
-    This is used by SignalConsumer to create exactly one trade per signal.
+    Used by SignalConsumer to catch up on signals it did not receive
+    in-process (startup, queue overflow).
     """
+    writer.flush()
     session: Session = SessionLocal()
     try:
-        used_signal_ids_sel = select(Trade.signal_id)
+        has_trade = exists().where(Trade.signal_id == Signal.id)
 
         rows = (
             session.query(Signal)
             .filter(Signal.timestamp_signal >= since_time)
-            .filter(~Signal.id.in_(used_signal_ids_sel))
+            .filter(Signal.id > after_id)
+            .filter(~has_trade)
             .order_by(Signal.id.asc())
             .limit(limit)
             .all()
@@ -55,18 +69,6 @@ def get_signals_without_trade(
         session.close()
 
 
-def trade_exists_for_signal(signal_id: int) -> bool:
-    """
-    Safety check to prevent duplicate trades for a signal.
-    Useful across restarts and protects against race conditions.
-    """
-    session: Session = SessionLocal()
-    try:
-        return session.query(Trade).filter(Trade.signal_id == signal_id).first() is not None
-    finally:
-        session.close()
-
-
 # ---------- TRADE QUERIES ----------
 
 def create_pending_trade(
@@ -75,25 +77,28 @@ def create_pending_trade(
     direction: str,
     entry_delay_seconds: int,
     entry_time_planned: datetime,
+    strategy_id: str = DEFAULT_STRATEGY_ID,
 ) -> Trade:
-    session: Session = SessionLocal()
-    try:
-        trade = Trade(
-            signal_id=signal_id,
-            symbol=symbol,
-            direction=direction,
-            entry_delay_seconds=entry_delay_seconds,
-            entry_time_planned=entry_time_planned,
-        )
-        session.add(trade)
-        session.commit()
-        session.refresh(trade)
-        return trade
-    finally:
-        session.close()
+    """
+    Queue a pending trade insert for a signal.
+    A second trade for the same signal is dropped at flush time by the
+    unique index on trades.signal_id.
+    """
+    row = {
+        "id": writer.next_id(Trade),
+        "signal_id": signal_id,
+        "strategy_id": strategy_id,
+        "symbol": symbol,
+        "direction": direction,
+        "entry_delay_seconds": entry_delay_seconds,
+        "entry_time_planned": entry_time_planned,
+    }
+    writer.insert(Trade, row)
+    return Trade(**row)
 
 
 def get_pending_trades() -> List[Trade]:
+    writer.flush()
     session: Session = SessionLocal()
     try:
         return (
@@ -112,38 +117,24 @@ def mark_trade_open(
     tp_price: Optional[float],
     sl_price: float,
 ):
-    session: Session = SessionLocal()
-    try:
-        trade = session.query(Trade).filter(Trade.id == trade_id).first()
-        if trade is None:
-            return
-
-        trade.entry_time = entry_time
-        trade.entry_price = entry_price
-        trade.tp_price = tp_price  # can be None in NO-TP mode
-        trade.sl_price = sl_price
-
-        session.commit()
-    finally:
-        session.close()
+    writer.update(Trade, {
+        "id": trade_id,
+        "entry_time": entry_time,
+        "entry_price": entry_price,
+        "tp_price": tp_price,  # can be None in NO-TP mode
+        "sl_price": sl_price,
+    })
 
 
 def update_trade_sl(trade_id: int, new_sl_price: float):
     """
     Update SL while trade is open (breakeven / trailing).
     """
-    session: Session = SessionLocal()
-    try:
-        trade = session.query(Trade).filter(Trade.id == trade_id).first()
-        if trade is None:
-            return
-        trade.sl_price = new_sl_price
-        session.commit()
-    finally:
-        session.close()
+    writer.update(Trade, {"id": trade_id, "sl_price": new_sl_price})
 
 
 def get_open_trades() -> List[Trade]:
+    writer.flush()
     session: Session = SessionLocal()
     try:
         return (
@@ -167,21 +158,59 @@ def mark_trade_closed(
     fees_used: float,
     hold_seconds: int,
 ):
+    writer.update(Trade, {
+        "id": trade_id,
+        "exit_time": exit_time,
+        "exit_price": exit_price,
+        "exit_reason": exit_reason,
+        "pnl_pct_1x": pnl_pct_1x,
+        "pnl_pct_5x": pnl_pct_5x,
+        "slippage_used": slippage_used,
+        "fees_used": fees_used,
+        "hold_seconds": hold_seconds,
+    })
+
+
+# ---------- TRADE SUMMARY QUERIES ----------
+
+def get_closed_trades() -> List[Trade]:
+    """
+    Every closed trade in close order (summary rebuilds).
+    """
+    writer.flush()
+    session: Session = SessionLocal()
+    try:
+        return (
+            session.query(Trade)
+            .filter(Trade.exit_time.isnot(None))
+            .order_by(Trade.exit_time.asc(), Trade.id.asc())
+            .all()
+        )
+    finally:
+        session.close()
+
+
+def get_trade_summaries() -> List[TradeSummary]:
+    writer.flush()
     session: Session = SessionLocal()
     try:
-        trade = session.query(Trade).filter(Trade.id == trade_id).first()
-        if trade is None:
-            return
-
-        trade.exit_time = exit_time
-        trade.exit_price = exit_price
-        trade.exit_reason = exit_reason
-        trade.pnl_pct_1x = pnl_pct_1x
-        trade.pnl_pct_5x = pnl_pct_5x
-        trade.slippage_used = slippage_used
-        trade.fees_used = fees_used
-        trade.hold_seconds = hold_seconds
-
-        session.commit()
+        return session.query(TradeSummary).all()
     finally:
         session.close()
+
+
+def insert_trade_summary(row: dict) -> int:
+    """
+    Queue a new summary row; returns its id.
+    """
+    row = dict(row, id=writer.next_id(TradeSummary))
+    writer.insert(TradeSummary, row)
+    return row["id"]
+
+
+def update_trade_summary(row: dict):
+    """
+    row must contain "id"; values are absolute, so a dropped write is
+    repaired by the next one.
+    """
+    writer.update(TradeSummary, row)
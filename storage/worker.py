@@ -0,0 +1,153 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import event
+
+from config import DB_STATS_INTERVAL_SECONDS
+from storage.db import engine
+from storage.writer import writer
+
+
+_STOP = object()
+_FLUSH = object()
+
+
+class DBWorker:
+    """
+    Dedicated thread that owns every SQLite connection.
+
+    Coroutines never touch SQLAlchemy directly: reads are submitted here and
+    awaited (see storage/async_queries.py), and the write-behind writer is
+    flushed from this thread on its interval / row threshold. A slow disk
+    or a large commit therefore only delays this thread, never the event
+    loop that reads the websocket.
+
+    Once started, checking out a DB connection on any other thread raises
+    (see _on_checkout), so a stray synchronous DB call from a coroutine
+    fails loudly instead of silently stalling the loop.
+    """
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+        self.jobs = 0
+        self.max_job_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.max_flush_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        writer.on_full = lambda: self._queue.put(_FLUSH)
+        event.listen(engine, "checkout", self._on_checkout)
+        self._thread = threading.Thread(target=self._loop, name="db-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Flush pending writes and stop the thread.
+        """
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        writer.on_full = None
+        event.remove(engine, "checkout", self._on_checkout)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        if self.running and threading.current_thread() is not self._thread:
+            raise RuntimeError(
+                "SQLite accessed outside the DB worker thread; "
+                "use storage.async_queries from coroutines"
+            )
+
+    # ---------- SUBMIT ----------
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        self._queue.put((future, time.perf_counter(), fn, args, kwargs))
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) on the DB thread and await its result.
+        """
+        if not self.running:
+            raise RuntimeError("DB worker is not running")
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    # ---------- THREAD ----------
+
+    def _loop(self):
+        interval = writer.flush_interval
+        next_flush = time.monotonic() + interval
+        next_stats = time.monotonic() + DB_STATS_INTERVAL_SECONDS
+
+        while True:
+            timeout = max(0.0, next_flush - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush()
+                return
+
+            if item is not None and item is not _FLUSH:
+                self._run_job(*item)
+
+            now = time.monotonic()
+            if item is _FLUSH or now >= next_flush:
+                self._flush()
+                next_flush = now + interval
+
+            if DB_STATS_INTERVAL_SECONDS and now >= next_stats:
+                print(self.stats_line())
+                next_stats = now + DB_STATS_INTERVAL_SECONDS
+
+    def _run_job(self, future: Future, submitted: float, fn, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            return
+
+        started = time.perf_counter()
+        self.max_wait_seconds = max(self.max_wait_seconds, started - submitted)
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            self.jobs += 1
+            self.max_job_seconds = max(self.max_job_seconds, time.perf_counter() - started)
+
+    def _flush(self):
+        try:
+            if writer.flush():
+                self.max_flush_seconds = max(self.max_flush_seconds, writer.last_flush_seconds)
+        except Exception as e:
+            print(f"DB writer error: {e}")
+
+    def stats_line(self) -> str:
+        line = (
+            f"DB worker | jobs={self.jobs} | flushes={writer.flush_count} | "
+            f"rows={writer.rows_written} | pending={writer.pending} | "
+            f"max_wait={self.max_wait_seconds*1000:.1f}ms | "
+            f"max_job={self.max_job_seconds*1000:.1f}ms | "
+            f"max_flush={self.max_flush_seconds*1000:.1f}ms"
+        )
+        self.max_wait_seconds = self.max_job_seconds = self.max_flush_seconds = 0.0
+        return line
+
+
+db_worker = DBWorker()
@@ -0,0 +1,299 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from config import DB_DEAD_LETTER_PATH, DB_FLUSH_INTERVAL_MS, DB_FLUSH_MAX_ROWS, DB_WRITE_RETRIES
+from storage.db import SessionLocal
+from utils.metrics import metrics
+
+
+FLUSH_SECONDS = metrics.histogram("db_flush_seconds", "Write-behind group commit duration")
+IGNORED_HELP = "Inserts dropped by INSERT OR IGNORE (duplicate key or other constraint)"
+FAILURES_HELP = "Row writes that failed on their own (retried, then dead-lettered)"
+DEAD_LETTER_HELP = "Rows given up on after retries and written to the dead-letter file"
+
+
+class WriteBehindWriter:
+    """
+    Write-behind buffer for signal / trade inserts and updates.
+
+    Callers enqueue rows and return immediately; the DB worker thread
+    (storage/worker.py) writes them in group commits every
+    DB_FLUSH_INTERVAL_MS or as soon as DB_FLUSH_MAX_ROWS are pending, so
+    commit overhead scales with the number of flushes instead of the
+    number of events.
+
+    Primary keys are allocated in-process (seeded once from MAX(id)), which
+    lets insert callers get their id without waiting for the flush.
+    This assumes this process is the only writer of the database.
+
+    If a group commit fails, its rows are retried one by one. A row that
+    still fails, and any later op on the same row, goes back to the front
+    of the queue for up to `retries` more flushes, then is written to
+    `dead_letter_path` and dropped. Such rows are counted as failed,
+    never as persisted.
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: int = DB_FLUSH_INTERVAL_MS,
+        max_rows: int = DB_FLUSH_MAX_ROWS,
+        retries: int = DB_WRITE_RETRIES,
+        dead_letter_path: str = DB_DEAD_LETTER_PATH,
+    ):
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_rows = max_rows
+        self.retries = retries
+        self.dead_letter_path = Path(dead_letter_path)
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._ops: List[Tuple[str, object, dict]] = []  # (kind, model, row)
+        # (enqueue ns, table, trace, failed attempts) per op
+        self._stamps: List[Tuple[int, str, object, int]] = []
+        self._next_id: Dict[str, int] = {}
+
+        # Called (from the enqueuing thread) when max_rows are pending
+        self.on_full = None
+
+        self.flush_count = 0
+        self.rows_written = 0
+        self.rows_dead_lettered = 0
+        self.last_flush_seconds = 0.0
+
+    # ---------- ENQUEUE ----------
+
+    def seed_ids(self, *models):
+        """
+        Read MAX(id) for each model up front so next_id() never has to
+        query the database from the caller's thread.
+        """
+        for model in models:
+            max_id = self._max_id(model)
+            with self._lock:
+                self._next_id[model.__tablename__] = max_id
+
+    def next_id(self, model) -> int:
+        table = model.__tablename__
+        with self._lock:
+            if table not in self._next_id:
+                self._next_id[table] = self._max_id(model)
+            self._next_id[table] += 1
+            return self._next_id[table]
+
+    @staticmethod
+    def _max_id(model) -> int:
+        session: Session = SessionLocal()
+        try:
+            return session.execute(select(func.max(model.id))).scalar() or 0
+        finally:
+            session.close()
+
+    def insert(self, model, row: dict, trace=None):
+        """
+        trace: LatencyTrace to mark "persisted" once the row is committed.
+        """
+        self._enqueue("insert", model, row, trace)
+
+    def update(self, model, row: dict):
+        """
+        row must contain "id"; the other keys are the columns to set.
+        """
+        row = dict(row)
+        row["_id"] = row.pop("id")
+        self._enqueue("update", model, row)
+
+    def _enqueue(self, kind: str, model, row: dict, trace=None):
+        stamp = (time.time_ns(), model.__tablename__, trace, 0)
+        with self._lock:
+            self._ops.append((kind, model, row))
+            self._stamps.append(stamp)
+            pending = len(self._ops)
+
+        if pending >= self.max_rows and self.on_full is not None:
+            self.on_full()
+
+    @property
+    def pending(self) -> int:
+        return len(self._ops)
+
+    # ---------- FLUSH ----------
+
+    def flush(self) -> int:
+        """
+        Write everything pending in one transaction. Returns rows written.
+        Safe to call from readers that need to see their own writes.
+        """
+        with self._flush_lock:
+            if not self._ops:
+                return 0
+
+            started = time.perf_counter()
+            session: Session = SessionLocal()
+            try:
+                # Check out the connection before taking the rows, so a
+                # failure here leaves them queued.
+                session.connection()
+                with self._lock:
+                    ops, self._ops = self._ops, []
+                    stamps, self._stamps = self._stamps, []
+
+                failed = {}
+                try:
+                    ignored = []
+                    for kind, model, rows in _group(ops):
+                        result = session.execute(_statement(kind, model, rows[0]), rows)
+                        if kind == "insert" and 0 <= result.rowcount < len(rows):
+                            ignored.append((model, len(rows) - result.rowcount))
+                    session.commit()
+                    for model, n in ignored:
+                        _record_ignored(model, n)
+                except Exception as e:
+                    session.rollback()
+                    print(f"DB flush failed ({e}), retrying {len(ops)} rows one by one")
+                    failed = self._flush_one_by_one(session, ops)
+            finally:
+                session.close()
+
+            if failed:
+                self._requeue_or_dead_letter(ops, stamps, failed)
+                stamps = [stamp for i, stamp in enumerate(stamps) if i not in failed]
+
+            written = len(ops) - len(failed)
+            self.flush_count += 1
+            self.rows_written += written
+            self.last_flush_seconds = time.perf_counter() - started
+            FLUSH_SECONDS.record(int(self.last_flush_seconds * 1e9))
+            _record_persisted(stamps)
+            return written
+
+    @staticmethod
+    def _flush_one_by_one(session: Session, ops) -> Dict[int, str]:
+        """
+        Returns {op index: error} for ops that failed, or were held back
+        because an earlier op on the same row failed.
+        """
+        failed = {}
+        failed_rows = set()
+        for i, (kind, model, row) in enumerate(ops):
+            key = (model.__tablename__, row.get("id", row.get("_id")))
+            if key in failed_rows:
+                failed[i] = "earlier write of this row failed"
+                continue
+            try:
+                result = session.execute(_statement(kind, model, row), [row])
+                session.commit()
+                if kind == "insert" and result.rowcount == 0:
+                    _record_ignored(model, 1)
+            except Exception as e:
+                session.rollback()
+                failed[i] = str(e)
+                failed_rows.add(key)
+        return failed
+
+    def _requeue_or_dead_letter(self, ops, stamps, failed: Dict[int, str]):
+        retry_ops, retry_stamps, dead = [], [], []
+        for i, error in failed.items():
+            kind, model, row = ops[i]
+            enqueued, table, trace, failures = stamps[i]
+            failures += 1
+            metrics.counter("db_write_failures_total", FAILURES_HELP, table=table).inc()
+            if failures <= self.retries:
+                retry_ops.append(ops[i])
+                retry_stamps.append((enqueued, table, trace, failures))
+            else:
+                dead.append({"kind": kind, "table": table, "row": row, "error": error})
+                metrics.counter(
+                    "db_writes_dead_lettered_total", DEAD_LETTER_HELP, table=table,
+                ).inc()
+
+        if retry_ops:
+            # In front of anything queued since, so a row's ops stay in order
+            with self._lock:
+                self._ops[:0] = retry_ops
+                self._stamps[:0] = retry_stamps
+            print(f"DB write failed | {len(retry_ops)} row(s) kept for retry")
+        if dead:
+            self.rows_dead_lettered += len(dead)
+            self._dead_letter(dead)
+
+    def _dead_letter(self, entries: List[dict]):
+        try:
+            self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, default=str) + "\n")
+        except OSError as e:
+            print(f"DB dead-letter write failed ({e})")
+        for entry in entries:
+            row_id = entry["row"].get("id", entry["row"].get("_id"))
+            print(
+                f"DB write dead-lettered | {entry['kind']} {entry['table']} id={row_id} | "
+                f"{entry['error'].splitlines()[0]}"
+            )
+
+
+def _record_persisted(stamps):
+    """
+    Enqueue -> commit delay per table, and the "persisted" stage of
+    traced rows (live signals).
+    """
+    now = time.time_ns()
+    delays = {}
+    for enqueued, table, trace, _ in stamps:
+        hist = delays.get(table)
+        if hist is None:
+            hist = delays[table] = metrics.histogram(
+                "db_write_delay_seconds", "Write-behind enqueue to commit", table=table,
+            )
+        hist.record(now - enqueued)
+        if trace is not None:
+            trace.mark("persisted", now)
+
+
+def _record_ignored(model, n: int):
+    table = model.__tablename__
+    metrics.counter("db_inserts_ignored_total", IGNORED_HELP, table=table).inc(n)
+    print(f"DB insert ignored | {table} | {n} row(s) violated a unique index or constraint")
+
+
+def _group(ops):
+    """
+    Merge consecutive ops of the same kind / table / column set so each
+    group becomes a single executemany. Order between groups is preserved
+    (a trade insert always lands before its updates).
+    """
+    groups = []
+    last_key = None
+    for kind, model, row in ops:
+        key = (kind, model, tuple(row))
+        if key != last_key:
+            groups.append((kind, model, []))
+            last_key = key
+        groups[-1][2].append(row)
+    return groups
+
+
+def _statement(kind: str, model, row: dict):
+    table = model.__table__
+    if kind == "insert":
+        # A duplicate trade for a signal is dropped by the unique index
+        # instead of failing the whole batch (and counted, see flush).
+        return insert(table).prefix_with("OR IGNORE", dialect="sqlite")
+
+    # SET clause comes from the remaining keys of each row
+    return update(table).where(table.c.id == bindparam("_id"))
+
+
+writer = WriteBehindWriter()
+
+metrics.observe("db_rows_written_total", "Rows written by the write-behind writer",
+                lambda: writer.rows_written, kind="counter")
+metrics.observe("db_flushes_total", "Write-behind group commits",
+                lambda: writer.flush_count, kind="counter")
+metrics.observe("db_rows_pending", "Rows waiting for the next flush", lambda: writer.pending)
@@ -0,0 +1,95 @@
+from utils.env import load_dotenv
+load_dotenv()
+import argparse
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from backtest.sweep import expand_grid, parse_grid_arg, results_engine, run_sweep, sweep_results
+from config import SYMBOLS, TICK_RECORDER_DIR
+from data_feed.tick_recorder import TickReader
+
+
+DEFAULT_SWEEP_DB = "sqlite:///./runtime/sweep.db"
+
+
+def _parse_time(value: str) -> datetime:
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Evaluate a grid of strategy parameters over recorded ticks "
+                    "on a process pool; one row per run in sweep_results."
+    )
+    parser.add_argument("--start", required=True, help="UTC start, e.g. 2026-01-15 or 2026-01-15T08:00")
+    parser.add_argument("--end", required=True, help="UTC end (exclusive)")
+    parser.add_argument("--symbols", default="", help="Comma-separated symbols (default: config.SYMBOLS)")
+    parser.add_argument("--ticks-dir", default=None, help="Tick recorder directory (default: TICK_RECORDER_DIR)")
+    parser.add_argument(
+        "--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+        help="Values for one parameter, e.g. momentum_pct=0.005,0.01 (repeatable)",
+    )
+    parser.add_argument("--grid-file", default=None, help='JSON file: {"momentum_pct": [0.005, 0.01], ...}')
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--db", default=DEFAULT_SWEEP_DB, help=f"Results database URL (default: {DEFAULT_SWEEP_DB})")
+    parser.add_argument("--top", type=int, default=10, help="Print the N best runs by pnl_1x_sum")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    grid = {}
+    if args.grid_file:
+        with open(args.grid_file, encoding="utf-8") as f:
+            for name, values in json.load(f).items():
+                grid.update(parse_grid_arg(f"{name}={','.join(str(v) for v in values)}"))
+    for item in args.grid:
+        grid.update(parse_grid_arg(item))
+
+    runs = expand_grid(grid)
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()] or SYMBOLS
+    start, end = _parse_time(args.start), _parse_time(args.end)
+    ticks = TickReader(args.ticks_dir or TICK_RECORDER_DIR).read(
+        int(start.timestamp() * 1000), int(end.timestamp() * 1000), symbols
+    )
+    if not len(ticks["event_ms"]):
+        print(f"Sweep | no ticks between {args.start} and {args.end}")
+        return
+
+    sweep_id = run_sweep(
+        ticks,
+        runs,
+        args.db,
+        workers=args.workers,
+        data_start=start.replace(tzinfo=None),
+        data_end=end.replace(tzinfo=None),
+    )
+
+    engine = results_engine(args.db)
+    with engine.connect() as conn:
+        best = conn.execute(
+            select(sweep_results)
+            .where(sweep_results.c.sweep_id == sweep_id)
+            .order_by(sweep_results.c.pnl_1x_sum.desc())
+            .limit(args.top)
+        ).mappings().all()
+
+    print(f"Top {len(best)} of sweep {sweep_id}:")
+    for row in best:
+        params = " ".join(f"{name}={row[name]}" for name in grid)
+        print(
+            f"  pnl_1x_sum={row['pnl_1x_sum']*100:.2f}% | trades={row['trades_closed']} | "
+            f"win_rate={(row['win_rate'] or 0)*100:.1f}% | "
+            f"max_dd={row['max_drawdown_1x']*100:.2f}% | {params}"
+        )
+
+
+if __name__ == "__main__":
+    main()
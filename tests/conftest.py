@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# config / storage read these at import time: point them at a throwaway
+# database and keep Telegram quiet before any test module imports them
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["TELEGRAM_ENABLED"] = "false"
@@ -0,0 +1,71 @@
+from utils import clock
+from utils.clock import NS_PER_MS, ExchangeClock, LiveClock, SimClock
+
+
+class FakeTime:
+    def __init__(self, wall_ns: int, mono_ns: int = 1_000):
+        self.wall_ns = wall_ns
+        self.mono_ns = mono_ns
+
+    def time_ns(self) -> int:
+        return self.wall_ns
+
+    def monotonic_ns(self) -> int:
+        return self.mono_ns
+
+    def advance(self, ns: int):
+        self.wall_ns += ns
+        self.mono_ns += ns
+
+
+WALL = 1_767_225_600 * 10**9
+
+
+def test_live_clock_ignores_wall_clock_steps(monkeypatch):
+    fake = FakeTime(WALL)
+    monkeypatch.setattr(clock, "time", fake)
+    live = LiveClock()
+
+    assert live.now_ns() == WALL
+    fake.advance(500)
+    fake.wall_ns -= 3_600 * 10**9  # NTP step back
+    assert live.now_ns() == WALL + 500
+
+
+def test_exchange_clock_never_goes_back(monkeypatch):
+    fake = FakeTime(WALL)
+    monkeypatch.setattr(clock, "time", fake)
+    exchange = ExchangeClock()
+
+    # Live fallback until the first event
+    fake.advance(2_000 * NS_PER_MS)
+    fallback = exchange.now_ns()
+    assert fallback == WALL + 2_000 * NS_PER_MS
+
+    # First event is behind the live clock: hold until it catches up
+    exchange.observe(WALL // NS_PER_MS)
+    assert exchange.now_ns() == fallback
+    fake.advance(1_000 * NS_PER_MS)
+    assert exchange.now_ns() == fallback
+    fake.advance(1_500 * NS_PER_MS)
+    assert exchange.now_ns() == WALL + 2_500 * NS_PER_MS
+
+    # Older events are ignored, newer ones move the clock forward
+    exchange.observe(WALL // NS_PER_MS - 10_000)
+    assert exchange.now_ns() == WALL + 2_500 * NS_PER_MS
+    exchange.observe(WALL // NS_PER_MS + 5_000)
+    assert exchange.now_ns() == WALL + 5_000 * NS_PER_MS
+
+    seen = []
+    for step in (0, 3, 0, 7):
+        fake.advance(step)
+        seen.append(exchange.now_ns())
+    assert seen == sorted(seen)
+
+
+def test_sim_clock_only_moves_forward():
+    sim = SimClock(100)
+    sim.set(50)
+    assert sim.now_ns() == 100
+    sim.set(150)
+    assert sim.now_ns() == 150
@@ -0,0 +1,144 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from data_feed.market_state import MarketSymbolState, market_state
+from signals.params import StrategyParams
+from storage.models import Trade
+from trades.exit_engine import ExitEngine
+from trades.trade_book import TradeBook
+from utils.clock import NS_PER_SECOND, from_datetime, to_datetime
+
+
+SYMBOL = "EXITTESTUSDT"
+ACTIVATION = 0.004
+DISTANCE = 0.002
+TIME_STOP = 120
+
+
+def reference_exits(trades, ticks):
+    """
+    The per-tick rules of the original trade_simulator loop: raise the
+    peak, arm once PnL reaches the activation, exit TRAIL past the trailing
+    distance from the peak, and TIME once the hold reaches the time stop
+    (at the deadline, with the last price seen).
+    """
+    state = {t.id: {"armed": False, "peak": t.entry_price} for t in trades}
+    entry_ns = {t.id: from_datetime(t.entry_time) for t in trades}
+    exits = {}
+    last_price = None
+
+    for now, price in ticks:
+        for t in trades:
+            if t.id not in exits and entry_ns[t.id] + TIME_STOP * NS_PER_SECOND <= now:
+                exits[t.id] = ("TIME", last_price, now)
+
+        for t in trades:
+            if t.id in exits or entry_ns[t.id] > now:
+                continue
+            trail = state[t.id]
+            if t.direction == "LONG":
+                trail["peak"] = max(trail["peak"], price)
+                pnl = (price - t.entry_price) / t.entry_price
+            else:
+                trail["peak"] = min(trail["peak"], price)
+                pnl = (t.entry_price - price) / t.entry_price
+
+            if not trail["armed"] and pnl >= ACTIVATION:
+                trail["armed"] = True
+
+            if trail["armed"]:
+                if t.direction == "LONG" and price <= trail["peak"] * (1 - DISTANCE):
+                    exits[t.id] = ("TRAIL", price, now)
+                elif t.direction == "SHORT" and price >= trail["peak"] * (1 + DISTANCE):
+                    exits[t.id] = ("TRAIL", price, now)
+        last_price = price
+
+    return exits
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_matches_per_tick_reference(seed, monkeypatch):
+    rng = random.Random(seed)
+    state = MarketSymbolState()
+    monkeypatch.setitem(market_state, SYMBOL, state)
+
+    start = 1_767_225_600 * NS_PER_SECOND
+    ticks = []
+    now, price = start, 100.0
+    for _ in range(2000):
+        now += rng.randint(1, 400) * 1_000_000
+        price *= 1 + rng.gauss(0, 0.0007)
+        ticks.append((now, price))
+
+    # Trades open on a random tick, at that tick's price
+    entries = {}
+    for trade_id in range(1, 101):
+        i = rng.randrange(len(ticks) // 2)
+        entries.setdefault(i, []).append(Trade(
+            id=trade_id, signal_id=trade_id, symbol=SYMBOL,
+            direction=rng.choice(["LONG", "SHORT"]),
+            entry_delay_seconds=0, entry_time_planned=to_datetime(ticks[i][0]),
+        ))
+
+    book = TradeBook(persist=False)
+    engine = ExitEngine(book, StrategyParams.from_config(
+        trailing_activation_pct=ACTIVATION,
+        trailing_distance_pct=DISTANCE,
+        time_stop_seconds=TIME_STOP,
+    ))
+    trades = []
+    for i, (now, price) in enumerate(ticks):
+        engine.check_time_stops(now)
+        state.price = price
+        for trade in entries.get(i, []):
+            book.add_pending(trade)
+            book.open_trade(trade, entry_time=to_datetime(now), entry_price=price)
+            engine.add_trade(trade)
+            trades.append(trade)
+        engine.on_price(SYMBOL, price, now)
+
+    expected = reference_exits(trades, ticks)
+    assert len(expected) > 60
+    assert {reason for reason, _, _ in expected.values()} == {"TIME", "TRAIL"}
+
+    for trade in trades:
+        if trade.id not in expected:
+            assert trade.id in book.open
+            continue
+        reason, exit_price, exit_ns = expected[trade.id]
+        assert trade.id not in book.open
+        assert (trade.exit_reason, trade.exit_price, trade.exit_time) == (
+            reason, exit_price, to_datetime(exit_ns),
+        ), trade.id
+        assert trade.hold_seconds == (exit_ns - from_datetime(trade.entry_time)) // NS_PER_SECOND
+
+    assert engine.trail.keys() == book.open.keys()
+
+
+def test_time_stop_waits_for_a_price(monkeypatch):
+    state = MarketSymbolState()
+    monkeypatch.setitem(market_state, SYMBOL, state)
+
+    book = TradeBook(persist=False)
+    engine = ExitEngine(book, StrategyParams.from_config(time_stop_seconds=TIME_STOP))
+    entry = 1_767_225_600 * NS_PER_SECOND
+    trade = Trade(id=1, signal_id=1, symbol=SYMBOL, direction="LONG",
+                  entry_delay_seconds=0, entry_time_planned=to_datetime(entry))
+    book.add_pending(trade)
+    book.open_trade(trade, entry_time=to_datetime(entry), entry_price=100.0)
+    engine.add_trade(trade)
+
+    deadline = entry + TIME_STOP * NS_PER_SECOND
+    assert engine.next_deadline() == deadline
+
+    engine.check_time_stops(deadline)
+    assert trade.id in book.open
+    assert engine.next_deadline() == deadline + NS_PER_SECOND
+
+    state.price = 99.0
+    engine.check_time_stops(deadline + NS_PER_SECOND)
+    assert trade.exit_reason == "TIME"
+    assert trade.exit_time == to_datetime(deadline) + timedelta(seconds=1)
+    assert engine.next_deadline() is None
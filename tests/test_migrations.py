@@ -0,0 +1,92 @@
+from sqlalchemy import create_engine, text
+
+from storage.migrations import MIGRATIONS, run_migrations, schema_version
+from storage.models import Base
+
+
+LATEST = MIGRATIONS[-1][0]
+
+
+def legacy_engine(tmp_path):
+    """
+    Schema from before the migrations: no unique index on
+    trades.signal_id, no strategy_id columns, and a duplicated trade.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}", future=True)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE signals (id INTEGER PRIMARY KEY, symbol VARCHAR NOT NULL, "
+            "timestamp_signal DATETIME NOT NULL)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE trades (id INTEGER PRIMARY KEY, signal_id INTEGER NOT NULL, "
+            "symbol VARCHAR NOT NULL, entry_time_planned DATETIME, entry_time DATETIME, "
+            "exit_time DATETIME)"
+        ))
+        conn.execute(text(
+            "INSERT INTO signals VALUES (1, 'BTCUSDT', '2026-01-01 00:00:00'), "
+            "(2, 'ETHUSDT', '2026-01-01 00:00:01')"
+        ))
+        conn.execute(text(
+            "INSERT INTO trades (id, signal_id, symbol) VALUES "
+            "(1, 1, 'BTCUSDT'), (2, 1, 'BTCUSDT'), (3, 2, 'ETHUSDT')"
+        ))
+    return engine
+
+
+def index_names(conn):
+    return {row[1] for row in conn.execute(text("SELECT type, name FROM sqlite_master WHERE type = 'index'"))}
+
+
+def test_legacy_database_is_upgraded_and_deduplicated(tmp_path):
+    engine = legacy_engine(tmp_path)
+    assert run_migrations(engine) == LATEST
+
+    with engine.connect() as conn:
+        assert schema_version(conn) == LATEST
+        assert conn.execute(text("SELECT id, signal_id FROM trades ORDER BY id")).all() == [(1, 1), (3, 2)]
+        assert {"uq_trades_signal_id", "ix_signals_timestamp_signal",
+                "ix_trades_pending", "ix_trades_open"} <= index_names(conn)
+        assert conn.execute(text("SELECT DISTINCT strategy_id FROM trades")).scalars().all() == ["momentum"]
+    engine.dispose()
+
+
+def test_migrations_are_idempotent(tmp_path):
+    engine = legacy_engine(tmp_path)
+    run_migrations(engine)
+    with engine.connect() as conn:
+        before = conn.execute(text("SELECT * FROM trades ORDER BY id")).all()
+        indexes = index_names(conn)
+
+    # Already current: nothing runs
+    assert run_migrations(engine) == LATEST
+
+    # Every step re-applied on an upgraded schema is a no-op
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA user_version = 0"))
+    assert run_migrations(engine) == LATEST
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT * FROM trades ORDER BY id")).all() == before
+        assert index_names(conn) == indexes
+    engine.dispose()
+
+
+def test_fresh_database_from_models_migrates_cleanly(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    assert run_migrations(engine) == LATEST
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO signals (id, symbol, timestamp_signal, direction, price_at_signal, move_pct, "
+            "volume_1m, volume_10m_avg, volume_ratio, ema_side, liquidity_tier) "
+            "VALUES (1, 'BTCUSDT', '2026-01-01', 'LONG', 1, 0.01, 0, 0, 0, 'above', 'HIGH')"
+        ))
+        insert = text(
+            "INSERT OR IGNORE INTO trades (signal_id, symbol, direction, entry_delay_seconds, "
+            "entry_time_planned) VALUES (1, 'BTCUSDT', 'LONG', 5, '2026-01-01')"
+        )
+        assert conn.execute(insert).rowcount == 1
+        assert conn.execute(insert).rowcount == 0
+    engine.dispose()
@@ -0,0 +1,91 @@
+import random
+
+import data_feed.price_history as price_history
+from data_feed.price_history import PriceHistory
+from utils.clock import NS_PER_SECOND
+
+
+def brute_min_max(history: PriceHistory, start_ts: int, end_ts: int):
+    window = [
+        p for t, p in zip(history._ts[history._head:], history._px[history._head:])
+        if start_ts <= t <= end_ts
+    ]
+    return (min(window), max(window)) if window else None
+
+
+def make_history(n: int, window_seconds: float = 1e6) -> PriceHistory:
+    history = PriceHistory(window_seconds)
+    for i in range(n):
+        history.append(i * NS_PER_SECOND, float((i * 37) % 101))
+    return history
+
+
+def test_eviction_keeps_anchor_at_window_start():
+    history = PriceHistory(10)
+    for i in range(30):
+        history.append(i * NS_PER_SECOND, float(i))
+
+    assert len(history) == 11
+    assert history.price_at_or_before(19 * NS_PER_SECOND) == 19.0
+    assert history.price_at_or_before(18 * NS_PER_SECOND) is None
+    assert history.last() == (29 * NS_PER_SECOND, 29.0)
+
+
+def test_out_of_order_tick_is_clamped():
+    history = PriceHistory(10)
+    history.append(5 * NS_PER_SECOND, 1.0)
+    history.append(4 * NS_PER_SECOND, 2.0)
+    assert history.last() == (5 * NS_PER_SECOND, 2.0)
+
+
+def test_backfill_inserts_only_between_live_ticks():
+    history = PriceHistory(100)
+    history.append(10 * NS_PER_SECOND, 1.0)
+    history.append(20 * NS_PER_SECOND, 2.0)
+
+    ts = [s * NS_PER_SECOND for s in (5, 10, 12, 15)]
+    assert history.backfill(ts, [9.0, 9.0, 3.0, 4.0]) == 2
+    assert list(history._ts) == [s * NS_PER_SECOND for s in (10, 12, 15, 20)]
+    assert history.price_at_or_before(16 * NS_PER_SECOND) == 4.0
+
+
+def test_min_max_boundaries():
+    history = make_history(300)
+    ts = 100 * NS_PER_SECOND
+    price = history.price_at_or_before(ts)
+
+    assert history.min_max(ts, ts) == (price, price)
+    assert history.min_max(ts, 200 * NS_PER_SECOND) == brute_min_max(history, ts, 200 * NS_PER_SECOND)
+    assert history.min_max(0, ts) == brute_min_max(history, 0, ts)
+    assert history.min_max(ts + 1, ts + NS_PER_SECOND - 1) is None
+    assert history.min_max(ts, ts - 1) is None
+    assert history.min_max(1000 * NS_PER_SECOND, 2000 * NS_PER_SECOND) is None
+
+
+def test_min_max_after_eviction_ignores_evicted_ticks():
+    history = PriceHistory(50)
+    for i in range(200):
+        history.append(i * NS_PER_SECOND, 1000.0 if i < 100 else float(i))
+
+    # The range reaches back past _head: only live ticks count
+    assert history._head > 0
+    assert history.min_max(0, 199 * NS_PER_SECOND) == (149.0, 199.0)
+
+
+def test_min_max_matches_brute_force(monkeypatch):
+    # Small compaction threshold so compaction (and its rebuild) happens
+    monkeypatch.setattr(price_history, "_COMPACT_MIN", 200)
+    rng = random.Random(7)
+    history = PriceHistory(600)
+    now = 0
+    for step in range(5000):
+        now += rng.randrange(1, 400_000_000)
+        history.append(now, rng.uniform(90, 110))
+        if step % 500 == 250:
+            gap_ts = sorted(rng.randrange(now - 60 * NS_PER_SECOND, now) for _ in range(50))
+            history.backfill(gap_ts, [rng.uniform(80, 120) for _ in gap_ts])
+        if step % 50 == 0:
+            for _ in range(20):
+                a = rng.randrange(now - 700 * NS_PER_SECOND, now + NS_PER_SECOND)
+                b = a + rng.randrange(0, 700 * NS_PER_SECOND)
+                assert history.min_max(a, b) == brute_min_max(history, a, b)
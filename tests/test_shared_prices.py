@@ -0,0 +1,145 @@
+import multiprocessing
+import time
+
+import pytest
+
+from data_feed import market_state as ms
+from data_feed.shared_prices import (
+    CONFLATED, H_VERSION, SEQ, SharedPriceReader, SharedPriceTable, SharedPriceWriter,
+)
+
+
+@pytest.fixture
+def table():
+    table = SharedPriceTable.create(8)
+    yield table
+    table.close()
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    monkeypatch.setattr(ms, "market_state", {})
+    monkeypatch.setattr(ms, "_tick_listeners", [])
+    calls = []
+    ms.subscribe(calls.append)
+    return calls
+
+
+def test_round_trip(table, calls):
+    writer = SharedPriceWriter(table)
+    reader = SharedPriceReader(table)
+    try:
+        writer.update_price("BTCUSDT", 100.0, 2.0, 1, event_ms=1_000)
+        writer.update_price("ETHUSDT", 10.0, 1.0, -1, event_ms=1_001)
+        assert reader.poll() == 2
+        assert reader.poll() == 0
+        assert calls == ["BTCUSDT", "ETHUSDT"]
+
+        btc = ms.market_state["BTCUSDT"]
+        assert (btc.price, btc.event_ms) == (100.0, 1_000)
+        # Volume from before the reader's first look is not a tick's volume
+        assert btc.indicators.cvd == 0.0
+
+        writer.update_price("BTCUSDT", 101.0, 3.0, 1, event_ms=1_002)
+        assert reader.poll() == 1
+        assert (btc.price, btc.event_ms) == (101.0, 1_002)
+        assert btc.indicators.cvd == 3.0
+        assert btc.indicators.volume_short.sum == 3.0
+    finally:
+        writer.close()
+        del reader
+
+
+def test_conflated_slot_is_one_update(table, calls):
+    writer = SharedPriceWriter(table)
+    reader = SharedPriceReader(table)
+    try:
+        writer.update_price("BTCUSDT", 100.0, event_ms=1_000)
+        reader.poll()
+        calls.clear()
+        conflated = CONFLATED.value
+
+        writer.update_price("BTCUSDT", 101.0, 5.0, 1, event_ms=1_001)
+        writer.update_price("BTCUSDT", 102.0, 6.0, -1, event_ms=1_002)
+        writer.update_price("BTCUSDT", 103.0, 4.0, 0, event_ms=1_003)
+        assert reader.poll() == 1
+
+        assert calls == ["BTCUSDT"]
+        assert CONFLATED.value == conflated + 2
+        btc = ms.market_state["BTCUSDT"]
+        assert (btc.price, btc.event_ms) == (103.0, 1_003)
+        assert btc.indicators.cvd == -1.0
+        assert btc.indicators.volume_short.sum == 15.0
+        assert len(btc.price_history) == 2
+    finally:
+        writer.close()
+        del reader
+
+
+def test_torn_slot_is_retried(table, calls):
+    writer = SharedPriceWriter(table)
+    reader = SharedPriceReader(table)
+    try:
+        writer.update_price("BTCUSDT", 100.0, event_ms=1_000)
+        reader.poll()
+
+        # A write in progress: odd seq, new price already visible
+        seq = table.slots_word_offset + SEQ
+        writer._q[seq] += 1
+        writer._d[seq + 1] = 999.0
+        writer._q[H_VERSION] += 1
+        assert reader.poll() == 0
+        assert ms.market_state["BTCUSDT"].price == 100.0
+
+        writer._q[seq] += 1
+        assert reader.poll() == 1
+        assert ms.market_state["BTCUSDT"].price == 999.0
+    finally:
+        writer.close()
+        del reader
+
+
+def _write_ticks(name: str, n: int):
+    table = SharedPriceTable.attach(name)
+    writer = SharedPriceWriter(table)
+    for i in range(1, n + 1):
+        # price == event_ms, so a torn read shows up as a mismatch
+        writer.update_price("BTCUSDT", float(i), 1.0, 1 if i % 2 else -1, event_ms=i)
+    writer.close()
+    table.close()
+
+
+def test_concurrent_writer_is_never_torn(table, calls):
+    n = 50_000
+    state = {}
+
+    def check(symbol):
+        s = ms.market_state[symbol]
+        assert s.price == float(s.event_ms)
+        state.setdefault("first", s.event_ms)
+        state["last"] = s.event_ms
+
+    ms.subscribe(check)
+    reader = SharedPriceReader(table)
+    proc = multiprocessing.get_context("spawn").Process(target=_write_ticks, args=(table.name, n))
+    proc.start()
+    try:
+        deadline = time.monotonic() + 30
+        while state.get("last") != n and time.monotonic() < deadline:
+            reader.poll()
+        proc.join(10)
+        reader.poll()
+    finally:
+        del reader
+        if proc.is_alive():
+            proc.kill()
+
+    assert proc.exitcode == 0
+    assert state["last"] == n
+    # Every unit of volume after the first update seen arrives, however
+    # many updates were conflated (odd ticks buy, even ticks sell)
+    first = state["first"]
+    later = range(first + 1, n + 1)
+    indicators = ms.market_state["BTCUSDT"].indicators
+    assert indicators.volume_short.sum == len(later)
+    assert indicators.cvd == sum(1 if i % 2 else -1 for i in later)
@@ -0,0 +1,130 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, text
+
+from storage.db import SessionLocal, engine, init_db
+from storage.models import Signal, Trade
+from storage.writer import WriteBehindWriter
+from utils.metrics import metrics
+
+
+@pytest.fixture(scope="module", autouse=True)
+def database():
+    init_db()
+
+
+@pytest.fixture
+def writer(tmp_path):
+    return WriteBehindWriter(retries=2, dead_letter_path=str(tmp_path / "dead.jsonl"))
+
+
+def counter(name, table):
+    return metrics.counter(name, "", table=table).value
+
+
+def add_signal(writer) -> int:
+    signal_id = writer.next_id(Signal)
+    writer.insert(Signal, dict(
+        id=signal_id, symbol="BTCUSDT", timestamp_signal=datetime(2026, 1, 1),
+        direction="LONG", price_at_signal=100.0, move_pct=0.01, volume_1m=0.0,
+        volume_10m_avg=0.0, volume_ratio=0.0, ema_side="above", liquidity_tier="HIGH",
+    ))
+    return signal_id
+
+
+def add_trade(writer, signal_id) -> int:
+    trade_id = writer.next_id(Trade)
+    writer.insert(Trade, dict(
+        id=trade_id, signal_id=signal_id, symbol="BTCUSDT", direction="LONG",
+        entry_delay_seconds=5, entry_time_planned=datetime(2026, 1, 1),
+    ))
+    return trade_id
+
+
+def trade_ids(signal_id):
+    with SessionLocal() as session:
+        return session.execute(select(Trade.id).where(Trade.signal_id == signal_id)).scalars().all()
+
+
+def test_duplicate_trade_is_ignored_and_counted(writer):
+    signal_id = add_signal(writer)
+    first = add_trade(writer, signal_id)
+    add_trade(writer, signal_id)
+    ignored = counter("db_inserts_ignored_total", "trades")
+
+    assert writer.flush() == 3
+    assert trade_ids(signal_id) == [first]
+    assert counter("db_inserts_ignored_total", "trades") == ignored + 1
+
+
+def test_failing_row_is_retried_then_dead_lettered(writer):
+    signal_id = add_signal(writer)
+    trade_id = add_trade(writer, signal_id)
+    writer.flush()
+    written = writer.rows_written
+    failures = counter("db_write_failures_total", "trades")
+    dead = counter("db_writes_dead_lettered_total", "trades")
+
+    # NOT NULL violation, and a later op on the same row held back behind it
+    writer.update(Trade, {"id": trade_id, "symbol": None})
+    writer.update(Trade, {"id": trade_id, "entry_price": 101.0})
+    other_signal = add_signal(writer)
+
+    assert writer.flush() == 1
+    for _ in range(writer.retries):
+        assert writer.pending == 2
+        assert writer.flush() == 0
+    assert writer.pending == 0
+
+    assert writer.rows_written == written + 1
+    assert writer.rows_dead_lettered == 2
+    assert counter("db_write_failures_total", "trades") == failures + 2 * (writer.retries + 1)
+    assert counter("db_writes_dead_lettered_total", "trades") == dead + 2
+
+    entries = [json.loads(line) for line in writer.dead_letter_path.read_text().splitlines()]
+    assert [(e["kind"], e["table"], e["row"]["_id"]) for e in entries] == [
+        ("update", "trades", trade_id), ("update", "trades", trade_id),
+    ]
+    assert "NOT NULL" in entries[0]["error"]
+    assert entries[1]["error"] == "earlier write of this row failed"
+
+    with SessionLocal() as session:
+        trade = session.get(Trade, trade_id)
+        assert trade.symbol == "BTCUSDT"
+        assert trade.entry_price is None
+        assert session.get(Signal, other_signal) is not None
+
+
+def test_transient_failure_succeeds_on_retry(writer):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS fail_updates (x INTEGER)"))
+        conn.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS fail_trade_updates BEFORE UPDATE ON trades "
+            "WHEN EXISTS (SELECT 1 FROM fail_updates) "
+            "BEGIN SELECT RAISE(ABORT, 'simulated failure'); END"
+        ))
+        conn.execute(text("INSERT INTO fail_updates VALUES (1)"))
+    try:
+        signal_id = add_signal(writer)
+        trade_id = add_trade(writer, signal_id)
+        writer.flush()
+
+        writer.update(Trade, {"id": trade_id, "entry_price": 101.0})
+        assert writer.flush() == 0
+        assert writer.pending == 1
+
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM fail_updates"))
+        assert writer.flush() == 1
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TRIGGER IF EXISTS fail_trade_updates"))
+            conn.execute(text("DROP TABLE IF EXISTS fail_updates"))
+
+    assert writer.pending == 0
+    assert writer.rows_dead_lettered == 0
+    assert not writer.dead_letter_path.exists()
+    with SessionLocal() as session:
+        assert session.get(Trade, trade_id).entry_price == 101.0
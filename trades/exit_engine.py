@@ -0,0 +1,308 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Tuple
+
+from config import DEFAULT_STRATEGY_ID
+from data_feed.market_state import market_state
+from signals.params import StrategyParams
+from signals.strategies import registry
+from storage.models import Trade
+from trades.trade_book import TradeBook, trade_book
+from utils.clock import NS_PER_SECOND, from_datetime, now_ns, to_datetime
+
+
+_INF = float("inf")
+
+
+def _pnl(trade: Trade, price: float) -> float:
+    if trade.direction == "LONG":
+        return (price - trade.entry_price) / trade.entry_price
+    return (trade.entry_price - price) / trade.entry_price
+
+
+class _SymbolTriggers:
+    """
+    Open trades of one symbol, each kept in exactly one list sorted by the
+    price at which it next needs attention:
+
+    long_arm   (entry * (1 + activation), id)  arms when price >= key
+    long_stop  (peak * (1 - distance), id)     exits when price <= key
+    short_arm  (entry * (1 - activation), id)  arms when price <= key
+    short_stop (peak * (1 + distance), id)     exits when price >= key
+
+    A tick only touches the prefix / suffix of each list that it crossed.
+    """
+
+    __slots__ = ("long_arm", "long_stop", "short_arm", "short_stop")
+
+    def __init__(self):
+        self.long_arm: List[Tuple[float, int]] = []
+        self.long_stop: List[Tuple[float, int]] = []
+        self.short_arm: List[Tuple[float, int]] = []
+        self.short_stop: List[Tuple[float, int]] = []
+
+    def __len__(self):
+        return len(self.long_arm) + len(self.long_stop) + len(self.short_arm) + len(self.short_stop)
+
+
+class ExitEngine:
+    """
+    Tick-driven trailing-stop / time-stop exits.
+
+    Every price update of a symbol (market_state listener) is checked
+    against that symbol's trigger lists, so intra-second moves through a
+    stop are no longer missed and only trades whose trigger was crossed are
+    touched. Time stops sit on a heap of deadlines and are fired by
+    trade_simulator_loop's timer.
+
+    Same rules as the original per-second loop: the trail arms once PnL
+    reaches trailing_activation_pct, then exits trailing_distance_pct away
+    from the best price since entry (TRAIL); any trade still open after
+    time_stop_seconds is closed (TIME).
+
+    Times are epoch ns from the active clock; exit_time is converted to
+    a datetime only when a trade closes.
+    """
+
+    def __init__(self, book: TradeBook = trade_book, params: StrategyParams | None = None):
+        params = params or StrategyParams.from_config()
+        self.book = book
+        self.activation_pct = params.trailing_activation_pct
+        self.distance_pct = params.trailing_distance_pct
+        self.time_stop = int(params.time_stop_seconds * NS_PER_SECOND)
+
+        self.trail: Dict[int, dict] = {}  # trade_id -> {"armed", "peak_price"}
+
+        self._symbols: Dict[str, _SymbolTriggers] = {}
+        self._where: Dict[int, Tuple[list, float]] = {}  # trade_id -> (list, key)
+        self._deadlines: List[Tuple[int, int]] = []  # (epoch ns, trade_id)
+
+    # ---------- REGISTRATION ----------
+
+    def add_trade(self, trade: Trade, armed: bool = False, peak_price: float | None = None):
+        if peak_price is None:
+            peak_price = trade.entry_price
+
+        self.trail[trade.id] = {"armed": armed, "peak_price": peak_price}
+
+        triggers = self._symbols.get(trade.symbol)
+        if triggers is None:
+            triggers = self._symbols[trade.symbol] = _SymbolTriggers()
+
+        if trade.direction == "LONG":
+            if armed:
+                self._insert(trade.id, triggers.long_stop, peak_price * (1 - self.distance_pct))
+            else:
+                self._insert(trade.id, triggers.long_arm, trade.entry_price * (1 + self.activation_pct))
+        else:
+            if armed:
+                self._insert(trade.id, triggers.short_stop, peak_price * (1 + self.distance_pct))
+            else:
+                self._insert(trade.id, triggers.short_arm, trade.entry_price * (1 - self.activation_pct))
+
+        heapq.heappush(self._deadlines, (from_datetime(trade.entry_time) + self.time_stop, trade.id))
+
+    def _insert(self, trade_id: int, lst: list, key: float):
+        entry = (key, trade_id)
+        lst.insert(bisect_left(lst, entry), entry)
+        self._where[trade_id] = (lst, key)
+
+    def _remove(self, trade: Trade):
+        where = self._where.pop(trade.id, None)
+        if where is not None:
+            lst, key = where
+            i = bisect_left(lst, (key, trade.id))
+            if i < len(lst) and lst[i][1] == trade.id:
+                del lst[i]
+
+        triggers = self._symbols.get(trade.symbol)
+        if triggers is not None and not len(triggers):
+            del self._symbols[trade.symbol]
+
+        self.trail.pop(trade.id, None)
+
+    # ---------- TICKS ----------
+
+    def on_tick(self, symbol: str):
+        """
+        market_state listener.
+        """
+        if symbol not in self._symbols:
+            return
+        self.on_price(symbol, market_state[symbol].price, now_ns())
+
+    def on_price(self, symbol: str, price: float, now: int):
+        triggers = self._symbols.get(symbol)
+        if triggers is None:
+            return
+
+        exits: List[int] = []
+        down = 1 - self.distance_pct
+        up = 1 + self.distance_pct
+
+        # --- LONG, armed: raise peaks, then exit if price <= stop ---
+        lst = triggers.long_stop
+        if lst:
+            new_stop = price * down
+            i = bisect_left(lst, (new_stop,))
+            if i:
+                raised = lst[:i]
+                del lst[:i]
+                for _, trade_id in raised:
+                    insort(lst, (new_stop, trade_id))
+                    self.trail[trade_id]["peak_price"] = price
+                    self._where[trade_id] = (lst, new_stop)
+
+            i = bisect_left(lst, (price,))
+            if i < len(lst):
+                exits.extend(trade_id for _, trade_id in lst[i:])
+                del lst[i:]
+
+        # --- SHORT, armed: lower peaks, then exit if price >= stop ---
+        lst = triggers.short_stop
+        if lst:
+            new_stop = price * up
+            i = bisect_right(lst, (new_stop, _INF))
+            if i < len(lst):
+                lowered = lst[i:]
+                del lst[i:]
+                for _, trade_id in lowered:
+                    insort(lst, (new_stop, trade_id))
+                    self.trail[trade_id]["peak_price"] = price
+                    self._where[trade_id] = (lst, new_stop)
+
+            i = bisect_right(lst, (price, _INF))
+            if i:
+                exits.extend(trade_id for _, trade_id in lst[:i])
+                del lst[:i]
+
+        # --- Arm trailing stops (price is the best since entry) ---
+        lst = triggers.long_arm
+        if lst and lst[0][0] <= price:
+            i = bisect_right(lst, (price, _INF))
+            armed = lst[:i]
+            del lst[:i]
+            for _, trade_id in armed:
+                self._arm(trade_id, price, triggers.long_stop, price * down)
+
+        lst = triggers.short_arm
+        if lst and lst[-1][0] >= price:
+            i = bisect_left(lst, (price,))
+            armed = lst[i:]
+            del lst[i:]
+            for _, trade_id in armed:
+                self._arm(trade_id, price, triggers.short_stop, price * up)
+
+        for trade_id in exits:
+            self._where.pop(trade_id, None)
+            trade = self.book.open.get(trade_id)
+            if trade is not None:
+                self._close(trade, price, now, "TRAIL")
+            else:
+                self.trail.pop(trade_id, None)
+
+    def _arm(self, trade_id: int, price: float, stop_list: list, stop: float):
+        trail = self.trail[trade_id]
+        trail["armed"] = True
+        trail["peak_price"] = price
+        self._insert(trade_id, stop_list, stop)
+
+        trade = self.book.open.get(trade_id)
+        if trade is not None:
+            print(
+                f"TRAIL ARMED | trade_id={trade_id} | "
+                f"pnl={_pnl(trade, price)*100:.2f}%"
+            )
+
+    # ---------- TIME STOPS ----------
+
+    def next_deadline(self) -> int | None:
+        while self._deadlines and self._deadlines[0][1] not in self.trail:
+            heapq.heappop(self._deadlines)
+        return self._deadlines[0][0] if self._deadlines else None
+
+    def check_time_stops(self, now: int):
+        heap = self._deadlines
+        retry = []
+        while heap and heap[0][0] <= now:
+            _, trade_id = heapq.heappop(heap)
+            trade = self.book.open.get(trade_id)
+            if trade is None or trade_id not in self.trail:
+                continue
+
+            state = market_state.get(trade.symbol)
+            if not state or state.price is None:
+                retry.append((now + NS_PER_SECOND, trade_id))
+                continue
+
+            self._close(trade, state.price, now, "TIME")
+
+        for item in retry:
+            heapq.heappush(heap, item)
+
+    # ---------- CLOSE ----------
+
+    def _close(self, trade: Trade, price: float, now: int, exit_reason: str):
+        self._remove(trade)
+
+        hold_seconds = (now - from_datetime(trade.entry_time)) // NS_PER_SECOND
+        pnl_1x = _pnl(trade, price)
+        pnl_5x = pnl_1x * 5
+
+        self.book.close_trade(
+            trade,
+            exit_time=to_datetime(now),
+            exit_price=price,
+            exit_reason=exit_reason,
+            pnl_pct_1x=pnl_1x,
+            pnl_pct_5x=pnl_5x,
+            slippage_used=0.0,
+            fees_used=0.0,
+            hold_seconds=hold_seconds,
+        )
+
+        print(
+            f"TRADE CLOSED | id={trade.id} | reason={exit_reason} | "
+            f"pnl_1x={pnl_1x*100:.2f}% | hold={hold_seconds}s"
+        )
+
+
+class StrategyExits:
+    """
+    One ExitEngine per strategy id, so every strategy's trades trail and
+    time out with that strategy's parameters (the trigger lists assume a
+    single trailing distance). Same interface as ExitEngine.
+    """
+
+    def __init__(self, book: TradeBook = trade_book):
+        self.book = book
+        self.engines: Dict[str, ExitEngine] = {}
+
+    def engine_for(self, strategy_id: str | None) -> ExitEngine:
+        strategy_id = strategy_id or DEFAULT_STRATEGY_ID
+        engine = self.engines.get(strategy_id)
+        if engine is None:
+            engine = self.engines[strategy_id] = ExitEngine(self.book, registry.params(strategy_id))
+        return engine
+
+    def add_trade(self, trade: Trade, armed: bool = False, peak_price: float | None = None):
+        self.engine_for(trade.strategy_id).add_trade(trade, armed, peak_price)
+
+    def on_tick(self, symbol: str):
+        for engine in self.engines.values():
+            engine.on_tick(symbol)
+
+    def on_price(self, symbol: str, price: float, now: int):
+        for engine in self.engines.values():
+            engine.on_price(symbol, price, now)
+
+    def next_deadline(self) -> int | None:
+        deadlines = [d for d in (e.next_deadline() for e in self.engines.values()) if d is not None]
+        return min(deadlines) if deadlines else None
+
+    def check_time_stops(self, now: int):
+        for engine in self.engines.values():
+            engine.check_time_stops(now)
+
+
+exit_engine = StrategyExits()
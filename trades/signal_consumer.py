@@ -1,40 +1,88 @@
 import asyncio
-from datetime import datetime
+from datetime import timedelta
 
-from storage.queries import get_signals_without_trade, trade_exists_for_signal
+from config import SIGNAL_QUEUE_MAXSIZE, SIGNAL_CATCHUP_SECONDS
+from storage.async_queries import get_signals_without_trade
 from trades.trade_creator import create_trade_from_signal
+from utils.clock import utcnow
 
 
 class SignalConsumer:
     """
-    Consumes signals from DB and creates one pending trade per signal.
+    Consumes signals and creates one pending trade per signal.
 
     IMPORTANT:
-    - Only consumes signals created AFTER startup_time (no backfill).
-    - Prevents duplicates by checking existing trades.
+    - Signals arrive in-process from SignalEngine via submit() / a bounded
+      asyncio queue; the DB is not polled.
+    - The DB is only read to catch up: once at startup and after a queue
+      overflow. A catch-up takes signals from the last
+      SIGNAL_CATCHUP_SECONDS without a trade, newer than any signal an
+      earlier catch-up saw, so stale signals never get a trade at
+      current prices and skipped ones are not retried.
+    - Duplicates are prevented by the trade book (one trade per signal
+      id) and the unique index on trades.signal_id; signals picked up by
+      a catch-up are also skipped when they later come out of the queue.
     """
 
-    def __init__(self):
-        self.startup_time = datetime.utcnow()
+    def __init__(self, maxsize: int = SIGNAL_QUEUE_MAXSIZE):
+        self.startup_time = utcnow()
+        self.catchup_after_id = 0  # newest signal id seen by a catch-up
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._catchup_needed = True
+        self._caught_up: set[int] = set()
+
+    def submit(self, signal):
+        """
+        Hand a persisted signal to the consumer. Never blocks the caller.
+        """
+        try:
+            self.queue.put_nowait(signal)
+        except asyncio.QueueFull:
+            # The signal is already in the DB; pick it up from there.
+            if not self._catchup_needed:
+                print(f"SignalConsumer queue full, signal #{signal.id} deferred to DB catch-up")
+            self._catchup_needed = True
+
+    async def _catch_up(self):
+        # Ids caught up earlier may still be queued; forget them only once
+        # the queue has drained (signals are queued before they can be
+        # read back from the DB, so none can arrive later).
+        if self.queue.empty():
+            self._caught_up.clear()
+        since = utcnow() - timedelta(seconds=SIGNAL_CATCHUP_SECONDS)
+        while True:
+            signals = await get_signals_without_trade(since, limit=200, after_id=self.catchup_after_id)
+            for sig in signals:
+                create_trade_from_signal(sig)
+                self._caught_up.add(sig.id)
+                self.catchup_after_id = sig.id
+
+            if len(signals) < 200:
+                return
 
     async def run_forever(self):
         print("SignalConsumer started (signals -> trades).")
 
         while True:
             try:
-                signals = get_signals_without_trade(self.startup_time, limit=200)
-
-                for sig in signals:
-                    if trade_exists_for_signal(sig.id):
-                        continue
+                if self._catchup_needed:
+                    self._catchup_needed = False
+                    try:
+                        await self._catch_up()
+                    except Exception:
+                        self._catchup_needed = True
+                        raise
 
-                    trade = create_trade_from_signal(sig)
-                    if trade is None:
-                        continue
+                sig = await self.queue.get()
+                if sig.id in self._caught_up:
+                    self._caught_up.discard(sig.id)
+                    if self.queue.empty():
+                        self._caught_up.clear()
+                    continue
 
-                await asyncio.sleep(1)
+                create_trade_from_signal(sig)
 
             except Exception as e:
                 print(f"SignalConsumer error: {e}")
                 await asyncio.sleep(2)
-
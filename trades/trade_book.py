@@ -0,0 +1,198 @@
+import heapq
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, List, Set, Tuple
+
+from analytics.summary import trade_summaries
+from config import SIGNAL_CATCHUP_SECONDS
+from storage.async_queries import (
+    get_pending_trades,
+    get_open_trades,
+    mark_trade_open,
+    mark_trade_closed,
+)
+from storage.models import Trade
+from utils.clock import NS_PER_SECOND, from_datetime
+
+
+class TradeBook:
+    """
+    Authoritative in-memory book of pending and open trades.
+
+    Loaded once from the DB at startup, then kept current by the trade
+    creator and the simulator. Transitions (open / close) update the book
+    first and are persisted through the write-behind writer, so the
+    simulator never has to read trades back from SQLite.
+
+    Indexes:
+    - pending / open: trade_id -> Trade
+    - by symbol:      symbol -> ids of its pending + open trades
+    - signal ids:     signals with a trade, so a signal is never traded
+                      twice; an id is dropped once its trade has been
+                      closed for SIGNAL_CATCHUP_SECONDS (no catch-up
+                      reaches that far back, and the unique index on
+                      trades.signal_id still guards the DB)
+    - entry heap:     (entry_time_planned as epoch ns, trade_id) for due entries
+
+    persist=False keeps transitions in memory only (backtests / sweeps).
+    """
+
+    def __init__(self, persist: bool = True):
+        self.persist = persist
+        self.pending: Dict[int, Trade] = {}
+        self.open: Dict[int, Trade] = {}
+
+        self._by_symbol: Dict[str, Set[int]] = defaultdict(set)
+        self._signal_ids: Set[int] = set()
+        self._closed_signals: deque = deque()  # (exit time ns, signal_id), oldest first
+        self._entry_heap: List[Tuple[int, int]] = []
+
+    async def load(self):
+        for trade in await get_pending_trades():
+            self.add_pending(trade)
+        for trade in await get_open_trades():
+            self._add_open(trade)
+
+        print(f"TradeBook loaded | pending={len(self.pending)} | open={len(self.open)}")
+
+    # ---------- PENDING ----------
+
+    def has_trade_for(self, signal_id: int) -> bool:
+        return signal_id in self._signal_ids
+
+    def add_pending(self, trade: Trade) -> bool:
+        """
+        Returns False (and keeps the book unchanged) for a trade that is
+        already booked or whose signal already has a trade.
+        """
+        if trade.id in self.pending or trade.id in self.open or trade.signal_id in self._signal_ids:
+            return False
+        self.pending[trade.id] = trade
+        self._by_symbol[trade.symbol].add(trade.id)
+        self._signal_ids.add(trade.signal_id)
+        heapq.heappush(self._entry_heap, (from_datetime(trade.entry_time_planned), trade.id))
+        return True
+
+    def next_entry_time(self) -> int | None:
+        while self._entry_heap and self._entry_heap[0][1] not in self.pending:
+            heapq.heappop(self._entry_heap)
+        return self._entry_heap[0][0] if self._entry_heap else None
+
+    def due_entries(self, now: int) -> List[Trade]:
+        """
+        Pending trades whose planned entry time has passed as of `now`
+        (epoch ns), oldest first.
+        They stay pending until open_trade() is called.
+        """
+        due = []
+        heap = self._entry_heap
+        while heap and heap[0][0] <= now:
+            _, trade_id = heapq.heappop(heap)
+            trade = self.pending.get(trade_id)
+            if trade is not None:
+                due.append(trade)
+        return due
+
+    def defer_entry(self, trade: Trade):
+        """
+        Re-queue a due trade that could not be opened yet (e.g. no price).
+        """
+        if trade.id in self.pending:
+            heapq.heappush(self._entry_heap, (from_datetime(trade.entry_time_planned), trade.id))
+
+    # ---------- OPEN / CLOSE ----------
+
+    def _add_open(self, trade: Trade):
+        self.open[trade.id] = trade
+        self._by_symbol[trade.symbol].add(trade.id)
+        self._signal_ids.add(trade.signal_id)
+
+    def open_trade(self, trade: Trade, entry_time: datetime, entry_price: float):
+        self.pending.pop(trade.id, None)
+
+        trade.entry_time = entry_time
+        trade.entry_price = entry_price
+        trade.tp_price = None
+        trade.sl_price = None
+        self._add_open(trade)
+
+        if not self.persist:
+            return
+        mark_trade_open(
+            trade_id=trade.id,
+            entry_time=entry_time,
+            entry_price=entry_price,
+            tp_price=None,
+            sl_price=None,
+        )
+
+    def close_trade(
+        self,
+        trade: Trade,
+        exit_time: datetime,
+        exit_price: float,
+        exit_reason: str,
+        pnl_pct_1x: float,
+        pnl_pct_5x: float,
+        slippage_used: float,
+        fees_used: float,
+        hold_seconds: int,
+    ):
+        self.open.pop(trade.id, None)
+        ids = self._by_symbol.get(trade.symbol)
+        if ids is not None:
+            ids.discard(trade.id)
+            if not ids:
+                del self._by_symbol[trade.symbol]
+
+        trade.exit_time = exit_time
+        trade.exit_price = exit_price
+        trade.exit_reason = exit_reason
+        trade.pnl_pct_1x = pnl_pct_1x
+        trade.pnl_pct_5x = pnl_pct_5x
+        trade.slippage_used = slippage_used
+        trade.fees_used = fees_used
+        trade.hold_seconds = hold_seconds
+        self._forget_closed_signals(trade.signal_id, from_datetime(exit_time))
+
+        if not self.persist:
+            return
+        mark_trade_closed(
+            trade_id=trade.id,
+            exit_time=exit_time,
+            exit_price=exit_price,
+            exit_reason=exit_reason,
+            pnl_pct_1x=pnl_pct_1x,
+            pnl_pct_5x=pnl_pct_5x,
+            slippage_used=slippage_used,
+            fees_used=fees_used,
+            hold_seconds=hold_seconds,
+        )
+        trade_summaries.on_trade_closed(trade)
+
+    def _forget_closed_signals(self, signal_id: int, exit_ns: int):
+        closed = self._closed_signals
+        closed.append((exit_ns, signal_id))
+        cutoff = exit_ns - SIGNAL_CATCHUP_SECONDS * NS_PER_SECOND
+        while closed and closed[0][0] < cutoff:
+            self._signal_ids.discard(closed.popleft()[1])
+
+    # ---------- LOOKUPS ----------
+
+    def trades_for_symbol(self, symbol: str) -> List[Trade]:
+        result = []
+        for trade_id in self._by_symbol.get(symbol, ()):
+            trade = self.open.get(trade_id) or self.pending.get(trade_id)
+            if trade is not None:
+                result.append(trade)
+        return result
+
+    def open_for_symbol(self, symbol: str) -> List[Trade]:
+        return [
+            self.open[trade_id]
+            for trade_id in self._by_symbol.get(symbol, ())
+            if trade_id in self.open
+        ]
+
+
+trade_book = TradeBook()
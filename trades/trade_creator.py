@@ -1,14 +1,29 @@
-from datetime import datetime, timedelta
-
-from config import ENTRY_DELAY_SECONDS
-from storage.queries import create_pending_trade
+from storage.async_queries import create_pending_trade
 from data_feed.market_state import market_state
+from signals.params import StrategyParams
+from signals.strategies import registry
+from trades.trade_book import trade_book
+from utils.clock import NS_PER_SECOND, now_ns, to_datetime
+from utils.metrics import metrics
+
+
+TRADES_CREATED = metrics.counter("trades_created_total", "Pending trades created from signals")
+DUPLICATES = metrics.counter("trades_duplicate_signal_total", "Signals skipped because they already have a trade")
 
 
-def create_trade_from_signal(signal):
+def create_trade_from_signal(signal, params: StrategyParams | None = None):
     """
-    Create a simulated trade from a signal with human delay.
+    Create a simulated trade from a signal with human delay, using the
+    parameters of the strategy that produced it unless `params` is given.
+    A signal that already has a trade gets no second one.
     """
+    if trade_book.has_trade_for(signal.id):
+        DUPLICATES.inc()
+        print(f"TRADE SKIPPED | signal_id={signal.id} already has a trade")
+        return None
+
+    strategy_id = signal.strategy_id
+    entry_delay = (params or registry.params(strategy_id)).entry_delay_seconds
     symbol = signal.symbol
     direction = signal.direction
 
@@ -16,19 +31,26 @@ def create_trade_from_signal(signal):
     if not state or state.price is None:
         return None
 
-    planned_entry_time = datetime.utcnow() + timedelta(seconds=ENTRY_DELAY_SECONDS)
+    planned_entry_time = to_datetime(now_ns() + int(entry_delay * NS_PER_SECOND))
 
     trade = create_pending_trade(
         signal_id=signal.id,
         symbol=symbol,
         direction=direction,
-        entry_delay_seconds=ENTRY_DELAY_SECONDS,
+        entry_delay_seconds=entry_delay,
         entry_time_planned=planned_entry_time,
+        strategy_id=strategy_id,
     )
+    trade_book.add_pending(trade)
+    TRADES_CREATED.inc()
+
+    trade.trace = signal.trace
+    if trade.trace is not None:
+        trade.trace.mark("trade_created")
 
     print(
         f"TRADE CREATED | trade_id={trade.id} | signal_id={signal.id} | "
-        f"{symbol} | {direction} | entry_in={ENTRY_DELAY_SECONDS}s"
+        f"{symbol} | {direction} | entry_in={entry_delay}s"
     )
 
     return trade
@@ -1,140 +1,89 @@
 import asyncio
-from datetime import datetime
 
-from config import (
-    TIME_STOP_SECONDS,
-    TRAILING_ACTIVATION_PCT,
-    TRAILING_DISTANCE_PCT,
-)
-from storage.queries import (
-    get_pending_trades,
-    get_open_trades,
-    mark_trade_open,
-    mark_trade_closed,
-)
-from data_feed.market_state import market_state
+from data_feed.market_state import market_state, subscribe, unsubscribe
+from trades.exit_engine import ExitEngine, StrategyExits, exit_engine
+from trades.trade_book import TradeBook, trade_book
+from utils.clock import NS_PER_SECOND, from_datetime, now_ns, to_datetime
+from utils.metrics import metrics
 
 
+# Longest the loop sleeps between checks for due entries / time stops
+MAX_SLEEP_SECONDS = 1.0
 
-TRAIL_STATE = {}  # trade_id -> dict
+ENTRY_LAG = metrics.histogram("trade_entry_lag_seconds", "Trade open time minus its planned entry time")
+
+
+def simulator_step(now: int, book: TradeBook = trade_book, exits: ExitEngine | StrategyExits = exit_engine):
+    """
+    Open pending trades that are due and fire time stops, as of `now`
+    (epoch ns).
+    """
+    # -------- ENTER TRADES --------
+    for trade in book.due_entries(now):
+        state = market_state.get(trade.symbol)
+        if not state or state.price is None:
+            book.defer_entry(trade)
+            continue
+
+        entry_price = state.price
+
+        book.open_trade(trade, entry_time=to_datetime(now), entry_price=entry_price)
+        exits.add_trade(trade)
+        ENTRY_LAG.record(now - from_datetime(trade.entry_time_planned))
+        if trade.trace is not None:
+            trade.trace.mark("trade_opened")
+
+        print(
+            f"TRADE OPEN | id={trade.id} | {trade.symbol} | {trade.direction} | "
+            f"entry={entry_price:.6f}"
+        )
+
+    # -------- TIME STOPS --------
+    exits.check_time_stops(now)
+
+
+def next_timer(book: TradeBook = trade_book, exits: ExitEngine | StrategyExits = exit_engine) -> int | None:
+    """
+    Earliest planned entry or time-stop deadline (epoch ns), if any.
+    """
+    times = [t for t in (book.next_entry_time(), exits.next_deadline()) if t is not None]
+    return min(times) if times else None
+
+
+def start_exits():
+    """
+    Register trades already open at startup and start tick-driven exits.
+    """
+    # Trades already open at startup: trail from their entry price
+    for trade in trade_book.open.values():
+        exit_engine.add_trade(trade)
+    subscribe(exit_engine.on_tick)
+
+
+def stop_exits():
+    unsubscribe(exit_engine.on_tick)
 
 
 async def trade_simulator_loop():
-    print("Trade simulator started (TRAILING MODE).")
-
-    while True:
-        now = datetime.utcnow()
-
-        # -------- ENTER TRADES --------
-        pending_trades = get_pending_trades()
-        for trade in pending_trades:
-            if now < trade.entry_time_planned:
-                continue
-
-            state = market_state.get(trade.symbol)
-            if not state or state.price is None:
-                continue
-
-            entry_price = state.price
-
-            mark_trade_open(
-                trade_id=trade.id,
-                entry_time=now,
-                entry_price=entry_price,
-                tp_price=None,
-                sl_price=None,
-            )
-
-            TRAIL_STATE[trade.id] = {
-                "armed": False,
-                "peak_price": entry_price,
-            }
-
-            print(
-                f"TRADE OPEN | id={trade.id} | {trade.symbol} | {trade.direction} | "
-                f"entry={entry_price:.6f}"
-            )
-
-        # -------- MANAGE / EXIT TRADES --------
-        open_trades = get_open_trades()
-        for trade in open_trades:
-            state = market_state.get(trade.symbol)
-            if not state or state.price is None:
-                continue
-
-            price = state.price
-            hold_seconds = int((now - trade.entry_time).total_seconds())
-
-            trail = TRAIL_STATE.get(trade.id)
-            if trail is None:
-                continue
-
-            # --- Update peak price ---
-            if trade.direction == "LONG":
-                if price > trail["peak_price"]:
-                    trail["peak_price"] = price
-            else:
-                if price < trail["peak_price"]:
-                    trail["peak_price"] = price
-
-            # --- Arm trailing stop ---
-            if not trail["armed"]:
-                pnl = (
-                    (price - trade.entry_price) / trade.entry_price
-                    if trade.direction == "LONG"
-                    else (trade.entry_price - price) / trade.entry_price
-                )
-
-                if pnl >= TRAILING_ACTIVATION_PCT:
-                    trail["armed"] = True
-                    print(
-                        f"TRAIL ARMED | trade_id={trade.id} | "
-                        f"pnl={pnl*100:.2f}%"
-                    )
-
-            exit_reason = None
-
-            # --- Trailing stop logic ---
-            if trail["armed"]:
-                if trade.direction == "LONG":
-                    trail_sl = trail["peak_price"] * (1 - TRAILING_DISTANCE_PCT)
-                    if price <= trail_sl:
-                        exit_reason = "TRAIL"
-                else:
-                    trail_sl = trail["peak_price"] * (1 + TRAILING_DISTANCE_PCT)
-                    if price >= trail_sl:
-                        exit_reason = "TRAIL"
-
-            # --- Time stop ---
-            if exit_reason is None and hold_seconds >= TIME_STOP_SECONDS:
-                exit_reason = "TIME"
-
-            if exit_reason:
-                pnl_1x = (
-                    (price - trade.entry_price) / trade.entry_price
-                    if trade.direction == "LONG"
-                    else (trade.entry_price - price) / trade.entry_price
-                )
-
-                pnl_5x = pnl_1x * 5
-
-                mark_trade_closed(
-                    trade_id=trade.id,
-                    exit_time=now,
-                    exit_price=price,
-                    exit_reason=exit_reason,
-                    pnl_pct_1x=pnl_1x,
-                    pnl_pct_5x=pnl_5x,
-                    slippage_used=0.0,
-                    fees_used=0.0,
-                    hold_seconds=hold_seconds,
-                )
-
-                TRAIL_STATE.pop(trade.id, None)
-
-                print(
-                    f"TRADE CLOSED | id={trade.id} | reason={exit_reason} | "
-                    f"pnl_1x={pnl_1x*100:.2f}% | hold={hold_seconds}s"
-                )
-
-        await asyncio.sleep(1)
+    """
+    Opens due pending trades from the in-memory trade_book (loaded at
+    startup in main.py) and runs time stops on a timer. Trailing exits are
+    evaluated on every tick by exit_engine; the DB only receives the
+    open / close transitions.
+    """
+    print("Trade simulator started (TRAILING MODE, tick-driven exits).")
+
+    start_exits()
+    try:
+        while True:
+            simulator_step(now_ns())
+
+            # -------- SLEEP UNTIL NEXT TIMER --------
+            delay = MAX_SLEEP_SECONDS
+            due = next_timer()
+            if due is not None:
+                delay = min(delay, (due - now_ns()) / NS_PER_SECOND)
+
+            await asyncio.sleep(max(delay, 0.0))
+    finally:
+        stop_exits()
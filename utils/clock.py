@@ -0,0 +1,159 @@
+import time
+from datetime import datetime, timedelta
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MS = 1_000_000
+
+
+# ---------- CONVERSIONS ----------
+#
+# The hot path (market_state, signal engine, trade book, exits) keeps
+# time as int epoch nanoseconds; datetimes are only built for the DB.
+
+def to_datetime(ns: int) -> datetime:
+    """
+    Epoch nanoseconds -> naive UTC datetime (microsecond precision).
+    """
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
+
+def from_datetime(dt: datetime) -> int:
+    """
+    Naive UTC datetime -> epoch nanoseconds.
+    """
+    delta = dt - _EPOCH
+    return ((delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds) * 1000
+
+
+# ---------- CLOCKS ----------
+#
+# Every clock has now_ns() plus utcnow() / time() built on it, and
+# observe(event_ms), which market_state calls with the exchange event
+# time of each live tick.
+
+class LiveClock:
+    """
+    Wall clock read through the monotonic clock: anchored to time.time_ns()
+    at start, then advanced by time.monotonic_ns(). It never goes back
+    (price histories must stay sorted) and ignores wall-clock steps.
+    """
+
+    def __init__(self):
+        self._offset = time.time_ns() - time.monotonic_ns()
+
+    def now_ns(self) -> int:
+        return time.monotonic_ns() + self._offset
+
+    def utcnow(self) -> datetime:
+        return to_datetime(self.now_ns())
+
+    def time(self) -> float:
+        return self.now_ns() / NS_PER_SECOND
+
+    def observe(self, event_ms: int):
+        pass
+
+
+class ExchangeClock(LiveClock):
+    """
+    Clock driven by exchange event times (CLOCK="exchange"): the newest
+    event time seen, advanced by the local monotonic clock until the next
+    one. Removes local clock offset from lookbacks, cooldowns and entry
+    delays. Falls back to the live clock until the first event, and never
+    goes back.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._event_ns = 0
+        self._event_mono = 0
+        self._last = 0
+
+    def observe(self, event_ms: int):
+        ns = event_ms * NS_PER_MS
+        if ns > self._event_ns:
+            self._event_ns = ns
+            self._event_mono = time.monotonic_ns()
+
+    def now_ns(self) -> int:
+        if self._event_ns:
+            ns = self._event_ns + time.monotonic_ns() - self._event_mono
+        else:
+            ns = super().now_ns()
+        # The first event may be behind the live clock used until then
+        if ns < self._last:
+            return self._last
+        self._last = ns
+        return ns
+
+
+class SimClock:
+    """
+    Clock that only moves when told to. Used by replay.py and the
+    backtest so the engine, trade creator and simulator see recorded
+    exchange time, as fast as the ticks can be read.
+    """
+
+    def __init__(self, start_ns: int = 0):
+        self._ns = int(start_ns)
+
+    def now_ns(self) -> int:
+        return self._ns
+
+    def utcnow(self) -> datetime:
+        return to_datetime(self._ns)
+
+    def time(self) -> float:
+        return self._ns / NS_PER_SECOND
+
+    def observe(self, event_ms: int):
+        pass
+
+    def set(self, ns: int):
+        if ns > self._ns:
+            self._ns = ns
+
+
+CLOCKS = {"live": LiveClock, "exchange": ExchangeClock}
+
+
+def create_clock(kind: str):
+    if kind not in CLOCKS:
+        raise ValueError(f"Unknown clock: {kind} (choose from {', '.join(CLOCKS)})")
+    return CLOCKS[kind]()
+
+
+_active = LiveClock()
+
+
+def set_clock(clock):
+    global _active
+    _active = clock
+
+
+def get_clock():
+    return _active
+
+
+def now_ns() -> int:
+    """
+    Current time as int epoch nanoseconds from the active clock.
+    """
+    return _active.now_ns()
+
+
+def utcnow() -> datetime:
+    """
+    Current time as naive UTC datetime from the active clock.
+    """
+    return _active.utcnow()
+
+
+def now_ts() -> float:
+    """
+    Current time as epoch seconds from the active clock.
+    """
+    return _active.time()
@@ -0,0 +1,289 @@
+import asyncio
+import time
+import urllib.parse
+from typing import Callable, Dict, Tuple
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of durations in nanoseconds.
+
+    Values below 2**SUB_BITS ns get their own bucket; above that every
+    power of two is split into 2**(SUB_BITS - 1) linear buckets, so
+    quantiles are within ~3% at any magnitude. record() is O(1) and the
+    memory is fixed (values are clamped to [0, MAX_NS]).
+    """
+
+    SUB_BITS = 6
+    MAX_NS = 1 << 40  # ~18 minutes
+
+    _SUB = 1 << SUB_BITS
+    _HALF = _SUB >> 1
+
+    def __init__(self):
+        self.counts = [0] * (self._index(self.MAX_NS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    @classmethod
+    def _index(cls, ns: int) -> int:
+        if ns < cls._SUB:
+            return ns
+        shift = ns.bit_length() - cls.SUB_BITS
+        return cls._SUB + (shift - 1) * cls._HALF + (ns >> shift) - cls._HALF
+
+    @classmethod
+    def _upper(cls, index: int) -> int:
+        """
+        Largest value that lands in bucket `index`.
+        """
+        if index < cls._SUB:
+            return index
+        shift, mantissa = divmod(index - cls._SUB, cls._HALF)
+        shift += 1
+        return ((mantissa + cls._HALF + 1) << shift) - 1
+
+    def record(self, ns: int):
+        ns = min(max(int(ns), 0), self.MAX_NS)
+        self.counts[self._index(ns)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, q: float) -> int:
+        """
+        Value (ns) at quantile q in [0, 1]; 0 when empty.
+        """
+        if not self.count:
+            return 0
+        target = max(1, int(q * self.count + 0.999999))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self._upper(index), self.max_ns)
+        return self.max_ns
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, n: int = 1):
+        self.value += n
+
+
+class _Callback:
+    """
+    Value owned elsewhere (feed / writer / notifier counters), read at
+    scrape time.
+    """
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], float]):
+        self.fn = fn
+
+    @property
+    def value(self) -> float:
+        return self.fn()
+
+
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class MetricsRegistry:
+    """
+    In-process counters and latency histograms, rendered in the
+    Prometheus text format. Metrics are created once, at import time of
+    the module that records them; asking again for the same name and
+    labels returns the same object.
+
+    Histograms are exposed as summaries (quantiles, _sum, _count) in
+    seconds, plus a <name>_max gauge.
+    """
+
+    def __init__(self):
+        # name -> (type, help, {labels: metric})
+        self._families: Dict[str, Tuple[str, str, dict]] = {}
+
+    def _get(self, kind: str, name: str, help: str, labels: dict, factory):
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = (kind, help, {})
+        elif family[0] != kind:
+            raise ValueError(f"Metric {name} already registered as a {family[0]}")
+
+        key = tuple(sorted(labels.items()))
+        metric = family[2].get(key)
+        if metric is None:
+            metric = family[2][key] = factory()
+        return metric
+
+    def counter(self, name: str, help: str, **labels) -> Counter:
+        return self._get("counter", name, help, labels, Counter)
+
+    def histogram(self, name: str, help: str, **labels) -> LatencyHistogram:
+        return self._get("summary", name, help, labels, LatencyHistogram)
+
+    def observe(self, name: str, help: str, fn: Callable[[], float], kind: str = "gauge", **labels):
+        """
+        Expose a value kept by someone else; fn() is called on every scrape.
+        kind is "gauge" or "counter".
+        """
+        self._get(kind, name, help, labels, lambda: _Callback(fn))
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, help, series) in sorted(self._families.items()):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind != "summary":
+                for key, metric in series.items():
+                    lines.append(f"{name}{_labels(key)} {metric.value}")
+                continue
+
+            for key, hist in series.items():
+                for q in SUMMARY_QUANTILES:
+                    lines.append(f"{name}{_labels(key, quantile=q)} {hist.percentile(q) / 1e9:.9f}")
+                lines.append(f"{name}_sum{_labels(key)} {hist.total_ns / 1e9:.9f}")
+                lines.append(f"{name}_count{_labels(key)} {hist.count}")
+            lines.append(f"# TYPE {name}_max gauge")
+            for key, hist in series.items():
+                lines.append(f"{name}_max{_labels(key)} {hist.max_ns / 1e9:.9f}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key: tuple, **extra) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+metrics = MetricsRegistry()
+
+
+# ---------- PIPELINE TRACE ----------
+
+# Stages after the socket receive, in pipeline order
+STAGES = ("decoded", "updated", "emitted", "persisted", "trade_created", "trade_opened", "notified")
+
+_STAGE_LATENCY = {
+    stage: metrics.histogram(
+        "pipeline_latency_seconds", "Time from websocket receive to each pipeline stage", stage=stage,
+    )
+    for stage in STAGES
+}
+_EXCHANGE_DELAY = metrics.histogram(
+    "pipeline_exchange_delay_seconds",
+    "Exchange event time (E) to websocket receive; includes local clock offset",
+)
+
+
+class LatencyTrace:
+    """
+    Per-stage timestamps (time.time_ns(), like the recorder's recv_ns)
+    of one websocket frame and of the signals it leads to.
+
+    The feed makes one per frame and hands it to market_state with every
+    tick; the signal engine copies it (with the symbol's own exchange
+    event time) onto each Signal, and the trade / DB writer / notifier
+    mark their stage on that copy. Every mark() records the time since
+    receive in pipeline_latency_seconds{stage=...}.
+
+    trade_opened includes the configured entry delay.
+    """
+
+    __slots__ = ("event_ms", "recv_ns") + tuple(f"{stage}_ns" for stage in STAGES)
+
+    def __init__(self, recv_ns: int, event_ms: int | None = None):
+        self.event_ms = event_ms
+        self.recv_ns = recv_ns
+        self.decoded_ns = self.updated_ns = self.emitted_ns = self.persisted_ns = None
+        self.trade_created_ns = self.trade_opened_ns = self.notified_ns = None
+
+    def mark(self, stage: str, ns: int | None = None) -> int:
+        if ns is None:
+            ns = time.time_ns()
+        setattr(self, f"{stage}_ns", ns)
+        _STAGE_LATENCY[stage].record(ns - self.recv_ns)
+        return ns
+
+    def received(self, newest_event_ms: int):
+        """
+        Record exchange -> receive for the frame's newest event.
+        """
+        if newest_event_ms:
+            _EXCHANGE_DELAY.record(self.recv_ns - newest_event_ms * 1_000_000)
+
+    def for_signal(self, event_ms: int | None) -> "LatencyTrace":
+        trace = LatencyTrace(self.recv_ns, event_ms)
+        trace.decoded_ns = self.decoded_ns
+        trace.updated_ns = self.updated_ns
+        return trace
+
+
+# ---------- HTTP ENDPOINT ----------
+
+class MetricsServer:
+    """
+    Minimal HTTP server for Prometheus scrapes: GET /metrics returns
+    registry.render(); anything else is a 404. Meant for localhost.
+
+    routes adds more plain-text endpoints: path -> fn(query params dict)
+    returning the response body (e.g. /profile, see main.py).
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        registry: MetricsRegistry = metrics,
+        routes: Dict[str, Callable[[dict], str]] | None = None,
+    ):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self.routes = dict(routes or {})
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request.split()
+            url = urllib.parse.urlsplit(parts[1].decode("latin-1") if len(parts) > 1 else "")
+            if url.path == "/metrics":
+                status, body = "200 OK", self.registry.render().encode("utf-8")
+            elif url.path in self.routes:
+                query = {k: v[-1] for k, v in urllib.parse.parse_qs(url.query).items()}
+                try:
+                    status, body = "200 OK", self.routes[url.path](query).encode("utf-8")
+                except ValueError as e:
+                    status, body = "400 Bad Request", f"{e}\n".encode("utf-8")
+            else:
+                status, body = "404 Not Found", b"not found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def run_forever(self):
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        print(f"Metrics endpoint on http://{self.host}:{self.port}/metrics")
+        async with server:
+            await server.serve_forever()
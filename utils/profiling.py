@@ -0,0 +1,197 @@
+import asyncio
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter as _Counter
+from datetime import datetime
+from pathlib import Path
+
+from utils.metrics import metrics
+
+
+LOOP_LAG = metrics.histogram("event_loop_lag_seconds", "Time for the event loop to run a callback scheduled from another thread")
+LOOP_STALLS = metrics.counter("event_loop_stalls_total", "Event loop stalls longer than the threshold")
+
+# Innermost frames shown for a stall
+STALL_STACK_FRAMES = 12
+
+
+class LoopMonitor:
+    """
+    Event-loop health watchdog, running in its own thread.
+
+    Every `interval` seconds it schedules a no-op on the loop with
+    call_soon_threadsafe and waits for it to run; the delay is the loop
+    lag (event_loop_lag_seconds). If the callback has not run after
+    `threshold` seconds, something is blocking the loop: the loop
+    thread's current stack is captured right then, and once the loop
+    recovers the stall is printed with its duration and that stack.
+
+    Costs one callback per interval on the loop and nothing else, so it
+    stays on in production.
+    """
+
+    def __init__(self, interval: float, threshold: float, stats_interval: float = 0):
+        self.interval = interval
+        self.threshold = threshold
+        self.stats_interval = stats_interval
+
+        self.stalls = 0
+        self.max_lag = 0.0  # since the last stats line
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, loop: asyncio.AbstractEventLoop | None = None):
+        """
+        Call from the loop's thread (e.g. at the top of main()).
+        """
+        if self._thread is not None:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="loop-monitor", daemon=True)
+        self._thread.start()
+        print(f"Loop monitor started (interval={self.interval}s, stall threshold={self.threshold*1000:.0f}ms)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _stack(self) -> str:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return "  (loop thread not found)\n"
+        return "".join(traceback.format_stack(frame)[-STALL_STACK_FRAMES:])
+
+    def _run(self):
+        next_stats = time.monotonic() + self.stats_interval
+        while not self._stop.wait(self.interval):
+            ran = threading.Event()
+            sent = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(ran.set)
+            except RuntimeError:  # loop closed
+                return
+
+            stack = None
+            if not ran.wait(self.threshold):
+                stack = self._stack()
+                while not ran.wait(0.5):
+                    if self._stop.is_set() or self._loop.is_closed():
+                        return
+
+            lag = time.perf_counter() - sent
+            LOOP_LAG.record(int(lag * 1e9))
+            self.max_lag = max(self.max_lag, lag)
+
+            if stack is not None:
+                self.stalls += 1
+                LOOP_STALLS.inc()
+                print(f"LOOP STALL | {lag*1000:.0f}ms | loop thread was in:\n{stack}", end="")
+
+            if self.stats_interval and time.monotonic() >= next_stats:
+                print(self.stats_line())
+                next_stats = time.monotonic() + self.stats_interval
+
+    def stats_line(self) -> str:
+        line = (
+            f"Event loop | lag p50={LOOP_LAG.percentile(0.5)/1e6:.2f}ms | "
+            f"p99={LOOP_LAG.percentile(0.99)/1e6:.2f}ms | "
+            f"max={self.max_lag*1000:.1f}ms | stalls={self.stalls}"
+        )
+        self.max_lag = 0.0
+        return line
+
+
+class SamplingProfiler:
+    """
+    Time-boxed sampling profiler for the running process.
+
+    start() spawns a thread that snapshots every thread's stack
+    (sys._current_frames) each `sample_interval` seconds for `seconds`,
+    then writes them as collapsed stacks ("thread;outer;...;inner count"
+    per line, for flamegraph.pl / speedscope) to out_dir and prints the
+    busiest functions. Only one profile runs at a time.
+    """
+
+    def __init__(self, out_dir: str, sample_interval: float):
+        self.out_dir = Path(out_dir)
+        self.sample_interval = sample_interval
+        self._thread: threading.Thread | None = None
+        self.current: Path | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float) -> Path:
+        """
+        Start a profile; returns the file it will be written to. If one
+        is already running, returns that one's file instead.
+        """
+        if self.running:
+            return self.current
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.current = self.out_dir / f"profile-{datetime.now():%Y%m%dT%H%M%S}.txt"
+        self._thread = threading.Thread(
+            target=self._run, args=(seconds, self.current), name="sampling-profiler", daemon=True,
+        )
+        self._thread.start()
+        print(f"Profiling for {seconds:g}s -> {self.current}")
+        return self.current
+
+    def _run(self, seconds: float, out: Path):
+        me = threading.get_ident()
+        names = {}
+        stacks = _Counter()
+        samples = 0
+
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                stacks[";".join(reversed(stack))] += 1
+            samples += 1
+            time.sleep(self.sample_interval)
+
+        out.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()),
+            encoding="utf-8",
+        )
+
+        # Self time per function on the event loop (main) thread; idle
+        # time shows up as select()
+        leaf = _Counter()
+        for stack, count in stacks.items():
+            if stack.startswith("MainThread;"):
+                leaf[stack.rsplit(";", 1)[-1]] += count
+        top = " | ".join(f"{name} {count * 100 / samples:.0f}%" for name, count in leaf.most_common(5))
+        print(f"Profile written to {out} | samples={samples} | main thread: {top}")
+
+
+def install_profile_signal(profiler: SamplingProfiler, seconds: float) -> bool:
+    """
+    Start a profile on SIGUSR1 (`kill -USR1 <pid>`). Not available on
+    Windows; returns whether the handler was installed.
+    """
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+    asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, profiler.start, seconds)
+    return True